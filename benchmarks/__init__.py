@@ -0,0 +1 @@
+"""Benchmarks of the thermal printer driver hot paths."""
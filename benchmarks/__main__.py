@@ -0,0 +1,79 @@
+"""Run the benchmark suite, save results, and compare them against a baseline.
+
+Usage: python -m benchmarks [--output results.json] [--baseline benchmarks/baseline.json] [--save-baseline]
+
+The exit code is 1 when a benchmark is slower than its baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from timeit import Timer
+
+from benchmarks.driver import cases
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def measure(func: object, repeat: int) -> float:
+    """Return the best time of one call, in seconds."""
+    timer = Timer(func)  # type: ignore[arg-type]
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print results against the baseline, and return names of regressed benchmarks."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            print(f"  {name:<24} {seconds * 1e6:12.2f} µs")
+            continue
+
+        ratio = seconds / reference
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<24} {seconds * 1e6:12.2f} µs  (baseline: {reference * 1e6:12.2f} µs, x{ratio:.2f}){flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description=str(__doc__).split("\n", 1)[0])
+    parser.add_argument("-o", "--output", type=Path, help="where to save results (JSON)")
+    parser.add_argument("-b", "--baseline", type=Path, default=BASELINE, help="the baseline to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=1.5, help="slowdown ratio flagged as a regression")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of measures, the best one is kept")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--save-baseline", action="store_true", help="save results as the new baseline")
+    options = parser.parse_args()
+
+    results = {name: measure(func, options.repeat) for name, func in cases().items() if options.filter in name}
+    report = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+
+    baseline = {}
+    if options.baseline.is_file():
+        baseline = json.loads(options.baseline.read_text())["results"]
+    print(f"Python {report['python']} on {report['platform']}")
+    regressions = compare(results, baseline, options.threshold)
+
+    if options.output:
+        options.output.write_text(json.dumps(report, indent=2))
+    if options.save_baseline:
+        options.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {options.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) over x{options.threshold}: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Compare dithering modes used by ThermalPrinter.image_convert(), with and without NumPy.
+
+Usage: python -m benchmarks.dithering
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from timeit import repeat
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+from thermalprinter.constants import Dithering
+from thermalprinter.dithering import dither, dither_rows
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+WIDTH, HEIGHT = 384, 2000
+
+
+def best_of(func: Callable[[], object], number: int) -> float:
+    return min(repeat(func, number=number, repeat=3)) / number
+
+
+def main() -> None:
+    photo = Image.linear_gradient("L").resize((WIDTH, HEIGHT))
+    data = photo.tobytes()
+    print(f"Grayscale gradient ({WIDTH}x{HEIGHT})")
+
+    pil = best_of(lambda: photo.convert("1", dither=Image.Dither.FLOYDSTEINBERG), 5)
+    print(f"  {'PIL floyd-steinberg':<22} {pil * 1000:10.3f} ms")
+
+    for mode in Dithering:
+        assert dither(data, WIDTH, HEIGHT, mode) == dither_rows(data, WIDTH, HEIGHT, mode)
+        fast = best_of(partial(dither, data, WIDTH, HEIGHT, mode), 3)
+        slow = best_of(partial(dither_rows, data, WIDTH, HEIGHT, mode), 1)
+        print(f"  {mode.value:<22} {fast * 1000:10.3f} ms  (row by row: {slow * 1000:10.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
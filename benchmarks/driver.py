@@ -0,0 +1,84 @@
+"""Benchmarks of ThermalPrinter hot paths.
+
+Timing constants are all set to zero, and data is written to the in-memory ``record://`` port,
+so that only the time spent in the driver is measured.
+"""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from functools import partial
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+from thermalprinter.constants import BarCode, CodePage, Command, Justify, Size, Underline
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TEXT = "The quick brown fox jumps over the lazy dog"
+CHINESE = "敏捷的棕色狐狸跳过了懒狗"
+PERSIAN = "سلام دنیا، این یک آزمایش است"
+
+# A native code page, and code pages falling back to another encoding (see CodePageConverted)
+CODEPAGES = (CodePage.CP437, CodePage.CP1252, CodePage.IRAN, CodePage.THAI)
+
+
+class Printer(ThermalPrinter):
+    """A printer without any delay, recorded data being dropped regularly."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "record://",
+            byte_time=0.0,
+            command_timeout=0.0,
+            dot_feed_time=0.0,
+            dot_print_time=0.0,
+            use_stats=False,
+        )
+
+    def _wait(self, seconds: float) -> None:  # noqa: ARG002
+        if len(self._conn.data) > 1024 * 1024:
+            self._conn.data.clear()
+
+
+def to_bytes(printer: Printer, text: str, *, codepage: CodePage = CodePage.CP437, chinese: bool = False) -> bytes:
+    printer._codepage, printer._chinese = codepage, chinese
+    try:
+        return printer.to_bytes(text)
+    finally:
+        printer._codepage, printer._chinese = CodePage.CP437, False
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Return benchmark cases, by name."""
+    printer = Printer()
+    small = Image.effect_noise((64, 64), 64).convert("1")
+    large = Image.effect_noise((384, 4000), 64).convert("1")
+
+    result: dict[str, Callable[[], object]] = {
+        f"to_bytes[{codepage.name}]": partial(to_bytes, printer, TEXT, codepage=codepage) for codepage in CODEPAGES
+    }
+    result |= {
+        "to_bytes[chinese]": lambda: to_bytes(printer, CHINESE, chinese=True),
+        "out": lambda: printer.out(TEXT),
+        "out[styled]": lambda: printer.out(
+            TEXT, bold=True, justify=Justify.CENTER, size=Size.MEDIUM, underline=Underline.THIN
+        ),
+        "send_command": lambda: printer.send_command(Command.ESC, 69, 0),
+        "image_chunks[64x64]": lambda: printer.image_chunks(small),
+        "image_chunks[384x4000]": lambda: printer.image_chunks(large),
+        "image[64x64]": lambda: printer.image(small),
+        "image[384x4000]": lambda: printer.image(large),
+        "validate_barcode": lambda: printer.validate_barcode("012345678901", BarCode.EAN13),
+        "barcode": lambda: printer.barcode("012345678901", BarCode.EAN13),
+    }
+
+    with suppress(ImportError):
+        from thermalprinter.recipes import persian  # noqa: F401
+
+        result["out[persian]"] = lambda: printer.out(PERSIAN, persian=True)
+
+    return result
@@ -0,0 +1,68 @@
+"""Compare the pixel per pixel packing, and the packing engine, used by ThermalPrinter.image_chunks().
+
+Usage: python -m benchmarks.image_chunks
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from timeit import repeat
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from PIL import Image
+
+from thermalprinter import raster
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+GLIDER_BIG = Path(__file__).parent.parent / "src" / "tests" / "glider-big.png"
+
+
+def legacy(image: Image.Image) -> bytearray:
+    """Packing as done up to v2.1.0."""
+    width, height = image.size
+    bitmap = bytearray()
+    for y in range(height):
+        for chunk in range(raster.row_bytes(width)):
+            start = chunk * 8
+            byte = 0
+            for shift, x in enumerate(range(start, start + 8)):
+                pixel = image.getpixel((x, y)) if x < image.width else 1
+                byte |= int(not pixel) << (7 - shift)
+            bitmap.append(byte)
+    return bitmap
+
+
+def without_numpy(image: Image.Image) -> bytearray:
+    with patch.dict(sys.modules, {"numpy": None}):
+        return raster.pack(image)
+
+
+def best_of(func: Callable[[Image.Image], bytearray], image: Image.Image, number: int) -> float:
+    return min(repeat(lambda: func(image), number=number, repeat=3)) / number
+
+
+def images() -> dict[str, Image.Image]:
+    with Image.open(GLIDER_BIG) as big:
+        glider = big.convert("1").resize((384, 384))
+    synthetic = Image.effect_noise((384, 4000), 64).convert("1")
+    return {"glider-big.png (384x384)": glider, "synthetic (384x4000)": synthetic}
+
+
+def main() -> None:
+    for name, image in images().items():
+        assert legacy(image) == raster.pack(image) == without_numpy(image)
+
+        slow = best_of(legacy, image, 1)
+        print(f"{name}")
+        print(f"  legacy         {slow * 1000:10.3f} ms")
+        for label, func in (("numpy", raster.pack), ("pure bytes", without_numpy)):
+            fast = best_of(func, image, 20)
+            print(f"  {label:<14} {fast * 1000:10.3f} ms  (x{slow / fast:,.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure receipts per minute on a link throttled at the printer baud rate, and the pacing efficiency.
+
+The efficiency is the ratio of the time the printer is busy printing, to the elapsed time:
+the closer to 100%, the less time is wasted in sleeps longer than needed. Bytes lost because
+the printer receive buffer was full reveal pacing that is too aggressive.
+
+Usage: python -m benchmarks.throughput [--receipts 3] [--baudrate 19200] [--pacing timings]
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import monotonic
+
+from thermalprinter.constants import BarCode, Defaults, Justify, Pacing, Size
+from thermalprinter.thermalprinter import ThermalPrinter
+
+ITEMS = [("Coffee", "2.50"), ("Croissant", "1.80"), ("Orange juice", "3.20"), ("Cookie", "1.10")]
+
+
+def receipt(printer: ThermalPrinter) -> None:
+    printer.out("My Shop", bold=True, justify=Justify.CENTER, size=Size.LARGE)
+    printer.out("42 Main Street", justify=Justify.CENTER)
+    printer.feed()
+    for item, price in ITEMS:
+        printer.out(f"{item:<26}{price:>6}")
+    printer.out(f"{'TOTAL':<26}{'8.60':>6}", bold=True)
+    printer.barcode("012345678901", BarCode.EAN13)
+    printer.feed(3)
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="python -m benchmarks.throughput", description=str(__doc__).split("\n", 1)[0])
+    parser.add_argument("-n", "--receipts", type=int, default=3, help="number of receipts to print")
+    parser.add_argument("-b", "--baudrate", type=int, default=Defaults.BAUDRATE.value, help="link baud rate")
+    parser.add_argument(
+        "-p", "--pacing", choices=[pacing.value for pacing in Pacing], default=Pacing.TIMINGS.value, help="pacing mode"
+    )
+    options = parser.parse_args()
+
+    pacing = Pacing(options.pacing)
+    with ThermalPrinter("throttle://", baudrate=options.baudrate, pacing=pacing, use_stats=False) as printer:
+        port = printer._conn
+        start = monotonic()
+        for _ in range(options.receipts):
+            receipt(printer)
+
+    # Closing the printer waits for it to be done
+    elapsed = monotonic() - start
+
+    busy = port.emulator.duration
+    print(f"{options.receipts} receipts at {options.baudrate} bauds, {port.transmitted:,} bytes, {pacing.value} pacing")
+    print(f"  elapsed        {elapsed:10.3f} s")
+    print(f"  receipts/min   {options.receipts * 60 / elapsed:10.1f}")
+    print(f"  printer busy   {busy:10.3f} s  (efficiency: {busy / elapsed:.0%})")
+    print(f"  bytes lost     {port.overflow:10,}  (peak buffer usage: {port.peak:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
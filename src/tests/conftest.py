@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
-from tests.faker import FakeThermalPrinter
+from tests.faker import FakeClock, FakeThermalPrinter
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -27,3 +28,13 @@ def _no_warnings(recwarn: pytest.WarningsRecorder) -> Generator:
 def printer() -> Generator[ThermalPrinter]:
     with FakeThermalPrinter() as device:
         yield device
+
+
+@pytest.fixture
+def clock() -> Generator[FakeClock]:
+    """Fake time, for the driver, and the ``throttle://`` port. Request it before printers, to be used by them."""
+    clock = FakeClock()
+    driver = patch.multiple("thermalprinter.thermalprinter", monotonic=clock.monotonic, sleep=clock.sleep)
+    port = patch.multiple("thermalprinter.urlhandler.protocol_throttle", monotonic=clock.monotonic, sleep=clock.sleep)
+    with driver, port:
+        yield clock
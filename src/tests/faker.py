@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import queue
+from contextlib import contextmanager
+from time import monotonic
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 from thermalprinter import ThermalPrinter
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
     from typing import Any
 
 
@@ -30,3 +34,50 @@ class FakeThermalPrinter(ThermalPrinter):
 
         # Larger queue to handle all cases
         self._conn.queue = queue.Queue(4096 * 10)
+
+
+class FakeClock:
+    """A clock where time only passes while sleeping."""
+
+    def __init__(self) -> None:
+        # Start from the real time, for printers closed at exit
+        self.start = self.now = monotonic()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@contextmanager
+def captured(printer: ThermalPrinter) -> Generator[list[bytes]]:
+    """Capture writes to the printer serial port.
+
+    Data is copied right away: a mock would keep references to buffers, like shared memory, or memory-mapped files,
+    released afterwards.
+    """
+    sent: list[bytes] = []
+
+    def write(data: bytes) -> int:
+        sent.append(bytes(data))
+        return len(data)
+
+    with patch.object(printer._conn, "write", new=write):
+        yield sent
+
+
+def printed(printer: ThermalPrinter, *args: Any, method: str = "image", **kwargs: Any) -> bytes:
+    """Return bytes written to the printer serial port by one of its methods, :func:`ThermalPrinter.image()` by default."""
+    with captured(printer) as sent:
+        getattr(printer, method)(*args, **kwargs)
+    return b"".join(sent)
+
+
+def emulated_paper(*args: Any, method: str = "image", **kwargs: Any) -> Any:
+    """Return the paper printed on the ``emu://`` port by one of :class:`ThermalPrinter` methods, ``image()`` by default."""
+    with ThermalPrinter(
+        "emu://", byte_time=0.0, command_timeout=0.0, dot_feed_time=0.0, dot_print_time=0.0, use_stats=False
+    ) as printer:
+        getattr(printer, method)(*args, **kwargs)
+        return printer._conn.emulator.image()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from thermalprinter.aio import AsyncThermalPrinter
+from thermalprinter.constants import BarCode, Justify
+from thermalprinter.thermalprinter import ThermalPrinter
+
+TIMINGS: dict[str, Any] = {"byte_time": 0.0, "command_timeout": 0.0, "dot_feed_time": 0.0, "dot_print_time": 0.0}
+
+
+def test_same_bytes() -> None:
+    async def main() -> AsyncThermalPrinter:
+        async with AsyncThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+            await printer.out("Hello!", bold=True, justify=Justify.CENTER)
+            await printer.barcode("012345678901", BarCode.EAN13)
+            await printer.image(b"\xff\xff", width=8)
+            await printer.feed(2)
+        return printer
+
+    printer = asyncio.run(main())
+    with ThermalPrinter("record://", use_stats=False, **TIMINGS) as expected:
+        expected.out("Hello!", bold=True, justify=Justify.CENTER)
+        expected.barcode("012345678901", BarCode.EAN13)
+        expected.image(b"\xff\xff", width=8)
+        expected.feed(2)
+
+    assert printer.printer._conn.data == expected._conn.data
+    assert printer.lines == expected.lines
+    assert printer.feeds == expected.feeds
+    assert printer.metrics.bytes_written == len(expected._conn.data)
+
+
+def test_ordering() -> None:
+    async def main() -> bytes:
+        async with AsyncThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+            await asyncio.gather(*(printer.out(f"Line {idx}", bold=bool(idx % 2)) for idx in range(5)))
+            return bytes(printer.printer._conn.data)
+
+    data = asyncio.run(main())
+    expected = b"Line 0\n\x1bE\x01Line 1\n\x1bE\x00Line 2\n\x1bE\x01Line 3\n\x1bE\x00Line 4\n"
+    assert data.endswith(expected)
+
+
+def test_pacing_does_not_block() -> None:
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    async def main() -> None:
+        task = asyncio.create_task(ticker())
+        async with AsyncThermalPrinter("record://", use_stats=False, dot_feed_time=0.001) as printer:
+            await printer.feed(4)
+        task.cancel()
+
+    with patch("thermalprinter.thermalprinter.sleep", side_effect=AssertionError):
+        asyncio.run(main())
+    assert ticks > 5
+
+
+def test_close_at_exit(caplog: pytest.LogCaptureFixture) -> None:
+    printer = AsyncThermalPrinter("record://", use_stats=False, **TIMINGS)
+    driver = printer.printer
+
+    # Never entered, nor closed: the printer setup is still queued
+    driver._close_at_exit()  # type: ignore[attr-defined]
+    assert "were never sent to the printer" in caplog.text
+    assert not driver._conn.is_open
+
+
+def test_status() -> None:
+    async def main() -> dict[str, bool]:
+        async with AsyncThermalPrinter("emu://", use_stats=False, **TIMINGS) as printer:
+            printer.printer._conn.emulator.has_paper = False
+            return await printer.status()
+
+    assert asyncio.run(main()) == {"paper": False, "temp": True, "voltage": True}
+
+
+def test_serial_port() -> None:
+    pty = pytest.importorskip("pty")
+    tty = pytest.importorskip("tty")
+    controller, device = pty.openpty()
+    tty.setraw(device)
+
+    async def main() -> None:
+        async with AsyncThermalPrinter(os.ttyname(device), use_stats=False, **TIMINGS) as printer:
+            assert printer.printer._fd is not None  # type: ignore[attr-defined]
+            await printer.out("Hello!")
+
+    try:
+        asyncio.run(main())
+        data = b""
+        while not data.endswith(b"Hello!\n"):
+            data += os.read(controller, 1024)
+    finally:
+        os.close(controller)
+        os.close(device)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from threading import Event, Thread, Timer, current_thread
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from serial import SerialTimeoutException
+
+from thermalprinter.background import BackgroundThermalPrinter
+from thermalprinter.constants import BarCode, Justify
+from thermalprinter.thermalprinter import ThermalPrinter
+
+TIMINGS: dict[str, Any] = {"byte_time": 0.0, "command_timeout": 0.0, "dot_feed_time": 0.0, "dot_print_time": 0.0}
+
+
+def receipt(printer: ThermalPrinter) -> None:
+    printer.out("Hello!", bold=True, justify=Justify.CENTER)
+    printer.barcode("012345678901", BarCode.EAN13)
+    printer.image(b"\xff\xff", width=8)
+    printer.feed(2)
+
+
+def test_same_bytes() -> None:
+    with BackgroundThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+        receipt(printer)
+        printer.join()
+    with ThermalPrinter("record://", use_stats=False, **TIMINGS) as expected:
+        receipt(expected)
+
+    assert printer._conn.data == expected._conn.data
+    assert printer.metrics.bytes_written == len(expected._conn.data)
+
+
+def test_calls_do_not_wait() -> None:
+    with BackgroundThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+        printer.join()
+        released = Event()
+        with patch.object(printer._conn, "write", side_effect=lambda _: released.wait()):
+            printer.out("Hello!")
+            printer.feed(2)
+            assert not printer._queue.empty()
+            released.set()
+            printer.join()
+            assert printer._queue.empty()
+
+
+def test_queue_size() -> None:
+    def print_lines() -> None:
+        for idx in range(5):
+            printer.out(f"Line {idx}")
+
+    with BackgroundThermalPrinter("record://", queue_size=2, use_stats=False, **TIMINGS) as printer:
+        printer.join()
+        released = Event()
+        with patch.object(printer._conn, "write", side_effect=lambda _: released.wait()):
+            caller = Thread(target=print_lines)
+            caller.start()
+
+            # The queue is full, the caller waits for room
+            caller.join(0.1)
+            assert caller.is_alive()
+
+            released.set()
+            caller.join()
+            printer.join()
+
+
+def test_writer_error() -> None:
+    with BackgroundThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+        printer.join()
+        released = Event()
+
+        def write(_: bytes) -> None:
+            released.wait()
+            msg = "Write timeout"
+            raise SerialTimeoutException(msg)
+
+        with patch.object(printer._conn, "write", side_effect=write):
+            printer.out("Hello!")
+            released.set()
+            with pytest.raises(SerialTimeoutException):
+                printer.join()
+
+        # The error is raised once, the printer is still usable
+        printer.out("Hello!")
+        printer.join()
+        assert printer._conn.data.endswith(b"Hello!\n")
+
+
+def test_flush() -> None:
+    with BackgroundThermalPrinter("record://", use_stats=False, **TIMINGS) as printer:
+        printer.join()
+        calls: list[tuple[str, str]] = []
+        released = Event()
+
+        def write(data: bytes) -> int:
+            released.wait()
+            calls.append(("write", current_thread().name))
+            return len(data)
+
+        def reset(name: str) -> Mock:
+            return Mock(side_effect=lambda: calls.append((name, current_thread().name)))
+
+        port = printer._conn
+        with patch.multiple(
+            port,
+            write=Mock(side_effect=write),
+            reset_output_buffer=reset("reset_output_buffer"),
+            reset_input_buffer=reset("reset_input_buffer"),
+        ):
+            printer.out("Hello!")
+            printer.feed(2)
+
+            # Writes are still queued when flushing
+            Timer(0.05, released.set).start()
+            printer.flush(clear=True)
+
+        # Port buffers are reset after queued writes, from the writer thread
+        writer = printer._writer.name
+        assert calls == [("write", writer)] * 3 + [("reset_output_buffer", writer), ("reset_input_buffer", writer)]
+        assert printer._queue.empty()
+
+
+def test_status() -> None:
+    with BackgroundThermalPrinter("emu://", use_stats=False, **TIMINGS) as printer:
+        printer.out("Hello!")
+        printer._conn.emulator.has_paper = False
+        assert not printer.has_paper
+
+
+def test_close() -> None:
+    printer = BackgroundThermalPrinter("record://", use_stats=False, **TIMINGS)
+    printer.out("Hello!")
+    printer.close()
+    assert not printer._writer.is_alive()
+    assert not printer._conn.is_open
+    assert printer._conn.data.endswith(b"Hello!\n")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from thermalprinter.constants import Command, Justify
+
+if TYPE_CHECKING:
+    from tests.faker import FakeClock
+    from thermalprinter.thermalprinter import ThermalPrinter
+
+
+def test_buffered_single_write(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, printer.buffered():
+        for idx in range(40):
+            printer.out(f"Line {idx}", bold=True, justify=Justify.CENTER)
+        assert not write.called
+
+    assert write.call_count == 1
+    data = write.call_args[0][0]
+    assert data.count(b"\x1bE\x01") == 40
+    assert data.count(b"\n") == 40
+    assert printer.lines == 40
+    assert printer._justify is Justify.LEFT
+
+
+def test_buffered_same_bytes(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.out("Line", bold=True)
+        printer.feed(2)
+    unbuffered = b"".join(call[0][0] for call in write.call_args_list)
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, printer.buffered():
+        printer.out("Line", bold=True)
+        printer.feed(2)
+    assert write.call_args[0][0] == unbuffered
+
+
+def test_buffered_pacing_once(clock: FakeClock, printer: ThermalPrinter) -> None:
+    printer._byte_time = 0.5
+    with patch.object(printer, "_busy", wraps=printer._busy) as busy, printer.buffered():
+        printer.send_command(Command.ESC, 69, 1)
+        printer.send_command(Command.ESC, 69, 0)
+    busy.assert_called_once_with(3.0)
+    assert printer._busy_until == clock.start + 3.0
+
+
+def test_buffered_nested(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        with printer.buffered():
+            printer.out("one")
+            with printer.buffered():
+                printer.out("two")
+            assert not write.called
+        assert write.call_count == 1
+
+
+def test_buffered_overflow(printer: ThermalPrinter) -> None:
+    # 19200 bauds, and 1 second of write timeout
+    assert printer._tx_chunk_size == 1745
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, printer.buffered():
+        for _ in range(40):
+            printer.out(b"x" * 99)
+    assert write.call_count == 3
+    assert all(len(call[0][0]) <= printer._tx_chunk_size for call in write.call_args_list)
+
+
+def test_buffered_status(printer: ThermalPrinter) -> None:
+    with printer.buffered():
+        printer.write(b" ")
+        assert printer.status() == printer.status_to_dict(ord(" "))
@@ -0,0 +1,154 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.faker import FakeThermalPrinter, captured, printed
+from thermalprinter.cache import RASTER_HEADER, RASTER_MAGIC, ImageCache, LRUCache
+from thermalprinter.constants import ImageScale
+from thermalprinter.raster import Raster
+
+Image = pytest.importorskip("PIL.Image")
+
+SMALL = Path(__file__).parent / "glider.png"
+BIG = Path(__file__).parent / "glider-big.png"
+
+
+def test_lru_cache() -> None:
+    cache: LRUCache[str] = LRUCache(10)
+    cache.set("a", "a", 4)
+    cache.set("b", "b", 4)
+    assert cache.get("a") == "a"
+
+    # "b" is the least recently used entry
+    cache.set("c", "c", 4)
+    assert "b" not in cache
+    assert len(cache) == 2
+    assert cache.size == 8
+
+    # Too big to be stored
+    cache.set("d", "d", 11)
+    assert "d" not in cache
+
+    assert cache.pop("a") == "a"
+    assert cache.size == 4
+    cache.clear()
+    assert not cache
+    assert cache.size == 0
+
+
+def test_image_cache_hit() -> None:
+    cache = ImageCache()
+    with FakeThermalPrinter(image_cache=cache) as printer:
+        data = printed(printer, SMALL)
+        assert len(cache) == 1
+        with patch.object(printer, "image_convert") as image_convert:
+            assert printed(printer, SMALL) == data
+        image_convert.assert_not_called()
+        assert printer.lines == 2
+
+
+def test_image_cache_bands() -> None:
+    cache = ImageCache()
+    with FakeThermalPrinter(image_cache=cache) as printer:
+        with captured(printer) as sent:
+            printer.image(BIG, band_height=64)
+        assert sum(chunk.startswith(b"\x1dv0") for chunk in sent) > 1
+        assert len(cache) == 1
+
+        # Printed from the cache, by bands too
+        assert printed(printer, BIG, band_height=64) == b"".join(sent)
+
+
+def test_image_cache_too_large() -> None:
+    cache = ImageCache(max_size=100)
+    with FakeThermalPrinter(image_cache=cache) as printer:
+        printer.image(BIG, band_height=64)
+    assert not len(cache)
+
+
+def test_image_cache_scale_is_part_of_the_key() -> None:
+    cache = ImageCache()
+    with FakeThermalPrinter(image_cache=cache) as printer:
+        printer.image(SMALL)
+        printer.image(SMALL, scale=ImageScale.QUADRUPLE)
+    assert len(cache) == 2
+
+
+def test_image_cache_file_modified(tmp_path: Path) -> None:
+    file = tmp_path / "glider.png"
+    shutil.copy(SMALL, file)
+    key = ImageCache.key(file)
+
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert ImageCache.key(file) != key
+
+
+def test_image_cache_key() -> None:
+    assert not ImageCache.key(Path("inexistent.png"))
+    assert not ImageCache.key(object())
+
+    image = Image.new("1", (8, 2), color=1)
+    key = ImageCache.key(image)
+    assert ImageCache.key(image.copy()) == key
+    image.putpixel((0, 0), 0)
+    assert ImageCache.key(image) != key
+
+
+def test_image_cache_on_disk(tmp_path: Path) -> None:
+    with FakeThermalPrinter(image_cache=ImageCache(directory=tmp_path)) as printer:
+        data = printed(printer, SMALL)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A new cache, loading the raster from the disk without even importing PIL
+    cache = ImageCache(directory=tmp_path)
+    with FakeThermalPrinter(image_cache=cache) as printer, patch.dict(sys.modules, {"PIL": None, "PIL.Image": None}):
+        assert printed(printer, SMALL) == data
+    assert len(cache) == 1
+
+
+def test_image_cache_on_disk_corrupted(tmp_path: Path) -> None:
+    cache = ImageCache(directory=tmp_path)
+    bitmap = Raster(b"\xff\x00", 1, ImageScale.DOUBLE_HEIGHT)
+    cache.set("key", bitmap)
+    assert ImageCache(directory=tmp_path).get("key") == bitmap
+
+    (tmp_path / "key").write_bytes(b"TPR")
+    assert ImageCache(directory=tmp_path).get("key") is None
+
+
+@pytest.mark.parametrize(
+    ("row_bytes", "mode", "data"),
+    [(1, 9, b"\xff"), (0, 0, b"\xff"), (48, 0, b"\xff" * 10)],
+    ids=["unknown mode", "no row bytes", "truncated"],
+)
+def test_image_cache_on_disk_invalid(tmp_path: Path, row_bytes: int, mode: int, data: bytes) -> None:
+    file = tmp_path / "key"
+    file.write_bytes(RASTER_HEADER.pack(RASTER_MAGIC, row_bytes, mode) + data)
+    assert ImageCache(directory=tmp_path).get("key") is None
+    assert not file.exists()
+
+
+def test_image_cache_on_disk_max_size(tmp_path: Path) -> None:
+    cache = ImageCache(directory=tmp_path, max_disk_size=3 * (RASTER_HEADER.size + 1))
+    for idx, key in enumerate("abc"):
+        cache.set(key, Raster(b"\xff", 1))
+        os.utime(tmp_path / key, ns=(idx, idx))
+
+    # "a" is used again, "b" is now the least recently used one
+    assert ImageCache(directory=tmp_path).get("a")
+    cache.set("d", Raster(b"\xff", 1))
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["a", "c", "d"]
+
+
+def test_image_cache_on_disk_read_only(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    file = tmp_path / "file"
+    file.touch()
+    cache = ImageCache(directory=file)
+    cache.set("key", Raster(b"\xff", 1))
+    assert cache.get("key") == Raster(b"\xff", 1)
+    assert "Cannot persist the raster" in caplog.text
@@ -0,0 +1,74 @@
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from thermalprinter.constants import Dithering
+from thermalprinter.dithering import BAYER_THRESHOLDS, dither, dither_rows, otsu_threshold
+
+WIDTH, HEIGHT = 37, 23
+
+
+def gradient(width: int = WIDTH, height: int = HEIGHT) -> bytes:
+    return bytes(x * 255 // (width - 1) for _ in range(height) for x in range(width))
+
+
+def noise(width: int = WIDTH, height: int = HEIGHT) -> bytes:
+    rand = random.Random(42)
+    return bytes(rand.randrange(256) for _ in range(width * height))
+
+
+@pytest.mark.parametrize("mode", list(Dithering))
+def test_dither_same_results_without_numpy(mode: Dithering) -> None:
+    pytest.importorskip("numpy")
+    for data in (gradient(), noise()):
+        with patch.dict(sys.modules, {"numpy": None}):
+            expected = dither(data, WIDTH, HEIGHT, mode)
+        assert expected == dither_rows(data, WIDTH, HEIGHT, mode)
+        assert dither(data, WIDTH, HEIGHT, mode) == expected
+        assert set(expected) <= {0, 255}
+
+
+@pytest.mark.parametrize(
+    ("mode", "levels"),
+    [
+        (Dithering.FLOYD_STEINBERG, (32, 128, 192)),
+        (Dithering.BAYER, (32, 128, 192)),
+        # Only 3/4 of the error is diffused: more contrast, very dark, and very light, grays are lost
+        (Dithering.ATKINSON, (96, 128, 160)),
+    ],
+)
+def test_dither_keeps_gray_levels(mode: Dithering, levels: tuple[int, ...]) -> None:
+    # A uniform gray is printed with about the same proportion of black dots
+    for level in levels:
+        data = bytes([level]) * WIDTH * HEIGHT
+        black = dither(data, WIDTH, HEIGHT, mode).count(0) / len(data)
+        assert black == pytest.approx(1 - level / 255, abs=0.1)
+
+
+def test_dither_none() -> None:
+    assert dither(bytes([0, 127, 128, 255]), 4, 1, Dithering.NONE) == bytes([0, 0, 255, 255])
+
+
+def test_dither_floyd_steinberg() -> None:
+    # 100 -> black, 7/16 of the error to the right: 143 -> white, then 100 + 31 - 21 = 110 -> black, ...
+    assert dither(bytes([100, 100, 100, 100]), 2, 2, Dithering.FLOYD_STEINBERG) == bytes([0, 255, 0, 0])
+
+
+def test_bayer_thresholds() -> None:
+    values = sorted(value for row in BAYER_THRESHOLDS for value in row)
+    assert values == list(range(2, 256, 4))
+    assert BAYER_THRESHOLDS[0][:2] == [2, 130]
+
+
+def test_otsu() -> None:
+    histogram = [0] * 256
+    histogram[40] = histogram[60] = 100
+    histogram[200] = histogram[220] = 300
+    assert 60 <= otsu_threshold(histogram) < 200
+    assert otsu_threshold([0] * 255 + [10]) == 0
+    assert otsu_threshold([10] + [0] * 255) == 0
+
+    data = bytes([50] * 10 + [210] * 30)
+    assert dither(data, 40, 1, Dithering.OTSU) == bytes([0] * 10 + [255] * 30)
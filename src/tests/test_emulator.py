@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from serial import SerialException
+
+from thermalprinter.constants import BarCode, BarCodePosition, Defaults, ImageScale, Justify, Size, Underline
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+Image = pytest.importorskip("PIL.Image")
+
+from thermalprinter.emulator import Emulator  # noqa: E402
+
+BIG = Path(__file__).parent / "glider-big.png"
+
+
+def ink(image: Any) -> tuple[int, int]:
+    """Return (0, 0) for a black image, (255, 255) for a white one, and (0, 255) when mixed."""
+    return image.convert("L").getextrema()
+
+
+def black_rows(image: Any) -> list[int]:
+    return [y for y in range(image.height) if any(not image.getpixel((x, y)) for x in range(image.width))]
+
+
+@pytest.fixture
+def emulated() -> Generator[ThermalPrinter]:
+    with ThermalPrinter(
+        "emu://", use_stats=False, byte_time=0.0, command_timeout=0.0, dot_feed_time=0.0, dot_print_time=0.0
+    ) as printer:
+        yield printer
+
+
+def test_text() -> None:
+    emulator = Emulator(byte_time=0.001, dot_feed_time=0.01, dot_print_time=0.3)
+    emulator.write(b"Hello!\n")
+
+    image = emulator.image()
+    assert image.size == (384, 30)
+    assert black_rows(image)
+    assert max(black_rows(image)) < 24
+    assert emulator.duration == pytest.approx(7 * 0.001 + 24 * 0.01 + 6 * 0.01)
+    assert emulator.received == 7
+
+
+def test_text_not_terminated() -> None:
+    emulator = Emulator()
+    emulator.write(b"Hello!")
+    assert emulator.height == 0
+    emulator.write(b"\n")
+    assert emulator.height == 30
+
+
+def test_text_wrapped() -> None:
+    emulator = Emulator()
+    emulator.write(b"x" * 40 + b"\n")
+    assert emulator.height == 2 * 30
+
+
+def test_text_size() -> None:
+    emulator = Emulator()
+    emulator.write(b"\x1d!\x11Hi\n")
+    assert emulator.height == 48
+    assert max(black_rows(emulator.image())) > 24
+
+
+def test_text_justify(emulated: ThermalPrinter) -> None:
+    emulated.out("Hi", justify=Justify.RIGHT)
+    image = emulated._conn.emulator.image()
+    assert ink(image.crop((0, 0, 384 - 24, 30))) == (255, 255)
+    assert ink(image.crop((384 - 24, 0, 384, 30))) == (0, 255)
+
+
+def test_text_inverse(emulated: ThermalPrinter) -> None:
+    emulated.out(" ", inverse=True)
+    image = emulated._conn.emulator.image()
+    assert ink(image.crop((0, 0, 12, 24))) == (0, 0)
+
+
+def test_text_styles(emulated: ThermalPrinter) -> None:
+    emulated.out("Hi", bold=True, double_width=True, size=Size.MEDIUM, underline=Underline.THIN)
+    emulated.out("Hi", font_b=True, rotate=True, upside_down=True, char_spacing=2)
+    emulated.out("你好", chinese=True)
+    assert emulated._conn.emulator.height == 48 + 30 + 30
+
+
+def test_feed() -> None:
+    emulator = Emulator(byte_time=0.0, dot_feed_time=0.01)
+    emulator.write(b"\x1bd\x02\x1bJ\x05\x1b3\x10\n")
+    assert emulator.height == 2 * 30 + 5 + 16
+    assert emulator.duration == pytest.approx(emulator.height * 0.01)
+
+
+def test_command_split_across_writes() -> None:
+    emulator = Emulator()
+    emulator.write(b"\x1b")
+    emulator.write(b"d")
+    assert emulator.height == 0
+    emulator.write(b"\x01")
+    assert emulator.height == 30
+
+
+def test_unknown_command(caplog: pytest.LogCaptureFixture) -> None:
+    emulator = Emulator()
+    emulator.write(b"\x1b\x01\x02\n")
+    assert "Unknown command: 27 1" in caplog.text
+    assert emulator.height == 30
+
+
+def test_offline() -> None:
+    emulator = Emulator()
+    emulator.write(b"\x1b=\x00Hello!\n\x1b=\x01\n")
+    assert emulator.height == 30
+
+
+def test_reset() -> None:
+    emulator = Emulator()
+    emulator.write(b"\x1bE\x01Hello!\x1b@\n")
+    assert emulator.height == 30
+    assert not black_rows(emulator.image())
+
+
+def test_test_page() -> None:
+    emulator = Emulator()
+    emulator.write(b"\x12T")
+    assert emulator.height == 4 * 30
+
+
+def test_raster(emulated: ThermalPrinter) -> None:
+    with Image.open(BIG) as source:
+        expected = emulated.image_resize(emulated.image_convert(source))
+    emulated.image(expected)
+
+    image = emulated._conn.emulator.image()
+    assert image.height == expected.height
+    assert image.crop((0, 0, expected.width, expected.height)).tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize(
+    ("scale", "size"),
+    [(ImageScale.NORMAL, (8, 2)), (ImageScale.DOUBLE_WIDTH, (16, 2)), (ImageScale.QUADRUPLE, (16, 4))],
+)
+def test_raster_scale(emulated: ThermalPrinter, scale: ImageScale, size: tuple[int, int]) -> None:
+    emulated.image(b"\xff\xff", width=8, scale=scale)
+    image = emulated._conn.emulator.image()
+    assert image.height == size[1]
+    assert ink(image.crop((0, 0, *size))) == (0, 0)
+    assert ink(image.crop((size[0], 0, 384, size[1]))) == (255, 255)
+
+
+def test_raster_cropped(emulated: ThermalPrinter) -> None:
+    emulated.image(b"\x00" * 47 + b"\x01", width=384, crop=True)
+    image = emulated._conn.emulator.image()
+    assert image.getpixel((383, 0)) == 0
+    assert ink(image.crop((0, 0, 383, 1))) == (255, 255)
+
+
+@pytest.mark.parametrize("justify", list(Justify))
+def test_raster_cropped_margin(justify: Justify) -> None:
+    canvas = Image.new("1", (128, 4), 1)
+    canvas.paste(0, (40, 0, 56, 4))
+
+    def render(*, crop: bool) -> bytes:
+        with ThermalPrinter(
+            "emu://", use_stats=False, byte_time=0.0, command_timeout=0.0, dot_feed_time=0.0, dot_print_time=0.0
+        ) as printer:
+            printer.left_margin(3)
+            printer.justify(justify)
+            printer.image(canvas, crop=crop)
+            result: bytes = printer._conn.emulator.image().tobytes()
+        return result
+
+    assert render(crop=True) == render(crop=False)
+
+
+def test_raster_duration() -> None:
+    emulator = Emulator(byte_time=0.0, dot_print_time=0.3)
+    emulator.write(b"\x1dv0\x00\x01\x00\x0a\x00" + b"\xff" * 10)
+    assert emulator.height == 10
+    assert emulator.duration == pytest.approx(10 * 0.3 / Defaults.LINE_SPACING.value)
+
+
+@pytest.mark.parametrize(
+    ("position", "height"),
+    [(BarCodePosition.HIDDEN, 50), (BarCodePosition.BELOW, 50 + 30), (BarCodePosition.BOTH, 50 + 2 * 30)],
+)
+def test_barcode(emulated: ThermalPrinter, position: BarCodePosition, height: int) -> None:
+    emulated.barcode("012345678901", BarCode.EAN13, height=50, position=position, width=2)
+    assert emulated._conn.emulator.height == height
+
+
+def test_status(emulated: ThermalPrinter) -> None:
+    assert emulated.has_paper
+    emulated._conn.emulator.has_paper = False
+    assert not emulated.has_paper
+    assert not emulated._conn.in_waiting
+
+
+def test_url_output(tmp_path: Path) -> None:
+    file = tmp_path / "paper.png"
+    with ThermalPrinter(f"emu://?output={file}", use_stats=False, command_timeout=0.0) as printer:
+        printer.out("Hello!")
+    with Image.open(file) as image:
+        assert image.size == (384, 30)
+
+
+def test_url_unknown_option() -> None:
+    with pytest.raises(SerialException, match="Unknown option: 'foo'"):
+        ThermalPrinter("emu://?foo=bar", use_stats=False)
@@ -1,8 +1,15 @@
 import logging
+import random
+import struct
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 
+from tests.faker import emulated_paper
+from thermalprinter.constants import MAX_IMAGE_HEIGHT, Dithering, ImageScale, Justify
+from thermalprinter.exceptions import ThermalPrinterValueError
 from thermalprinter.thermalprinter import ThermalPrinter
 
 Image = pytest.importorskip("PIL.Image")
@@ -61,6 +68,7 @@ def test_resize_is_necessary(printer: ThermalPrinter, caplog: pytest.CaptureFixt
     try:
         assert image.size == (900, 900)
         assert printer.image_resize(image).size == (384, 384)
+        assert image.size == (900, 900)
     finally:
         image.close()
 
@@ -82,3 +90,297 @@ def test_image_big(printer: ThermalPrinter) -> None:
         printer.image(image)
     finally:
         image.close()
+
+
+def test_image_few_writes(printer: ThermalPrinter) -> None:
+    image = Image.open(BIG)
+    try:
+        with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+            printer.image(image, skip_blank_rows=False)
+    finally:
+        image.close()
+
+    # 1 header + 384 rows of 48 bytes, sent by slices of 36 rows
+    assert write.call_count == 1 + 11
+    header, *chunks = (call[0][0] for call in write.call_args_list)
+    assert header == b"\x1dv0\x000\x00\x80\x01"
+    assert all(len(chunk) % 48 == 0 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == 48 * 384
+    assert printer.lines == 384 // 30 + 1
+
+
+def headers(data: bytes) -> list[int]:
+    """Return heights of all raster bitmap commands found in ``data``."""
+    heights = []
+    offset = data.find(b"\x1dv0\x00")
+    while offset != -1:
+        row_bytes, height = struct.unpack_from("<HH", data, offset + 4)
+        heights.append(height)
+        offset = data.find(b"\x1dv0\x00", offset + 8 + row_bytes * height)
+    return heights
+
+
+def test_image_bands(printer: ThermalPrinter) -> None:
+    image = Image.open(BIG)
+    try:
+        with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+            printer.image(image, band_height=100, skip_blank_rows=False)
+        bitmap = printer.image_chunks(printer.image_resize(printer.image_convert(image)))
+    finally:
+        image.close()
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert headers(data) == [100, 100, 100, 84]
+    assert data.replace(b"\x1dv0\x000\x00d\x00", b"").replace(b"\x1dv0\x000\x00T\x00", b"") == bitmap
+    assert printer.lines == 384 // 30 + 1
+
+
+def test_image_bands_too_tall(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (8, MAX_IMAGE_HEIGHT + 10), color=0)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert headers(data) == [MAX_IMAGE_HEIGHT, 10]
+    assert len(data) == 2 * 8 + MAX_IMAGE_HEIGHT + 10
+
+
+@pytest.mark.parametrize("band_height", [0, MAX_IMAGE_HEIGHT + 1, "1"])
+def test_image_bands_bad_value(band_height: Any, printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError):
+        printer.image(SMALL, band_height=band_height)
+
+
+def test_image_skip_blank_rows(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (384, 70), color=1)
+    image.paste(0, (0, 0, 384, 10))
+    image.paste(0, (0, 60, 384, 70))
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    black = b"\xff" * 48 * 10
+    assert data == b"\x1dv0\x000\x00\n\x00" + black + b"\x1bJ2" + b"\x1dv0\x000\x00\n\x00" + black
+    assert printer.lines == 70 // 30 + 1
+
+
+def test_image_skip_blank_rows_long_run(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (16, 600), color=1)
+    image.paste(0, (0, 0, 16, 1))
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x00\x02\x00\x01\x00\xff\xff" + b"\x1bJ\xff" * 2 + b"\x1bJ\x59"
+
+
+def test_image_skip_blank_rows_not_worth_it(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (8, 12), color=1)
+    image.paste(0, (0, 0, 8, 1))
+    image.paste(0, (0, 11, 8, 12))
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x00\x01\x00\x0c\x00\xff" + b"\x00" * 10 + b"\xff"
+
+
+def test_image_keep_blank_rows(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (384, 70), color=1)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image, skip_blank_rows=False)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x000\x00F\x00" + b"\x00" * 48 * 70
+
+
+def test_image_crop(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (384, 4), color=1)
+    image.paste(0, (140, 0, 236, 4))
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image, crop=True)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    row = b"\x0f" + b"\xff" * 11 + b"\xf0"
+    assert data == b"\x1dL\x88\x00" + b"\x1dv0\x00\x0d\x00\x04\x00" + row * 4 + b"\x1dL\x00\x00"
+
+
+def test_image_crop_centered(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (200, 1), color=1)
+    image.paste(0, (16, 0, 24, 1))
+    printer.justify(Justify.CENTER)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image, crop=True)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    # (384 - 200) // 2 + 16 = 108
+    assert data == b"\x1ba\x00" + b"\x1dL\x6c\x00" + b"\x1dv0\x00\x01\x00\x01\x00\xff" + b"\x1dL\x00\x00" + b"\x1ba\x01"
+    assert printer._justify is Justify.CENTER
+
+
+def test_image_crop_not_necessary(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (16, 1), color=0)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image, crop=True)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x00\x02\x00\x01\x00\xff\xff"
+
+
+def pixel_art(width: int, height: int, x_factor: int, y_factor: int) -> Any:
+    rand = random.Random(42)
+    small = Image.frombytes(
+        "L",
+        (width // x_factor, height // y_factor),
+        bytes(rand.choice((0, 255)) for _ in range(width // x_factor * height // y_factor)),
+    )
+    return small.resize((width, height), Image.Resampling.NEAREST).convert("1")
+
+
+@pytest.mark.parametrize(
+    ("x_factor", "y_factor", "scale"),
+    [
+        (1, 1, ImageScale.NORMAL),
+        (2, 1, ImageScale.DOUBLE_WIDTH),
+        (1, 2, ImageScale.DOUBLE_HEIGHT),
+        (2, 2, ImageScale.QUADRUPLE),
+    ],
+)
+def test_image_scale_auto(x_factor: int, y_factor: int, scale: ImageScale, printer: ThermalPrinter) -> None:
+    image = pixel_art(96, 40, x_factor, y_factor)
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image)
+    expected = b"".join(call[0][0] for call in write.call_args_list)
+    assert printer.lines == 40 // 30 + 1
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(image, scale=None)
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert printer.lines == 2 * (40 // 30 + 1)
+
+    assert data[3] == scale.value[0]
+    assert len(data) - 8 == (len(expected) - 8) // (x_factor * y_factor)
+    assert emulated_paper(image, scale=None).tobytes() == emulated_paper(image).tobytes()
+
+
+@pytest.mark.parametrize("scale", list(ImageScale))
+def test_image_scale_forced(scale: ImageScale, printer: ThermalPrinter) -> None:
+    image = Image.open(BIG)
+    try:
+        with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+            printer.image(image, scale=scale, skip_blank_rows=False)
+    finally:
+        image.close()
+
+    _, x_factor, y_factor = scale.value
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data[:8] == struct.pack("<3sBHH", b"\x1dv0", scale.value[0], 48 // x_factor, 384 // x_factor)
+    with Image.open(BIG) as image:
+        assert emulated_paper(image, scale=scale, skip_blank_rows=False).height == 384 // x_factor * y_factor
+    assert printer.lines == 384 // x_factor * y_factor // 30 + 1
+
+
+def test_image_scale_crop(printer: ThermalPrinter) -> None:
+    image = pixel_art(64, 4, 2, 2)
+    canvas = Image.new("1", (192, 4), color=1)
+    canvas.paste(image, (64, 0))
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(canvas, crop=True, scale=ImageScale.DOUBLE_WIDTH)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    # The image starts at 64 * 2 dots
+    assert data.startswith(b"\x1dL\x80\x00\x1dv0\x01\x08\x00\x04\x00")
+
+
+def test_image_array(printer: ThermalPrinter) -> None:
+    np = pytest.importorskip("numpy")
+    image = Image.open(SMALL)
+    try:
+        bitmap = printer.image_convert(image)
+    finally:
+        image.close()
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(bitmap)
+    expected = b"".join(call[0][0] for call in write.call_args_list)
+
+    for array in (np.array(bitmap, dtype=np.uint8) * 255, ~np.array(bitmap)):
+        image_convert = patch.object(printer, "image_convert")
+        with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, image_convert as convert:
+            printer.image(array)
+        assert b"".join(call[0][0] for call in write.call_args_list) == expected
+        convert.assert_not_called()
+
+
+def test_image_array_scale_auto(printer: ThermalPrinter) -> None:
+    np = pytest.importorskip("numpy")
+    dots = np.zeros((4, 16), dtype=bool)
+    dots[:2, :8] = True
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(dots, scale=None)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x03\x01\x00\x02\x00\xf0\x00"
+
+
+def test_image_array_too_wide(printer: ThermalPrinter) -> None:
+    np = pytest.importorskip("numpy")
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(np.ones((10, 768), dtype=bool))
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert headers(data) == [5]
+    assert data.endswith(b"\xff" * 48 * 5)
+
+
+def test_image_array_bad_dimensions(printer: ThermalPrinter) -> None:
+    np = pytest.importorskip("numpy")
+    with pytest.raises(ThermalPrinterValueError, match="Only 2-D arrays"):
+        printer.image(np.zeros((2, 2, 3), dtype=np.uint8))
+
+
+def test_image_packed(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(b"\xaa\x55", width=8, scale=None)
+
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert data == b"\x1dv0\x00\x01\x00\x02\x00\xaa\x55"
+
+
+@pytest.mark.parametrize("dithering", list(Dithering))
+def test_image_convert_dithering(printer: ThermalPrinter, dithering: Dithering) -> None:
+    image = Image.frombytes("L", (64, 64), bytes(y * 255 // 63 for y in range(64) for _ in range(64)))
+    new_image = printer.image_convert(image, dithering=dithering)
+    assert new_image.mode == "1"
+
+    # The gradient goes from black (top) to white (bottom)
+    pixels = list(new_image.getdata())
+    assert pixels[:64].count(0) == 64
+    assert pixels[-64:].count(0) == 0
+
+
+def test_image_dithering(printer: ThermalPrinter) -> None:
+    np = pytest.importorskip("numpy")
+    gray = np.full((16, 768), 128, dtype=np.uint8)
+
+    # Dithered after being resized
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(Image.fromarray(gray), dithering=Dithering.BAYER)
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert headers(data) == [8]
+    assert data[8:56] == b"\x55" * 48
+
+    # Arrays too
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(gray[:, :384], dithering=Dithering.BAYER)
+    data = b"".join(call[0][0] for call in write.call_args_list)
+    assert headers(data) == [16]
+    assert data[8:56] == b"\x55" * 48
+
+
+@pytest.mark.parametrize("dithering", list(Dithering))
+def test_image_untouched(printer: ThermalPrinter, dithering: Dithering) -> None:
+    with Image.open(BIG) as image:
+        printer.image(image, dithering=dithering)
+        assert image.size == (900, 900)
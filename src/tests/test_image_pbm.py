@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.faker import printed
+from thermalprinter.constants import ImageScale
+from thermalprinter.exceptions import ThermalPrinterValueError
+from thermalprinter.thermalprinter import ThermalPrinter
+
+BIG = Path(__file__).parent / "glider-big.png"
+
+
+def test_image_pbm_file(printer: ThermalPrinter, tmp_path: Path) -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    file = tmp_path / "glider.pbm"
+    with image_module.open(BIG) as image:
+        bitmap = printer.image_resize(printer.image_convert(image))
+        bitmap.save(file)
+    assert file.read_bytes().startswith(b"P4")
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.image(bitmap)
+    expected = b"".join(call[0][0] for call in write.call_args_list)
+    lines = printer.lines
+
+    with patch.dict(sys.modules, {"PIL": None, "PIL.Image": None}):
+        assert printed(printer, file, method="image_pbm") == expected
+    assert printer.lines == 2 * lines
+
+
+def test_image_pbm_header_with_comment(printer: ThermalPrinter) -> None:
+    data = b"P4\n# Created by hand\n16 2\n\xff\x00\x00\x0f"
+    assert printed(printer, data, method="image_pbm") == b"\x1dv0\x00\x02\x00\x02\x00\xff\x00\x00\x0f"
+
+
+def test_image_pbm_raw(printer: ThermalPrinter) -> None:
+    data = bytearray(b"\x80\x01" * 3)
+    assert (
+        printed(printer, data, width=16, scale=ImageScale.DOUBLE_HEIGHT, method="image_pbm")
+        == b"\x1dv0\x02\x02\x00\x03\x00" + data
+    )
+    assert printer.lines == 3 * 2 // 30 + 1
+
+
+def test_image_pbm_bands(printer: ThermalPrinter) -> None:
+    data = b"\xff" * 5
+    assert printed(printer, data, width=8, band_height=2, method="image_pbm") == (
+        b"\x1dv0\x00\x01\x00\x02\x00\xff\xff" * 2 + b"\x1dv0\x00\x01\x00\x01\x00\xff"
+    )
+
+
+def test_image_pbm_not_pbm(printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="Not a binary PBM"):
+        printer.image_pbm(b"P1\n8 1\n0 1 0 1 0 1 0 1")
+
+
+def test_image_pbm_invalid_header(printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="Invalid binary PBM"):
+        printer.image_pbm(b"P4\n8 x\n\xff")
+
+
+def test_image_pbm_truncated(printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="Truncated image"):
+        printer.image_pbm(b"P4\n8 2\n\xff")
+
+
+@pytest.mark.parametrize(
+    ("width", "scale"), [(0, ImageScale.NORMAL), (385, ImageScale.NORMAL), (200, ImageScale.QUADRUPLE)]
+)
+def test_image_pbm_bad_width(printer: ThermalPrinter, width: int, scale: ImageScale) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="width should be between"):
+        printer.image_pbm(b"\xff" * 64, width=width, scale=scale)
+
+
+def test_image_pbm_bad_band_height(printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="band_height should be between"):
+        printer.image_pbm(b"\xff", width=8, band_height=0)
+
+
+def test_image_pbm_file_too_wide(printer: ThermalPrinter, tmp_path: Path) -> None:
+    file = tmp_path / "wide.pbm"
+    file.write_bytes(b"P4 400 1\n" + b"\xff" * 50)
+    with pytest.raises(ThermalPrinterValueError, match="width should be between"):
+        printer.image_pbm(file)
@@ -0,0 +1,241 @@
+import gc
+import weakref
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from tests.faker import FakeClock
+from thermalprinter.constants import BarCode, CodePage
+from thermalprinter.exceptions import ThermalPrinterCommunicationError, ThermalPrinterValueError
+from thermalprinter.job import Job, JobCache, JobCompiler, Segment, SegmentKind
+from thermalprinter.thermalprinter import ThermalPrinter
+from thermalprinter.urlhandler.protocol_record import Serial as RecordSerial
+
+
+def receipt(printer: ThermalPrinter) -> None:
+    printer.out("Hello!", bold=True)
+    printer.barcode("012345678901", BarCode.EAN13)
+    printer.feed(2)
+
+
+def test_job_compiler(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        receipt(printer)
+    expected = b"".join(call[0][0] for call in write.call_args_list)
+
+    with patch("thermalprinter.thermalprinter.sleep") as sleep, JobCompiler() as compiler:
+        receipt(compiler)
+        job = compiler.job()
+    sleep.assert_not_called()
+
+    assert job.data == expected
+    assert job.lines == printer.lines
+    assert job.feeds == printer.feeds == 2
+
+
+def test_job_compiler_duration() -> None:
+    with JobCompiler(byte_time=0.001, dot_feed_time=0.01, dot_print_time=0.02) as compiler:
+        assert compiler.job() == Job(b"")
+        compiler.feed(1)
+        job = compiler.job()
+
+    # 3 bytes for the command, and one line of 24 dots
+    assert job.data == b"\x1bd\x01"
+    assert job.duration == pytest.approx(3 * 0.001 + 24 * 0.01)
+
+
+def test_job_compiler_buffered() -> None:
+    with JobCompiler(byte_time=0.001) as compiler:
+        with compiler.buffered():
+            compiler.bold(True)
+            assert compiler.job().data == b"\x1bE\x01"
+            compiler.bold(False)
+        job = compiler.job()
+
+    assert job.data == b"\x1bE\x01\x1bE\x00"
+    assert job.duration == pytest.approx(0.006)
+
+
+def test_job_compiler_no_status() -> None:
+    with JobCompiler() as compiler, pytest.raises(ThermalPrinterCommunicationError):
+        compiler.status()
+
+
+def test_print_job(clock: FakeClock, printer: ThermalPrinter) -> None:
+    job = Job(b"\xaa" * 4000, lines=3, feeds=1, duration=2.0)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.print_job(job)
+
+    assert [len(call[0][0]) for call in write.call_args_list] == [1745, 1745, 510]
+    assert printer._busy_until == pytest.approx(clock.start + 2.0)
+    assert printer.lines == 3
+    assert printer.feeds == 1
+
+
+def test_print_job_copies(clock: FakeClock, printer: ThermalPrinter) -> None:
+    job = Job(b"\x1bd\x01", lines=1, feeds=1, duration=0.5)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.print_job(job, copies=3)
+
+    assert [call[0][0] for call in write.call_args_list] == [b"\x1bd\x01"] * 3
+    assert printer._busy_until == pytest.approx(clock.start + 1.5)
+    assert printer.lines == 3
+    assert printer.feeds == 3
+
+
+def test_print_job_no_copies(printer: ThermalPrinter) -> None:
+    with pytest.raises(ThermalPrinterValueError, match="copies should be greater than 0"):
+        printer.print_job(Job(b""), copies=0)
+
+
+def test_job_cache() -> None:
+    calls: list[ThermalPrinter] = []
+
+    def build(printer: ThermalPrinter) -> None:
+        calls.append(printer)
+        receipt(printer)
+
+    cache = JobCache()
+    job = cache.compile("receipt", build)
+    assert cache.compile("receipt", build) is job
+    assert len(calls) == 1
+    assert isinstance(calls[0], JobCompiler)
+    assert cache.size == len(job.data)
+
+
+def test_job_cache_eviction() -> None:
+    cache = JobCache(max_size=6)
+    cache.compile("a", lambda printer: printer.feed(1))
+    cache.compile("b", lambda printer: printer.feed(2))
+    cache.compile("a", lambda printer: printer.feed(1))
+    cache.compile("c", lambda printer: printer.feed(3))
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 6
+
+
+def test_job_cache_eviction_frees_memory() -> None:
+    compilers: list[weakref.ref[ThermalPrinter]] = []
+
+    def build(printer: ThermalPrinter) -> None:
+        compilers.append(weakref.ref(printer))
+        printer.out("x" * 5000)
+
+    cache = JobCache(max_size=10_000)
+    jobs = [weakref.ref(cache.compile(str(idx), build)) for idx in range(50)]
+    gc.collect()
+
+    assert len(cache) == 1
+    assert not any(compiler() for compiler in compilers)
+    assert sum(job() is not None for job in jobs) == 1
+
+
+def test_print_cached(printer: ThermalPrinter) -> None:
+    calls: list[int] = []
+
+    def build(printer: ThermalPrinter) -> None:
+        calls.append(1)
+        receipt(printer)
+
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        job = printer.print_cached("receipt", build)
+        first = b"".join(call[0][0] for call in write.call_args_list)
+        write.reset_mock()
+        assert printer.print_cached("receipt", build, copies=2) is job
+        again = b"".join(call[0][0] for call in write.call_args_list)
+
+    assert len(calls) == 1
+    assert first == job.data
+    assert again == job.data * 2
+    assert printer.lines == 3 * job.lines
+    assert printer.feeds == 6
+
+
+def test_job_compiler_segments() -> None:
+    with JobCompiler(byte_time=0.001, dot_feed_time=0.01, dot_print_time=0.02) as compiler:
+        compiler.out("Hello!", bold=True)
+        compiler.image(b"\xff\x00", width=8)
+        job = compiler.job()
+
+    assert [(segment.kind, segment.size) for segment in job.segments] == [
+        (SegmentKind.COMMAND, 3),
+        (SegmentKind.TEXT, 7),
+        (SegmentKind.COMMAND, 3 + 8),
+        (SegmentKind.RASTER, 2),
+    ]
+    assert sum(segment.size for segment in job.segments) == len(job.data)
+    assert sum(segment.delay for segment in job.segments) == pytest.approx(job.duration)
+    assert job.segments[1].delay == pytest.approx(24 * 0.01)
+    assert job.codepage is CodePage.CP437
+
+
+def test_print_job_segments(printer: ThermalPrinter) -> None:
+    segments = (Segment(SegmentKind.COMMAND, 0, 0.5), Segment(SegmentKind.TEXT, 3, 0.1), Segment(SegmentKind.RASTER, 2))
+    job = Job(b"abc\xff\xff", duration=0.6, segments=segments)
+    busy = patch.object(printer, "_busy", wraps=printer._busy)
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, busy as busy_mock:
+        printer.print_job(job)
+
+    assert [call[0][0] for call in write.call_args_list] == [b"abc", b"\xff\xff"]
+    assert [call[0][0] for call in busy_mock.call_args_list] == pytest.approx([0.5, 0.1, 0.0])
+
+
+def test_print_job_codepage(printer: ThermalPrinter) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.print_job(Job(b"abc", codepage=CodePage.CP850))
+
+    assert [call[0][0] for call in write.call_args_list] == [b"\x1bt\x02", b"abc"]
+
+
+def test_job_file(tmp_path: Path) -> None:
+    with JobCompiler() as compiler:
+        compiler.codepage(CodePage.CP850)
+        compiler_job = compiler.job()
+    with JobCompiler() as compiler:
+        receipt(compiler)
+        compiler.image(b"\xff\x00", width=8)
+        job = replace(compiler.job(), codepage=CodePage.CP850)
+    assert compiler_job.codepage is CodePage.CP437
+
+    file = tmp_path / "job.tpj"
+    job.save(file)
+    assert file.read_bytes().startswith(b"TPJ1")
+    assert Job.load(file) == job
+
+
+def test_job_file_without_segments() -> None:
+    job = Job(b"abc", lines=1)
+    assert Job.from_bytes(job.to_bytes()) == job
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"", "Not a print job"),
+        (b"PK\x03\x04" + b"\x00" * 30, "Not a print job"),
+        (Job(b"abc", codepage=CodePage.CP850).to_bytes().replace(b"TPJ1", b"TPJ2"), "Not a print job"),
+        (Job(b"abc", segments=(Segment(SegmentKind.TEXT, 3),)).to_bytes()[:-1], "Truncated print job"),
+    ],
+)
+def test_job_file_invalid(data: bytes, message: str) -> None:
+    with pytest.raises(ThermalPrinterValueError, match=message):
+        Job.from_bytes(data)
+
+
+def test_main_replay(tmp_path: Path) -> None:
+    from thermalprinter.__main__ import main
+
+    file = tmp_path / "job.tpj"
+    Job(b"\x1bd\x01", feeds=1).save(file)
+
+    written: list[bytes] = []
+    with patch("thermalprinter.constants.STATS_FILE", f"{tmp_path}/stats.json"):  # noqa: SIM117
+        with patch("sys.argv", ["thermalprinter", "replay", str(file), "--port", "record://", "--copies", "2"]):
+            with patch.object(RecordSerial, "write", new=lambda _, data: written.append(bytes(data))):
+                assert main() == 0
+
+    assert written[-2:] == [b"\x1bd\x01"] * 2
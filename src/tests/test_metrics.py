@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from thermalprinter.constants import BarCode
+from thermalprinter.job import JobCompiler
+from thermalprinter.metrics import Histogram, Metrics
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_metrics(printer: ThermalPrinter) -> None:
+    printer.metrics.clear()
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write:
+        printer.bold(True)
+        printer.barcode("012345678901", BarCode.EAN13)
+        printer.image(b"\xff\xff", width=8)
+
+    metrics = printer.metrics
+    assert metrics.writes == write.call_count
+    assert metrics.bytes_written == sum(len(call[0][0]) for call in write.call_args_list)
+    assert metrics.write_seconds >= 0.0
+    assert metrics.barcodes == 1
+    assert metrics.images == 1
+    assert metrics.raster_bytes == 2
+    assert metrics.to_dict()["commands"] == {"ESC 69": 1, "GS 107": 1, "GS 118": 1}
+
+
+def test_metrics_buffered(printer: ThermalPrinter) -> None:
+    printer.metrics.clear()
+    with printer.buffered():
+        printer.bold(True)
+        printer.bold(False)
+    assert printer.metrics.writes == 1
+    assert printer.metrics.bytes_written == 6
+    assert printer.metrics.to_dict()["commands"] == {"ESC 69": 2}
+
+
+def test_metrics_sleep() -> None:
+    with patch("thermalprinter.thermalprinter.sleep") as sleep:
+        with ThermalPrinter("record://", byte_time=0.001, command_timeout=0.0, use_stats=False) as printer:
+            printer.metrics.clear()
+            sleep.reset_mock()
+            printer.bold(True)
+            printer.feed(1)
+        assert printer.metrics.sleep_seconds == pytest.approx(sum(call[0][0] for call in sleep.call_args_list))
+    assert printer.metrics.sleep_seconds > 0.003
+
+
+def test_metrics_job(printer: ThermalPrinter) -> None:
+    with JobCompiler() as compiler:
+        compiler.out("Hello!")
+        job = compiler.job()
+
+    printer.print_job(job, copies=2)
+    with printer.metrics.job("receipt"):
+        printer.out("Hello!")
+
+    jobs = printer.metrics.to_dict()["jobs"]
+    assert set(jobs) == {"print_job", "receipt"}
+    assert jobs["print_job"]["count"] == 1
+    assert jobs["print_job"]["buckets"]["inf"] == 1
+
+
+def test_metrics_shared() -> None:
+    metrics = Metrics()
+    for _ in range(2):
+        with ThermalPrinter("record://", command_timeout=0.0, metrics=metrics, use_stats=False) as printer:
+            assert printer.metrics is metrics
+    assert metrics.commands[b"\x1b@"] == 2
+
+
+def test_histogram() -> None:
+    histogram = Histogram((1.0, 2.0))
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1.0, 2), (2.0, 3), (float("inf"), 4)]
+    assert histogram.count == 4
+    assert histogram.sum == 6.0
+
+
+def test_prometheus(tmp_path: Path) -> None:
+    metrics = Metrics()
+    metrics.bytes_written = 42
+    metrics.commands[b"\x1bE"] = 3
+    metrics.jobs["receipt"] = Histogram((1.0,))
+    metrics.jobs["receipt"].observe(0.5)
+
+    file = tmp_path / "thermalprinter.prom"
+    metrics.save(file)
+    text = file.read_text()
+    assert "# TYPE thermalprinter_bytes_written_total counter\nthermalprinter_bytes_written_total 42\n" in text
+    assert 'thermalprinter_commands_total{opcode="ESC 69"} 3\n' in text
+    assert 'thermalprinter_job_duration_seconds_bucket{job="receipt",le="1.0"} 1\n' in text
+    assert 'thermalprinter_job_duration_seconds_bucket{job="receipt",le="+Inf"} 1\n' in text
+    assert 'thermalprinter_job_duration_seconds_count{job="receipt"} 1\n' in text
+    assert [path.name for path in tmp_path.iterdir()] == [file.name]
+
+    metrics.clear()
+    assert metrics.to_dict()["bytes_written"] == 0
+    assert not metrics.jobs
+
+
+def test_prometheus_label_escaping() -> None:
+    metrics = Metrics()
+    name = 'a "quoted"\\name\n'
+    metrics.jobs[name] = Histogram((1.0,))
+    metrics.jobs[name].observe(0.5)
+
+    text = metrics.to_prometheus()
+    assert 'thermalprinter_job_duration_seconds_count{job="a \\"quoted\\"\\\\name\\n"} 1\n' in text
+
+    # No sample is split over several lines
+    assert len(text.splitlines()) == len(Metrics().to_prometheus().splitlines()) + 4
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.faker import FakeThermalPrinter
+from thermalprinter.constants import MAX_BUFFER_SIZE, FlowControl, Pacing
+from thermalprinter.job import Job
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.faker import FakeClock
+
+
+def test_pacing_overlaps(clock: FakeClock, printer: ThermalPrinter) -> None:
+    printer._dot_feed_time = 0.01
+    for idx in range(10):
+        printer.out(f"Line {idx}")
+
+    # The host did not wait, the printer is busy for all lines
+    assert clock.now == clock.start
+    assert printer._busy_until == pytest.approx(clock.start + 10 * 24 * 0.01)
+
+
+def test_pacing_receive_buffer(clock: FakeClock, printer: ThermalPrinter) -> None:
+    chunk = printer._tx_chunk_size
+    printer.print_job(Job(b"x" * 20 * chunk, duration=20.0))
+
+    # The first chunk was processed to make room for the last one
+    fitting = MAX_BUFFER_SIZE // chunk
+    assert clock.now == pytest.approx(clock.start + (20 - fitting))
+    assert printer._rx_level <= MAX_BUFFER_SIZE
+    assert printer._busy_until == pytest.approx(clock.start + 20.0)
+
+
+def test_pacing_receive_buffer_entries(clock: FakeClock, printer: ThermalPrinter) -> None:
+    count = len(printer._rx_pending)
+    for idx in range(10):
+        printer.write(b"x" * idx)
+    printer.feed(1)
+
+    # Data sent between two busy deadlines is accounted as a whole
+    assert len(printer._rx_pending) == count + 1
+    assert printer._rx_pending[-1] == [clock.start, sum(range(10)) + 3]
+
+
+def test_pacing_status(clock: FakeClock, printer: ThermalPrinter) -> None:
+    printer.feed(1)
+    printer._busy_until += 2.0
+    printer.status(raise_on_error=False)
+    assert clock.now == pytest.approx(clock.start + 2.0)
+
+
+def test_pacing_close(clock: FakeClock) -> None:
+    printer = FakeThermalPrinter()
+    printer.feed(1)
+    printer._busy_until += 2.0
+    printer.close()
+    assert clock.now == pytest.approx(clock.start + 2.0)
+
+
+@pytest.mark.parametrize("flow_control", [FlowControl.RTS_CTS, FlowControl.DSR_DTR])
+def test_flow_control(clock: FakeClock, flow_control: FlowControl) -> None:
+    pytest.importorskip("PIL.Image")
+
+    with ThermalPrinter("throttle://?buffer=256", flow_control=flow_control, use_stats=False) as printer:
+        port = printer._conn
+        assert port.rtscts is (flow_control is FlowControl.RTS_CTS)
+        assert port.dsrdtr is (flow_control is FlowControl.DSR_DTR)
+
+        for idx in range(50):
+            printer.out(f"Line {idx}", bold=True)
+        printer.feed(2)
+
+        # Computed delays are ignored, the printer BUSY line holds the transmission instead
+        assert clock.now == pytest.approx(clock.start + printer._command_timeout)
+        assert port.out_waiting > 2 * port.transmitted
+
+    assert printer._busy_until == 0.0
+    assert port.overflow == 0
+    assert port.peak <= 256
+    assert port.transmitted == port.emulator.received
+
+
+def test_flow_control_busy_line(clock: FakeClock) -> None:  # noqa: ARG001
+    with ThermalPrinter("record://", flow_control=FlowControl.RTS_CTS, use_stats=False) as printer:
+        assert printer._conn.data.endswith(b"\x1da\x20")
+
+
+def test_pacing_transmit_queue(clock: FakeClock, tmp_path: Path) -> None:
+    file = tmp_path / "receipt.bin"
+    file.write_bytes(b"x" * 3000)
+
+    with ThermalPrinter("throttle://?busy=0", byte_time=0.5, pacing=Pacing.TRANSMIT_QUEUE, use_stats=False) as printer:
+        port = printer._conn
+        start = clock.now
+
+        # Only the time to print is estimated, not the time to transmit
+        printer.bold(True)
+        assert printer._busy_until <= start
+
+        # Bytes still in the transmit queue are waited for
+        printer.print_raw_file(file)
+        printer.feed(1)
+        feed_time = 24 * printer._dot_feed_time
+        assert printer._busy_until - start == pytest.approx(3006 * port.byte_time + feed_time)
+        assert clock.now == start
+
+        # Before reading the status, wait for the transmission, and then for the printer
+        printer.status(raise_on_error=False)
+        assert clock.now - start == pytest.approx(3006 * port.byte_time + feed_time + printer._command_timeout)
@@ -0,0 +1,67 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from tests.faker import printed
+from thermalprinter.constants import Dithering, ImageScale
+from thermalprinter.thermalprinter import ThermalPrinter
+
+Image = pytest.importorskip("PIL.Image")
+
+SMALL = Path(__file__).parent / "glider.png"
+BIG = Path(__file__).parent / "glider-big.png"
+
+
+def test_prepare_images(printer: ThermalPrinter) -> None:
+    images = [BIG, SMALL, str(BIG)]
+    expected = [printed(printer, image, dithering=Dithering.BAYER) for image in images]
+    lines = printer.lines
+
+    prepared = printer.prepare_images(images, workers=2, dithering=Dithering.BAYER)
+    assert [printed(printer, bitmap) for bitmap in prepared] == expected
+    assert printer.lines == 2 * lines
+
+
+def test_prepare_images_unordered(printer: ThermalPrinter) -> None:
+    heights = sorted(bitmap.height for bitmap in printer.prepare_images([BIG, SMALL], workers=2, ordered=False))
+    assert heights == [3, 384]
+
+
+def test_prepare_images_pil_object(printer: ThermalPrinter) -> None:
+    image = Image.new("1", (16, 16), color=0)
+    prepared = printer.prepare_images([image], workers=1, scale=None)
+    bitmap = next(prepared)
+    assert bitmap.scale is ImageScale.QUADRUPLE
+    assert bytes(bitmap.data) == b"\xff" * 8
+    prepared.close()
+
+
+def test_prepare_images_stopped_early(printer: ThermalPrinter) -> None:
+    prepared = printer.prepare_images([SMALL] * 4, workers=2)
+    assert next(prepared).height == 3
+    prepared.close()
+
+
+def test_prepare_images_error(printer: ThermalPrinter) -> None:
+    with pytest.raises(FileNotFoundError):
+        list(printer.prepare_images([SMALL, "inexistent.png"], workers=1))
+
+
+def test_prepare_images_kept(printer: ThermalPrinter) -> None:
+    rasters = list(printer.prepare_images([SMALL, BIG], workers=1))
+    assert printed(printer, rasters[0]) == printed(printer, SMALL)
+
+
+def test_prepare_images_in_flight(printer: ThermalPrinter) -> None:
+    consumed = []
+
+    def images() -> Generator[Path]:
+        for idx in range(10):
+            consumed.append(idx)
+            yield SMALL
+
+    prepared = printer.prepare_images(images(), workers=1)
+    next(prepared)
+    assert len(consumed) == 3
+    prepared.close()
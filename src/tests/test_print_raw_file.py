@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import errno
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from tests.faker import captured
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from tests.faker import FakeClock
+
+DATA = bytes(range(256)) * 20
+
+
+@pytest.fixture
+def raw_file(tmp_path: Path) -> Path:
+    file = tmp_path / "receipt.bin"
+    file.write_bytes(DATA)
+    return file
+
+
+def read_all(fd: int, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        data += os.read(fd, size - len(data))
+    return data
+
+
+@pytest.fixture
+def pty_printer() -> Generator[tuple[ThermalPrinter, int]]:
+    pty = pytest.importorskip("pty")
+    if not hasattr(os, "sendfile"):  # pragma: nocover
+        pytest.skip("os.sendfile() is not available")
+
+    main, secondary = pty.openpty()
+    tty = pytest.importorskip("tty")
+    tty.setraw(main)
+    tty.setraw(secondary)
+    printer = ThermalPrinter(os.ttyname(secondary), run_setup_cmd=False, use_stats=False, byte_time=0.0)
+    os.close(secondary)
+
+    # Skip the reset command, that may have been dropped by flushing the output buffer
+    printer.write(b"READY")
+    data = b""
+    while not data.endswith(b"READY"):
+        data += os.read(main, 1)
+    yield printer, main
+    printer.close()
+    os.close(main)
+
+
+def test_print_raw_file(clock: FakeClock, printer: ThermalPrinter, raw_file: Path) -> None:
+    with captured(printer) as sent:
+        printer.print_raw_file(raw_file, duration=2.0)
+
+    assert [len(chunk) for chunk in sent] == [1745, 1745, 1630]
+    assert b"".join(sent) == DATA
+    assert printer._busy_until == pytest.approx(clock.start + 2.0)
+
+
+def test_print_raw_file_buffered(printer: ThermalPrinter, raw_file: Path) -> None:
+    with patch.object(printer._conn, "write", wraps=printer._conn.write) as write, printer.buffered():
+        printer.bold(True)
+        printer.print_raw_file(raw_file)
+        printer.bold(False)
+
+    assert b"".join(call[0][0] for call in write.call_args_list) == b"\x1bE\x01" + DATA + b"\x1bE\x00"
+
+
+def test_print_raw_file_sendfile(pty_printer: tuple[ThermalPrinter, int], raw_file: Path) -> None:
+    printer, main = pty_printer
+    with patch("os.sendfile", wraps=os.sendfile) as sendfile, patch.object(printer._conn, "write") as write:
+        printer.print_raw_file(raw_file)
+        assert read_all(main, len(DATA)) == DATA
+
+    assert sendfile.called
+    write.assert_not_called()
+
+
+def test_print_raw_file_sendfile_not_supported(pty_printer: tuple[ThermalPrinter, int], raw_file: Path) -> None:
+    printer, main = pty_printer
+    error = OSError(errno.EINVAL, "Invalid argument")
+    with patch("os.sendfile", side_effect=error) as sendfile:
+        printer.print_raw_file(raw_file)
+        assert read_all(main, len(DATA)) == DATA
+
+    sendfile.assert_called_once()
+
+
+def test_print_raw_file_sendfile_error(pty_printer: tuple[ThermalPrinter, int], raw_file: Path) -> None:
+    printer, _ = pty_printer
+    with patch("os.sendfile", side_effect=OSError(errno.EIO, "I/O error")), pytest.raises(OSError, match="I/O error"):
+        printer.print_raw_file(raw_file)
@@ -0,0 +1,75 @@
+import random
+import sys
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from thermalprinter import raster
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def reference(image: Any) -> bytearray:
+    """Pixel per pixel packing, the slow way."""
+    width, height = image.size
+    bitmap = bytearray()
+    for y in range(height):
+        for start in range(0, raster.row_bytes(width) * 8, 8):
+            byte = 0
+            for shift, x in enumerate(range(start, start + 8)):
+                pixel = image.getpixel((x, y)) if x < width else 1
+                byte |= int(not pixel) << (7 - shift)
+            bitmap.append(byte)
+    return bitmap
+
+
+def random_image(width: int, height: int) -> Any:
+    rand = random.Random(width * height)
+    return Image.frombytes("L", (width, height), bytes(rand.choice((0, 255)) for _ in range(width * height))).convert(
+        "1"
+    )
+
+
+@pytest.mark.parametrize("width", [1, 3, 7, 8, 9, 17, 383, 384])
+@pytest.mark.parametrize("height", [1, 5])
+def test_pack(width: int, height: int) -> None:
+    image = random_image(width, height)
+    expected = reference(image)
+    assert raster.pack(image) == expected
+    assert raster.pack_bytes(image.tobytes(), width, height) == expected
+
+
+def test_pack_without_numpy() -> None:
+    image = random_image(13, 4)
+    with patch.dict(sys.modules, {"numpy": None}):
+        assert raster.pack(image) == reference(image)
+
+
+@pytest.mark.parametrize(("width", "expected"), [(1, 1), (8, 1), (9, 2), (384, 48)])
+def test_row_bytes(width: int, expected: int) -> None:
+    assert raster.row_bytes(width) == expected
+
+
+@pytest.mark.parametrize(("width", "expected"), [(1, 0b10000000), (3, 0b11100000), (8, 0xFF), (9, 0b10000000)])
+def test_padding_mask(width: int, expected: int) -> None:
+    assert raster.padding_mask(width) == expected
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_runs(numpy: bool) -> None:
+    black, white = b"\xff" * 2, b"\x00" * 2
+    bitmap = black + white * 3 + black + white * 10 + black * 2 + white * 6
+    with patch.dict(sys.modules, {} if numpy else {"numpy": None}):
+        # Blank runs must be at least 6 rows long to be worth a feed command
+        assert raster.runs(bitmap, 2) == [(0, 5, False), (5, 15, True), (15, 17, False), (17, 23, True)]
+        assert raster.runs(b"", 2) == []
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_ink_columns_and_trim(numpy: bool) -> None:
+    bitmap = b"\x00\x01\x00\x00" + b"\x00\x00\x80\x00"
+    with patch.dict(sys.modules, {} if numpy else {"numpy": None}):
+        assert raster.ink_columns(bitmap, 4) == (1, 3)
+        assert raster.trim(bitmap, 4, 1, 3) == b"\x01\x00\x00\x80"
+        assert raster.ink_columns(bytes(8), 4) == (0, 1)
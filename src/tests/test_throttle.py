@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import serial
+from serial import SerialException
+
+from thermalprinter.thermalprinter import ThermalPrinter
+
+pytest.importorskip("PIL.Image")
+
+from thermalprinter.urlhandler.protocol_throttle import OS_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from tests.faker import FakeClock
+
+BYTE_TIME = 11 / 19200
+
+
+def test_transmission_time(clock: FakeClock) -> None:
+    port = serial.serial_for_url("throttle://?busy=0", baudrate=19200)
+    assert port.byte_time == BYTE_TIME
+
+    port.write(b"a" * 100)
+    assert clock.now == clock.start
+    assert port.out_waiting == 100
+
+    # Writes block while the operating system buffer is full
+    port.write(b"a" * OS_BUFFER_SIZE)
+    assert clock.now == pytest.approx(clock.start + 100 * BYTE_TIME)
+    assert port.out_waiting == OS_BUFFER_SIZE
+
+    port.flush()
+    assert clock.now == pytest.approx(clock.start + (100 + OS_BUFFER_SIZE) * BYTE_TIME)
+    assert port.out_waiting == 0
+    assert port.transmitted == 100 + OS_BUFFER_SIZE
+    assert port.overflow == 0
+
+
+def test_busy_overflow(clock: FakeClock) -> None:
+    port = serial.serial_for_url("throttle://?buffer=64", baudrate=19200)
+    port.write(b"\x1bd\x0a")
+    port.write(b"a" * 100)
+    assert port.emulator.duration == pytest.approx(10 * 30 * 0.0021)
+    assert port.peak == 100
+    assert port.overflow == 100 - 64
+
+    # Once the printer is done, received data is processed right away
+    clock.sleep(1.0)
+    port.write(b"a" * 32)
+    assert port.overflow == 100 - 64
+
+
+def test_not_busy(clock: FakeClock) -> None:  # noqa: ARG001
+    port = serial.serial_for_url("throttle://?buffer=64&busy=0", baudrate=19200)
+    port.write(b"\x1bd\x0a")
+    port.write(b"a" * 100)
+    assert port.overflow == 0
+
+
+def test_printer(clock: FakeClock) -> None:
+    with ThermalPrinter("throttle://", use_stats=False) as printer:
+        start = clock.now
+        for idx in range(20):
+            printer.out(f"Line {idx}", bold=True)
+        printer.feed(2)
+        port = printer._conn
+
+        # Printing overlapped with sending
+        assert clock.now == start
+        assert port.out_waiting
+
+    # The driver paced data: the printer never lost any byte
+    assert port.overflow == 0
+    assert port.transmitted == port.emulator.received
+    assert clock.now >= start + port.emulator.duration
+
+
+@pytest.mark.parametrize("url", ["throttle://?buffer=x", "throttle://?busy=maybe"])
+def test_invalid_option(url: str) -> None:
+    with pytest.raises(SerialException, match="Invalid value"):
+        serial.serial_for_url(url)
+
+
+def test_unknown_option() -> None:
+    with pytest.raises(SerialException, match="Unknown option"):
+        serial.serial_for_url("throttle://?foo=1")
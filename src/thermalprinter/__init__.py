@@ -36,7 +36,11 @@ __all__ = [
     "Chinese",
     "CodePage",
     "Command",
+    "Dithering",
+    "FlowControl",
+    "ImageScale",
     "Justify",
+    "Pacing",
     "Size",
     "ThermalPrinter",
     "ThermalPrinterError",
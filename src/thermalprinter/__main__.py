@@ -0,0 +1,35 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+import sys
+
+
+def main() -> int:
+    """Entry point."""
+    from argparse import ArgumentParser
+
+    from thermalprinter.constants import Defaults
+
+    parser = ArgumentParser(prog="thermalprinter", description="Manage the DP-EH600 thermal printer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay = commands.add_parser("replay", help="print a recorded job file")
+    replay.add_argument("FILE", help="the job file (.tpj)")
+    replay.add_argument("-p", "--port", default=Defaults.PORT.value, help="the printer port")
+    replay.add_argument("-b", "--baudrate", type=int, default=Defaults.BAUDRATE.value, help="the printer baud rate")
+    replay.add_argument("-c", "--copies", type=int, default=1, help="the number of copies to print")
+    options = parser.parse_args()
+
+    from thermalprinter import ThermalPrinter
+    from thermalprinter.job import Job
+
+    job = Job.load(options.FILE)
+    with ThermalPrinter(options.port, baudrate=options.baudrate) as printer:
+        printer.print_job(job, copies=options.copies)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from atexit import register, unregister
+from contextlib import suppress
+from functools import partial, wraps
+from logging import getLogger
+from time import monotonic
+from typing import TYPE_CHECKING, TypeVar
+
+import serial
+
+from thermalprinter.constants import Command, Defaults
+from thermalprinter.exceptions import ThermalPrinterCommunicationError
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine
+    from types import TracebackType
+    from typing import Any
+
+    from _typeshed import ReadableBuffer
+    from typing_extensions import Concatenate, ParamSpec
+
+    from thermalprinter.metrics import Metrics
+
+    P = ParamSpec("P")
+
+log = getLogger(__name__)
+
+R = TypeVar("R")
+
+
+class _Driver(ThermalPrinter):
+    """A printer queuing serial port writes, and waits, instead of doing them.
+
+    Queued actions are replayed by :func:`_replay()`, with non-blocking writes, and :func:`asyncio.sleep()`.
+    Waits not replayed yet are added to the clock, so that the pacing engine sees the time they will end.
+    """
+
+    def __init__(self, port: str, **kwargs: Any) -> None:
+        self._actions: list[Callable[[], Awaitable[Any]]] = []
+        self._debt = 0.0
+        super().__init__(port, **kwargs)
+
+        # Queued actions cannot be replayed at exit, without an event loop
+        unregister(self.close)
+        register(self._close_at_exit)
+
+        # Only real serial ports can be written to from the event loop, URL handlers are written to from a thread
+        self._fd: int | None = None
+        if os.name == "posix":
+            try:
+                self._fd = self._conn.fileno()
+            except (AttributeError, OSError):
+                self._fd = None
+
+    def _close_at_exit(self) -> None:
+        """Close the printer at exit, when :func:`AsyncThermalPrinter.close()` was not awaited, logging data lost."""
+        if self._actions:
+            log.warning("%d queued writes, and waits, were never sent to the printer.", len(self._actions))
+        self.close()
+        self._actions.clear()
+
+    def _conn_write(self, data: ReadableBuffer) -> int | None:
+        self._rx_reserve(len(data))  # type: ignore[arg-type]
+        data = bytes(data)
+        self._actions.append(partial(self._write_async, data))
+        return len(data)
+
+    def _wait(self, seconds: float) -> None:
+        self._metrics.sleep_seconds += seconds
+        self._debt += seconds
+        self._actions.append(partial(asyncio.sleep, seconds))
+
+    def _tx_drain(self) -> None:
+        self._actions.append(self._drain_async)
+
+    def _clock(self) -> float:
+        return monotonic() + self._debt
+
+    async def _replay(self) -> None:
+        """Replay queued actions, in order."""
+        actions, self._actions = self._actions, []
+        try:
+            for action in actions:
+                await action()
+        finally:
+            self._debt = 0.0
+
+    async def _write_async(self, data: bytes) -> None:
+        """Write to the serial port without blocking the event loop, and account for the write in metrics."""
+        start = monotonic()
+        if self._fd is None:
+            await asyncio.to_thread(self._conn.write, data)
+        else:
+            await self._write_fd(self._fd, memoryview(data))
+        metrics = self._metrics
+        metrics.write_seconds += monotonic() - start
+        metrics.writes += 1
+        metrics.bytes_written += len(data)
+
+    async def _write_fd(self, fd: int, data: memoryview) -> None:
+        """Write to the non-blocking serial port file descriptor, waiting for it to be writable when full."""
+        loop = asyncio.get_running_loop()
+        while data:
+            with suppress(BlockingIOError):
+                data = data[os.write(fd, data) :]
+            if not data:
+                break
+
+            writable = loop.create_future()
+            loop.add_writer(fd, writable.set_result, None)
+            try:
+                await asyncio.wait_for(writable, self._conn.write_timeout)
+            except asyncio.TimeoutError:
+                msg = "Write timeout"
+                raise serial.SerialTimeoutException(msg) from None
+            finally:
+                loop.remove_writer(fd)
+
+    async def _drain_async(self) -> None:
+        """Wait for the operating system transmit queue to be empty, from a thread."""
+        start = monotonic()
+        await asyncio.to_thread(self._conn.flush)
+        self._metrics.write_seconds += monotonic() - start
+
+
+def _deferred(
+    method: Callable[Concatenate[ThermalPrinter, P], R], *, in_thread: bool = False
+) -> Callable[Concatenate[AsyncThermalPrinter, P], Coroutine[Any, Any, R]]:
+    """Return a coroutine method running the :class:`ThermalPrinter` ``method``, with the same signature."""
+    name = method.__name__
+
+    @wraps(method)
+    async def deferred(self: AsyncThermalPrinter, *args: P.args, **kwargs: P.kwargs) -> R:
+        result: R = await self._run(partial(getattr(self._printer, name), *args, **kwargs), in_thread=in_thread)
+        return result
+
+    deferred.__qualname__ = f"AsyncThermalPrinter.{name}"
+    return deferred
+
+
+class AsyncThermalPrinter:
+    """The class managing the thermal printer, from an :mod:`asyncio` event loop.
+
+    Methods are coroutines, with the same arguments as :class:`ThermalPrinter` ones. Data is encoded as usual,
+    then written to the serial port without blocking the event loop, and the pacing waits are done with
+    :func:`asyncio.sleep()`. Calls are done one at a time, in order: data of concurrent calls is never interleaved.
+
+    Images are converted from a thread, as it may take a while.
+
+    :param str port: Serial port to use, known as the device name (see :const:`constants.Defaults.PORT`).
+    :param dict kwargs: :class:`ThermalPrinter` keyword-arguments.
+
+    Example:
+
+    >>> async with AsyncThermalPrinter() as printer:
+    ...     await printer.out("Hello!", bold=True)
+    ...     await printer.feed(2)
+
+    .. note::
+        On POSIX systems, serial ports are written to from the event loop. Other ports, and URL handlers
+        (like ``loop://``), are written to from a thread.
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(self, port: str = Defaults.PORT.value, **kwargs: Any) -> None:
+        self._printer = _Driver(port, **kwargs)
+        self._lock: asyncio.Lock | None = None
+
+    async def __aenter__(self) -> AsyncThermalPrinter:  # noqa: PYI034
+        """`async with AsyncThermalPrinter() as printer:`."""
+        # Send the printer setup
+        await self._run(self._printer._tx_flush)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def _run(self, call: Callable[[], Any], *, in_thread: bool = False) -> Any:
+        """Encode data, and send it, while holding the lock, so that only one call at a time writes to the printer."""
+        async with self._get_lock():
+            result = await asyncio.to_thread(call) if in_thread else call()
+            await self._printer._replay()
+        return result
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Return the lock, created from the running event loop on first use."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def close(self) -> None:
+        """Persist statistics, *if desired*, wait for the printer to be done, and close the serial port."""
+        printer = self._printer
+        async with self._get_lock():
+            printer._tx_flush()
+            if printer._conn.is_open:
+                printer._wait_idle()
+            await printer._replay()
+
+            # Nothing left to wait for
+            printer.close()
+            printer._actions.clear()
+
+    @property
+    def printer(self) -> ThermalPrinter:
+        """The underlying printer, to read its settings and state. Its methods must not be called directly."""
+        return self._printer
+
+    @property
+    def lines(self) -> int:
+        """Number of printed lines since the start of the script."""
+        return self._printer.lines
+
+    @property
+    def feeds(self) -> int:
+        """Number of printed line feeds since the start of the script."""
+        return self._printer.feeds
+
+    @property
+    def metrics(self) -> Metrics:
+        """Runtime metrics, see :attr:`ThermalPrinter.metrics`."""
+        return self._printer.metrics
+
+    async def status(self, *, raise_on_error: bool = True) -> dict[str, bool]:
+        """Return the printer status, see :func:`ThermalPrinter.status()`.
+
+        :param bool raise_on_error: Raise on error.
+        :exception ThermalPrinterCommunicationError:
+            If the RX pin is not connected, and if ``raise_on_error`` is ``True``.
+        :rtype: dict[str, bool]
+        """
+        printer = self._printer
+        async with self._get_lock():
+            printer.send_command(Command.ESC, 118, 0)
+            printer._tx_flush()
+            printer._wait_idle()
+            printer._wait(printer._command_timeout)
+            await printer._replay()
+
+            stat = -1
+            if printer._conn.in_waiting:
+                stat = ord(printer.read(1))
+            elif raise_on_error:  # pragma: nocover
+                raise ThermalPrinterCommunicationError
+
+        return printer.status_to_dict(stat)
+
+    barcode = _deferred(ThermalPrinter.barcode)
+    barcode_height = _deferred(ThermalPrinter.barcode_height)
+    barcode_left_margin = _deferred(ThermalPrinter.barcode_left_margin)
+    barcode_position = _deferred(ThermalPrinter.barcode_position)
+    barcode_width = _deferred(ThermalPrinter.barcode_width)
+    bold = _deferred(ThermalPrinter.bold)
+    charset = _deferred(ThermalPrinter.charset)
+    char_spacing = _deferred(ThermalPrinter.char_spacing)
+    chinese = _deferred(ThermalPrinter.chinese)
+    chinese_format = _deferred(ThermalPrinter.chinese_format)
+    codepage = _deferred(ThermalPrinter.codepage)
+    double_height = _deferred(ThermalPrinter.double_height)
+    double_width = _deferred(ThermalPrinter.double_width)
+    feed = _deferred(ThermalPrinter.feed)
+    flush = _deferred(ThermalPrinter.flush)
+    font_b = _deferred(ThermalPrinter.font_b)
+    image = _deferred(ThermalPrinter.image, in_thread=True)
+    inverse = _deferred(ThermalPrinter.inverse)
+    justify = _deferred(ThermalPrinter.justify)
+    left_blank = _deferred(ThermalPrinter.left_blank)
+    left_margin = _deferred(ThermalPrinter.left_margin)
+    line_spacing = _deferred(ThermalPrinter.line_spacing)
+    offline = _deferred(ThermalPrinter.offline)
+    online = _deferred(ThermalPrinter.online)
+    out = _deferred(ThermalPrinter.out)
+    print_cached = _deferred(ThermalPrinter.print_cached)
+    print_char = _deferred(ThermalPrinter.print_char)
+    print_job = _deferred(ThermalPrinter.print_job)
+    reset = _deferred(ThermalPrinter.reset)
+    rotate = _deferred(ThermalPrinter.rotate)
+    size = _deferred(ThermalPrinter.size)
+    sleep = _deferred(ThermalPrinter.sleep)
+    strike = _deferred(ThermalPrinter.strike)
+    test = _deferred(ThermalPrinter.test)
+    underline = _deferred(ThermalPrinter.underline)
+    upside_down = _deferred(ThermalPrinter.upside_down)
+    wake = _deferred(ThermalPrinter.wake)
@@ -0,0 +1,170 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from functools import partial
+from queue import Queue
+from threading import Thread, current_thread
+from typing import TYPE_CHECKING
+
+from thermalprinter.constants import Defaults
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+    from typing import Any
+
+    from _typeshed import ReadableBuffer
+
+#: Default maximum number of writes, and waits, queued before calls block.
+QUEUE_SIZE = 256
+
+
+class BackgroundThermalPrinter(ThermalPrinter):
+    """A printer writing to the serial port from a dedicated thread.
+
+    Calls only encode data, and queue it: serial port writes, and pacing waits, are done in order by the writer
+    thread, so that calls return immediately, while the printer is busy. When the queue is full, calls block
+    until there is room again. Use :func:`join()` to wait for everything queued to be printed.
+
+    :param str port: Serial port to use, known as the device name (see :const:`constants.Defaults.PORT`).
+    :param int queue_size: Maximum number of writes, and waits, queued before calls block, ``0`` for no limit
+        (see :const:`QUEUE_SIZE`).
+    :param dict kwargs: :class:`ThermalPrinter` keyword-arguments.
+
+    Example:
+
+    >>> printer = BackgroundThermalPrinter()
+    >>> printer.out("Hello!")  # Returns right away
+    >>> printer.join()  # Waits for the printer to be done
+
+    .. note::
+        Like :class:`ThermalPrinter`, a printer must be used by one thread at a time, the writer thread aside.
+        Errors raised by the writer thread are raised again by the next call, or by :func:`join()`.
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(self, port: str = Defaults.PORT.value, *, queue_size: int = QUEUE_SIZE, **kwargs: Any) -> None:
+        self._queue: Queue[Callable[[], Any] | None] = Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._writer = Thread(target=self._write_queued, name="thermalprinter-writer", daemon=True)
+        self._writer.start()
+        try:
+            super().__init__(port, **kwargs)
+        except Exception:
+            self._queue.put(None)
+            raise
+
+    def __enter__(self) -> BackgroundThermalPrinter:  # noqa: PYI034
+        return self
+
+    def close(self) -> None:
+        """Wait for everything queued to be printed, stop the writer thread, and close the serial port."""
+        running = self._writer.is_alive()
+        try:
+            if running:
+                self.join()
+        finally:
+            if running:
+                self._queue.put(None)
+                self._writer.join()
+            super().close()
+
+    def join(self) -> None:
+        """Wait for everything queued to be sent to the printer.
+
+        :exception Exception: The error raised by the writer thread, if any.
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def _write_queued(self) -> None:
+        """Writer thread: run queued actions, in order, until ``None`` is received."""
+        while (action := self._queue.get()) is not None:
+            # Actions queued after an error are dropped, until the error is raised to the caller
+            if self._error is None:
+                self._run_queued(action)
+            self._queue.task_done()
+        self._queue.task_done()
+
+    def _run_queued(self, action: Callable[[], Any]) -> None:
+        """Run a queued ``action``, keeping its error to raise it to the caller."""
+        try:
+            action()
+        except Exception as exc:  # noqa: BLE001
+            self._error = exc
+
+    def _raise_error(self) -> None:
+        """Raise again the error raised by the writer thread, if any."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _defer(self, action: Callable[[], Any]) -> None:
+        """Queue ``action`` for the writer thread, or run it when called from the writer thread, or once stopped."""
+        if current_thread() is self._writer or not self._writer.is_alive():
+            action()
+            return
+        self._raise_error()
+        self._queue.put(action)
+
+    def _call(self, action: Callable[[], Any]) -> Any:
+        """Run ``action`` from the writer thread, after everything queued, and return its result."""
+        future: Future[Any] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(action())
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(exc)
+
+        self._defer(run)
+        if not future.done():
+            # Raise the writer thread error, when the action was dropped because of it
+            self.join()
+        return future.result()
+
+    def _conn_write(self, data: ReadableBuffer) -> int | None:
+        # Data may be a view on a buffer reused by the caller
+        data = bytes(data)
+        self._defer(partial(super()._conn_write, data))
+        return len(data)
+
+    def _busy(self, seconds: float) -> None:
+        self._defer(partial(super()._busy, seconds))
+
+    def _wait(self, seconds: float) -> None:
+        self._defer(partial(super()._wait, seconds))
+
+    def _wait_idle(self) -> None:
+        self._defer(super()._wait_idle)
+
+    def flush(self, clear: bool = False) -> None:
+        """Remove the print data from the output buffer, see :func:`ThermalPrinter.flush()`.
+
+        Serial port buffers being reset from the writer thread, after everything queued, the call returns once done.
+        """
+        self._call(partial(super().flush, clear=clear))
+
+    def read(self, size: int = 1) -> bytes:
+        self._tx_flush()
+        result: bytes = self._call(partial(super().read, size))
+        return result
+
+    def print_raw_file(self, file: str | os.PathLike[str], *, duration: float | None = None) -> None:
+        """Send a file content as-is, see :func:`ThermalPrinter.print_raw_file()`.
+
+        The file being sent straight from the writer thread, the call returns once the file is sent.
+        """
+        self._tx_flush()
+        self._call(partial(super().print_raw_file, file, duration=duration))
+
+    def status(self, *, raise_on_error: bool = True) -> dict[str, bool]:
+        self._tx_flush()
+        result: dict[str, bool] = self._call(partial(super().status, raise_on_error=raise_on_error))
+        return result
@@ -0,0 +1,126 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from logging import getLogger
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, cast
+
+from thermalprinter import raster
+from thermalprinter.constants import Dithering, ImageScale
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+    from concurrent.futures import Future
+    from typing import Any
+
+    from thermalprinter.thermalprinter import ThermalPrinter
+
+log = getLogger(__name__)
+
+# Shared memory name, raster data size, bytes per row, and scaling mode
+Prepared = tuple[str, int, int, ImageScale]
+
+
+def prepare_images(  # noqa: PLR0913
+    images: Iterable[Any],
+    *,
+    workers: int | None = None,
+    dithering: Dithering = Dithering.NONE,
+    scale: ImageScale | None = ImageScale.NORMAL,
+    ordered: bool = True,
+    printer_class: type[ThermalPrinter] | None = None,
+) -> Generator[raster.Raster]:
+    """Convert, resize, and pack, images into raster data, in a pool of processes.
+
+    Raster data is handed back through shared memory, and yielded as soon as it is ready. Only ``2 * workers``
+    images are prepared ahead of the consumer, so that memory usage stays bounded.
+
+    :param Iterable images: The files, or PIL Image objects, to prepare.
+    :param int | None workers: The number of processes, defaults to the number of CPUs.
+    :param Dithering dithering: The dithering mode.
+    :param ImageScale | None scale: The scaling mode, ``None`` to pick the best mode automatically.
+    :param bool ordered: Yield rasters in the order of ``images``, else as soon as they are ready.
+    :param type[ThermalPrinter] printer_class: The class whose conversion methods are used.
+    :rtype: Generator[raster.Raster]
+    :return: The rasters.
+    """
+    if printer_class is None:
+        from thermalprinter.thermalprinter import ThermalPrinter
+
+        printer_class = ThermalPrinter
+
+    # Images prepared ahead stay in shared memory until consumed: only keep a few of them in flight
+    in_flight = 2 * (workers or os.cpu_count() or 1)
+    sources = iter(images)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[Prepared]] = deque()
+
+        def submit(count: int) -> None:
+            pending.extend(
+                executor.submit(_prepare, printer_class, image, dithering, scale) for image in islice(sources, count)
+            )
+
+        submit(in_flight)
+        try:
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(future)
+                prepared = future.result()
+                submit(1)
+                yield _receive(*prepared)
+        finally:
+            # Stopped early: free memory of images prepared for nothing
+            for future in pending:
+                if not future.cancel() and not future.exception():
+                    _receive(*future.result())
+
+
+def _prepare(
+    printer_class: type[ThermalPrinter], image: Any, dithering: Dithering, scale: ImageScale | None
+) -> Prepared:
+    """Prepare one image, in a worker process."""
+    if isinstance(image, (str, os.PathLike)):
+        from PIL import Image
+
+        image = Image.open(image)
+
+    with image:
+        image, scale = printer_class._image_fit(image, dithering, scale)
+        data = raster.pack(image)
+
+    # The memory is owned, and freed, by the receiving process
+    if sys.version_info >= (3, 13):
+        memory = SharedMemory(create=True, size=max(1, len(data)), track=False)
+    else:
+        memory = SharedMemory(create=True, size=max(1, len(data)))
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+
+            # Tracked under its POSIX name, with a leading slash, like SharedMemory does
+            resource_tracker.unregister(f"/{memory.name}", "shared_memory")
+    cast("memoryview", memory.buf)[: len(data)] = data
+    memory.close()
+    return memory.name, len(data), raster.row_bytes(image.width), scale
+
+
+def _receive(name: str, size: int, row_bytes: int, scale: ImageScale) -> raster.Raster:
+    """Copy raster data out of the shared memory, and free it."""
+    memory = SharedMemory(name=name)
+    try:
+        data = bytes(cast("memoryview", memory.buf)[:size])
+    finally:
+        memory.close()
+        memory.unlink()
+    return raster.Raster(data, row_bytes, scale)
@@ -0,0 +1,213 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from contextlib import suppress
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from thermalprinter.constants import ImageScale
+from thermalprinter.raster import Raster
+
+if TYPE_CHECKING:
+    from typing import Any
+
+log = getLogger(__name__)
+
+T = TypeVar("T")
+
+#: Header of rasters stored on the disk: magic, bytes per row, and scaling mode.
+RASTER_HEADER = struct.Struct("<4sHB")
+RASTER_MAGIC = b"TPR1"
+
+
+def default_directory() -> Path:
+    """Return the default on-disk cache directory, next to the statistics file."""
+    from thermalprinter.tools import stats_file
+
+    return stats_file().parent / ".thermalprinter-cache"
+
+
+class LRUCache(Generic[T]):
+    """A least recently used cache, bounded by the total size of its values.
+
+    :param int max_size: Maximum total size of values, in bytes.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[T, int]] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def get(self, key: str) -> T | None:
+        """Return the value stored for ``key``, if any."""
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: T, size: int) -> None:
+        """Store the ``value`` of ``size`` bytes, evicting least recently used entries when needed."""
+        self.pop(key)
+        if size > self.max_size:
+            return
+
+        self._entries[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def pop(self, key: str) -> T | None:
+        """Remove, and return, the value stored for ``key``, if any."""
+        try:
+            value, size = self._entries.pop(key)
+        except KeyError:
+            return None
+
+        self.size -= size
+        return value
+
+
+class ImageCache(LRUCache[Raster]):
+    """Cache of images already converted, resized, and packed, into raster data.
+
+    Entries are kept in memory, and optionally persisted on the disk so that they survive restarts. Least recently
+    used files are removed when the directory grows over ``max_disk_size``.
+
+    :param int max_size: Maximum total size of rasters kept in memory, in bytes.
+    :param str | pathlib.Path | None directory: Directory where to persist rasters (see :func:`default_directory()`).
+    :param int max_disk_size: Maximum total size of rasters persisted on the disk, in bytes.
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4 * 1024 * 1024,
+        directory: str | Path | None = None,
+        max_disk_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        super().__init__(max_size)
+        self.directory = Path(directory).expanduser() if directory else None
+        self.max_disk_size = max_disk_size
+
+    @staticmethod
+    def key(image: Any, **params: Any) -> str:
+        """Compute the cache key of an ``image``.
+
+        Files are identified by their path, modification time, and size. PIL Image objects by their content.
+
+        :param str | pathlib.Path | PIL.Image image: The file, or PIL Image object.
+        :param dict params: Conversion parameters impacting the raster data.
+        :rtype: str
+        :return: The key, or an empty string if the ``image`` cannot be cached.
+        """
+        if isinstance(image, (str, Path)):
+            path = Path(image).expanduser().resolve()
+            try:
+                stat = path.stat()
+            except OSError:
+                return ""
+            source = f"file:{path}:{stat.st_mtime_ns}:{stat.st_size}"
+        elif hasattr(image, "tobytes") and hasattr(image, "mode"):
+            digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+            source = f"image:{image.mode}:{image.size}:{digest}"
+        else:
+            return ""
+
+        options = ",".join(f"{name}={value!r}" for name, value in sorted(params.items()))
+        return hashlib.sha256(f"{source}|{options}".encode()).hexdigest()
+
+    def get(self, key: str) -> Raster | None:
+        """Return the raster stored for ``key``, from the memory, or from the disk."""
+        if (bitmap := super().get(key)) is not None or not self.directory:
+            return bitmap
+
+        file = self.directory / key
+        try:
+            content = file.read_bytes()
+        except OSError:
+            return None
+
+        if (bitmap := self._load(content)) is None:
+            # Corrupt, or foreign, file: a cache miss, and the file is replaced on the next set()
+            log.warning("Ignoring the invalid cached raster %r.", str(file))
+            file.unlink(missing_ok=True)
+            return None
+
+        # Used again: the last one to be removed from the disk
+        with suppress(OSError):
+            os.utime(file)
+
+        super().set(key, bitmap, len(bitmap.data))
+        return bitmap
+
+    @staticmethod
+    def _load(content: bytes) -> Raster | None:
+        """Return the raster stored in a file ``content``, or ``None`` if it is not valid."""
+        if not content.startswith(RASTER_MAGIC) or len(content) < RASTER_HEADER.size:
+            return None
+
+        _, row_bytes, mode = RASTER_HEADER.unpack_from(content)
+        scale = next((scale for scale in ImageScale if scale.value[0] == mode), None)
+        data = content[RASTER_HEADER.size :]
+        if scale is None or not row_bytes or len(data) % row_bytes:
+            return None
+        return Raster(data, row_bytes, scale)
+
+    def set(self, key: str, value: Raster, size: int = 0) -> None:
+        """Store the raster ``value`` in memory, and on the disk."""
+        super().set(key, value, size or len(value.data))
+        if not self.directory:
+            return
+
+        file = self.directory / key
+        # Per process, several ones may write the same key at once
+        tmp_file = file.with_name(f".{key}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_bytes(RASTER_HEADER.pack(RASTER_MAGIC, value.row_bytes, value.scale.value[0]) + value.data)
+            tmp_file.replace(file)
+            self._prune(self.directory)
+        except OSError:
+            log.warning("Cannot persist the raster into %r.", str(file), exc_info=True)
+
+    def _prune(self, directory: Path) -> None:
+        """Remove least recently used files, until the ``directory`` fits in ``max_disk_size``."""
+        files = []
+        for file in directory.iterdir():
+            if file.name.startswith("."):
+                # Being written
+                continue
+            with suppress(OSError):
+                stat = file.stat()
+                files.append((stat.st_mtime_ns, stat.st_size, file))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, file in sorted(files):
+            if total <= self.max_disk_size:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
@@ -141,6 +141,52 @@ class Command(Enum):
     GS = 29  #: Group separator.
 
 
+class Dithering(Enum):
+    """Image dithering modes, used to convert images to 1-bit.
+
+    - ``NONE`` will make pixels darker than 128 black, without dithering.
+    - ``FLOYD_STEINBERG`` will diffuse the error to neighbor pixels, good for photos.
+    - ``ATKINSON`` will diffuse only part of the error, for higher contrast photos.
+    - ``BAYER`` will use an 8x8 ordered pattern, good for charts and gradients.
+    - ``OTSU`` will pick the threshold automatically, good for scanned documents.
+    """
+
+    NONE = "none"
+    FLOYD_STEINBERG = "floyd-steinberg"
+    ATKINSON = "atkinson"
+    BAYER = "bayer"
+    OTSU = "otsu"
+
+
+class FlowControl(Enum):
+    """Serial flow control modes, the printer raising its BUSY line when it cannot receive data.
+
+    - ``NONE`` will pace data using timings (see :const:`Defaults.BYTE_TIME`, :const:`Defaults.DOT_FEED_TIME`,
+      and :const:`Defaults.DOT_PRINT_TIME`).
+    - ``RTS_CTS`` will wait for the printer BUSY line, wired to the host CTS pin.
+    - ``DSR_DTR`` will wait for the printer BUSY line, wired to the host DSR pin.
+    """
+
+    NONE = "none"
+    RTS_CTS = "rtscts"
+    DSR_DTR = "dsrdtr"
+
+
+class ImageScale(Enum):
+    """Image scaling modes, the upscaling being done by the printer.
+
+    - ``DOUBLE_WIDTH`` will double the image width.
+    - ``DOUBLE_HEIGHT`` will double the image height.
+    - ``QUADRUPLE`` will both double the image width, and its height.
+    """
+
+    # Syntax: (code, horizontal factor, vertical factor)
+    NORMAL = (0, 1, 1)
+    DOUBLE_WIDTH = (1, 2, 1)
+    DOUBLE_HEIGHT = (2, 1, 2)
+    QUADRUPLE = (3, 2, 2)
+
+
 class Justify(Enum):
     """Text justifications."""
 
@@ -149,6 +195,19 @@ class Justify(Enum):
     RIGHT = 2
 
 
+class Pacing(Enum):
+    """Pacing modes, to wait for the printer to process data.
+
+    - ``TIMINGS`` will estimate the time to transmit bytes using the ``byte_time`` (see :const:`Defaults.BYTE_TIME`).
+    - ``TRANSMIT_QUEUE`` will ask the operating system how many bytes are still waiting to be transmitted
+      (see :attr:`serial.Serial.out_waiting`), and wait for them using ``tcdrain()`` when the printer has to be idle.
+      Only the time to print, and to feed, is estimated.
+    """
+
+    TIMINGS = "timings"
+    TRANSMIT_QUEUE = "transmit-queue"
+
+
 class Size(Enum):
     """Text sizes.
 
@@ -193,6 +252,22 @@ class Defaults(Enum):
     WRITE_TIMEOUT = float(getenv("TP_WRITE_TIMEOUT", 1.0))
 
 
-CONSTANTS = [BarCode, BarCodePosition, CharSet, Chinese, CodePage, CodePageConverted, Justify, Size, Underline]
+CONSTANTS = [
+    BarCode,
+    BarCodePosition,
+    CharSet,
+    Chinese,
+    CodePage,
+    CodePageConverted,
+    Dithering,
+    FlowControl,
+    ImageScale,
+    Justify,
+    Pacing,
+    Size,
+    Underline,
+]
+MAX_BUFFER_SIZE = 16 * 1024  #: Printer receive buffer size, in bytes.
+MAX_IMAGE_HEIGHT = 4095  #: Max image height of a single raster bitmap command.
 MAX_IMAGE_WIDTH = 384  #: Max image width.
 STATS_FILE = "~/.thermalprinter.json"  #: Printer statistics file. See :doc:`tools <tools>` for its usage.
@@ -0,0 +1,195 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from thermalprinter.constants import Dithering
+
+if TYPE_CHECKING:
+    from typing import Any
+
+#: Error diffusion kernels: the divisor, and ``(row offset, column offset, weight)`` tuples.
+KERNELS: dict[Dithering, tuple[int, tuple[tuple[int, int, int], ...]]] = {
+    Dithering.FLOYD_STEINBERG: (16, ((0, 1, 7), (1, -1, 3), (1, 0, 5), (1, 1, 1))),
+    Dithering.ATKINSON: (8, ((0, 1, 1), (0, 2, 1), (1, -1, 1), (1, 0, 1), (1, 1, 1), (2, 0, 1))),
+}
+
+# Margin around the image receiving the error diffused outside of it
+_MARGIN = 2
+
+# Bound of pixel levels once errors are added: errors never exceed 127, and kernels weights sum to 1, at most
+_LEVELS = 512
+
+
+def _bayer_matrix(size: int) -> list[list[int]]:
+    matrix = [[0]]
+    while len(matrix) < size:
+        half = len(matrix)
+        matrix = [
+            [4 * matrix[y % half][x % half] + (0, 2, 3, 1)[(y // half) * 2 + x // half] for x in range(half * 2)]
+            for y in range(half * 2)
+        ]
+    return matrix
+
+
+#: Ordered dithering thresholds, from an 8x8 Bayer matrix: pixels darker than the threshold are black.
+BAYER_THRESHOLDS = [[4 * value + 2 for value in row] for row in _bayer_matrix(8)]
+
+
+def dither(data: bytes, width: int, height: int, mode: Dithering) -> bytes:
+    """Dither a grayscale image.
+
+    The work is done using NumPy when available, else row by row.
+
+    :param bytes data: The image pixels, one byte per pixel, like PIL ``L`` images.
+    :param int width: The image width.
+    :param int height: The image height.
+    :param Dithering mode: The dithering mode.
+    :rtype: bytes
+    :return: The dithered pixels, one byte per pixel: 0 for black, and 255 for white.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return dither_rows(data, width, height, mode)
+
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+    return np.where(dots(pixels, mode), 0, 255).astype(np.uint8).tobytes()
+
+
+def dots(pixels: Any, mode: Dithering) -> Any:
+    """NumPy implementation of :func:`dither()`.
+
+    :param numpy.ndarray pixels: The 2-D array of grayscale pixels.
+    :param Dithering mode: The dithering mode.
+    :rtype: numpy.ndarray
+    :return: The boolean array of dots, ``True`` being a black dot.
+    """
+    import numpy as np
+
+    if mode in KERNELS:
+        return _error_diffusion(pixels, *KERNELS[mode])
+    if mode is Dithering.BAYER:
+        height, width = pixels.shape
+        thresholds = np.array(BAYER_THRESHOLDS, dtype=np.int16)
+        return pixels < np.tile(thresholds, (height // 8 + 1, width // 8 + 1))[:height, :width]
+    if mode is Dithering.OTSU:
+        histogram = np.bincount(pixels.ravel(), minlength=256).tolist()
+        return pixels <= otsu_threshold(histogram)
+    return pixels < 128
+
+
+def _error_diffusion(pixels: Any, divisor: int, kernel: tuple[tuple[int, int, int], ...]) -> Any:
+    """Diffuse the error by wavefronts.
+
+    A pixel only receives error from pixels on its left, or on previous rows. So all pixels
+    at ``x + 2 * y == t`` can be processed at once, after those of the previous wavefront ``t - 1``.
+    Integer arithmetic makes the result independent of the order errors are added.
+
+    There are ``width + 2 * height`` wavefronts of a few hundred pixels at most, so the time is mostly spent
+    calling NumPy: pixels are sorted by wavefront beforehand, and errors are read from lookup tables.
+    """
+    import numpy as np
+
+    height, width = pixels.shape
+    stride = width + 2 * _MARGIN
+    buffer = np.zeros((height + _MARGIN, stride), dtype=np.int32)
+    buffer[:height, _MARGIN : _MARGIN + width] = pixels
+    flat = buffer.reshape(-1)
+
+    # Buffer indexes of pixels, by wavefront, and where each wavefront ends
+    ys, xs = np.divmod(np.arange(height * width), width)
+    wavefronts = xs + 2 * ys
+    order = np.argsort(wavefronts, kind="stable")
+    indexes = (ys * stride + xs + _MARGIN)[order]
+    ends = np.cumsum(np.bincount(wavefronts)).tolist()
+
+    # Error spread with each weight, by pixel level: errors added, levels stay within [-_LEVELS, _LEVELS)
+    levels = np.arange(-_LEVELS, _LEVELS)
+    errors = levels - np.where(levels < 128, 0, 255)
+    weights = sorted({weight for _, _, weight in kernel})
+    spreads = [(errors * weight // divisor).astype(np.int32) for weight in weights]
+    targets = [(flat[row * stride + column :], weights.index(weight)) for row, column, weight in kernel]
+
+    values = np.empty(height * width, dtype=np.int32)
+    start = 0
+    for end in ends:
+        wavefront = indexes[start:end]
+        old = flat[wavefront]
+        values[start:end] = old
+        old += _LEVELS
+        spread = [table[old] for table in spreads]
+        for target, weight in targets:
+            target[wavefront] += spread[weight]
+        start = end
+
+    black = np.empty(height * width, dtype=bool)
+    black[order] = values < 128
+    return black.reshape(height, width)
+
+
+def dither_rows(data: bytes, width: int, height: int, mode: Dithering) -> bytes:
+    """Pure Python implementation of :func:`dither()`, working row by row."""
+    if mode in KERNELS:
+        return _error_diffusion_rows(data, width, height, *KERNELS[mode])
+
+    if mode is Dithering.BAYER:
+        result = bytearray(width * height)
+        for y in range(height):
+            thresholds = BAYER_THRESHOLDS[y % 8]
+            row = range(y * width, (y + 1) * width)
+            result[y * width : (y + 1) * width] = bytes(
+                0 if data[offset] < thresholds[x % 8] else 255 for x, offset in enumerate(row)
+            )
+        return bytes(result)
+
+    threshold = 127
+    if mode is Dithering.OTSU:
+        threshold = otsu_threshold([data.count(value) for value in range(256)])
+    return data.translate(bytes(0 if value <= threshold else 255 for value in range(256)))
+
+
+def _error_diffusion_rows(data: bytes, width: int, height: int, divisor: int, kernel: Any) -> bytes:
+    result = bytearray(width * height)
+    pending = [[0] * (width + 2 * _MARGIN) for _ in range(_MARGIN + 1)]
+    for y in range(height):
+        errors = pending[0]
+        base = y * width
+        for x in range(width):
+            old = data[base + x] + errors[x + _MARGIN]
+            new = 0 if old < 128 else 255
+            result[base + x] = new
+            if error := old - new:
+                for row, column, weight in kernel:
+                    pending[row][x + _MARGIN + column] += error * weight // divisor
+        pending = [*pending[1:], [0] * (width + 2 * _MARGIN)]
+    return bytes(result)
+
+
+def otsu_threshold(histogram: list[int]) -> int:
+    """Compute the threshold separating best dark pixels from light ones (Otsu's method).
+
+    :param list[int] histogram: Number of pixels of each of the 256 gray levels.
+    :rtype: int
+    :return: The threshold: pixels lower than, or equal to, it are dark.
+    """
+    total = sum(histogram)
+    total_sum = sum(value * count for value, count in enumerate(histogram))
+    best, best_variance = 0, -1.0
+    dark, dark_sum = 0, 0
+    for value, count in enumerate(histogram):
+        dark += count
+        dark_sum += value * count
+        light = total - dark
+        if not dark:
+            continue
+        if not light:
+            break
+        mean_difference = dark_sum / dark - (total_sum - dark_sum) / light
+        variance = dark * light * mean_difference**2
+        if variance > best_variance:
+            best, best_variance = value, variance
+    return best
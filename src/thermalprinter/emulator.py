@@ -0,0 +1,572 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from thermalprinter.constants import (
+    MAX_IMAGE_WIDTH,
+    BarCodePosition,
+    Chinese,
+    CodePage,
+    CodePageConverted,
+    Command,
+    Defaults,
+    Justify,
+)
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+    from typing import Any
+
+    from _typeshed import ReadableBuffer
+
+log = getLogger(__name__)
+
+#: Character cell sizes, in dots: font A, and font B.
+FONT_A = (12, 24)
+FONT_B = (9, 17)
+
+# Bits to flip to convert raster data (1 is black) into PIL 1-bit images (1 is white)
+_INVERT = bytes(255 - value for value in range(256))
+
+# Wake up byte
+_WAKE = 255
+
+
+@dataclass(frozen=True)
+class Style:
+    """Text style applied to each character."""
+
+    bold: bool = False
+    double_height: bool = False
+    double_width: bool = False
+    font_b: bool = False
+    height_factor: int = 1
+    inverse: bool = False
+    rotate: bool = False
+    spacing: int = 0
+    underline: int = 0
+    upside_down: bool = False
+    width_factor: int = 1
+
+    @property
+    def scale(self) -> tuple[int, int]:
+        """Horizontal, and vertical, scaling factors."""
+        return (
+            max(self.width_factor, 2 if self.double_width else 1),
+            max(self.height_factor, 2 if self.double_height else 1),
+        )
+
+    @property
+    def cell(self) -> tuple[int, int]:
+        """Character cell size, in dots, spacing included."""
+        width, height = FONT_B if self.font_b else FONT_A
+        x_factor, y_factor = self.scale
+        return (width + self.spacing) * x_factor, height * y_factor
+
+
+class Emulator:
+    """Emulator of the DP-EH600 thermal printer.
+
+    It parses the ESC/POS commands sent by :class:`ThermalPrinter`, and renders them on a virtual
+    paper roll of :const:`constants.MAX_IMAGE_WIDTH` dots wide, using the Python Imaging Library.
+    The time the printer would take is modeled from timings constants:
+
+    - each received byte takes ``byte_time``;
+    - each row of printed dots takes ``dot_print_time`` divided by the default line spacing;
+    - each row of fed dots takes ``dot_feed_time``.
+
+    :param float byte_time: Time to receive one byte, in seconds (see :const:`constants.Defaults.BYTE_TIME`).
+    :param float dot_feed_time: Time to feed one dot, in seconds (see :const:`constants.Defaults.DOT_FEED_TIME`).
+    :param float dot_print_time: Time to print one line, in seconds (see :const:`constants.Defaults.DOT_PRINT_TIME`).
+
+    >>> emulator = Emulator()
+    >>> emulator.write(b"Hello!\\n")
+    >>> emulator.image().save("paper.png")
+    >>> round(emulator.duration, 3)
+    0.037
+
+    .. note::
+        Barcodes are rendered as bars of the expected size, derived from the data, but they are not scannable.
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(
+        self,
+        *,
+        byte_time: float = Defaults.BYTE_TIME.value,
+        dot_feed_time: float = Defaults.DOT_FEED_TIME.value,
+        dot_print_time: float = Defaults.DOT_PRINT_TIME.value,
+    ) -> None:
+        self._byte_time = byte_time
+        self._dot_feed_time = dot_feed_time
+        self._dot_row_time = dot_print_time / Defaults.LINE_SPACING.value
+
+        #: Simulated time the printer spent, in seconds.
+        self.duration = 0.0
+        #: Number of received bytes.
+        self.received = 0
+        #: Data sent back by the printer, like the status.
+        self.output = bytearray()
+        #: Set to ``False`` to report a missing paper in the status.
+        self.has_paper = True
+
+        self._pending = bytearray()
+        self._paper: list[Any] = []
+        self._height = 0
+
+        # Command code -> number of arguments, and handler
+        self._commands: dict[tuple[int, int], tuple[int, Callable[[bytes], None]]] = {
+            (Command.DC2.value, 84): (0, self._test_page),
+            (Command.ESC.value, 14): (1, lambda _: self._set_style(double_width=True)),
+            (Command.ESC.value, 20): (1, lambda _: self._set_style(double_width=False)),
+            (Command.ESC.value, 32): (1, lambda args: self._set_style(spacing=args[0])),
+            (Command.ESC.value, 33): (1, self._set_print_mode),
+            (Command.ESC.value, 45): (1, lambda args: self._set_style(underline=min(2, args[0]))),
+            (Command.ESC.value, 51): (1, self._set_line_spacing),
+            (Command.ESC.value, 55): (3, self._ignore),  # Heating parameters
+            (Command.ESC.value, 56): (2, self._ignore),  # Sleep
+            (Command.ESC.value, 57): (1, self._set_chinese_format),
+            (Command.ESC.value, 61): (1, self._set_online),
+            (Command.ESC.value, 64): (0, lambda _: self.reset()),
+            (Command.ESC.value, 66): (1, self._set_left_margin),
+            (Command.ESC.value, 69): (1, lambda args: self._set_style(bold=bool(args[0] & 1))),
+            (Command.ESC.value, 71): (1, lambda args: self._set_style(bold=bool(args[0] & 1))),
+            (Command.ESC.value, 74): (1, lambda args: self._feed_dots(args[0])),
+            (Command.ESC.value, 82): (1, self._ignore),  # Character set
+            (Command.ESC.value, 86): (1, lambda args: self._set_style(rotate=bool(args[0] & 1))),
+            (Command.ESC.value, 97): (1, self._set_justify),
+            (Command.ESC.value, 100): (1, self._feed_lines),
+            (Command.ESC.value, 116): (1, self._set_codepage),
+            (Command.ESC.value, 118): (1, self._status),
+            (Command.ESC.value, 123): (1, lambda args: self._set_style(upside_down=bool(args[0] & 1))),
+            (Command.FS.value, 38): (0, lambda _: self._set_chinese(state=True)),
+            (Command.FS.value, 46): (0, lambda _: self._set_chinese(state=False)),
+            (Command.GS.value, 33): (1, self._set_size),
+            (Command.GS.value, 66): (1, lambda args: self._set_style(inverse=bool(args[0] & 1))),
+            (Command.GS.value, 72): (1, self._set_barcode_position),
+            (Command.GS.value, 76): (2, self._set_left_blank),
+            (Command.GS.value, 97): (1, self._ignore),  # Automatic status, and BUSY line
+            (Command.GS.value, 104): (1, self._set_barcode_height),
+            (Command.GS.value, 119): (1, self._set_barcode_width),
+            (Command.GS.value, 120): (1, self._set_barcode_left_margin),
+        }
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the printer to factory defaults, and clear the print buffer."""
+        self.online = True
+        self._style = Style()
+        self._line: list[tuple[str, Style]] = []
+        self._line_width = 0
+        self._text = bytearray()
+        self._text_style = self._style
+        self._barcode_height = Defaults.BARCODE_HEIGHT.value
+        self._barcode_left_margin = 0
+        self._barcode_position = BarCodePosition.HIDDEN
+        self._barcode_width = Defaults.BARCODE_WIDTH.value
+        self._chinese = False
+        self._chinese_format = Chinese.GBK
+        self._codepage = CodePage.CP437
+        self._justify = Justify.LEFT
+        self._left_blank = 0
+        self._left_margin = 0
+        self._line_spacing = Defaults.LINE_SPACING.value
+
+    @property
+    def height(self) -> int:
+        """The paper length already printed, in dots."""
+        return self._height
+
+    def image(self) -> Any:
+        """Return the printed paper, text not yet terminated by a line feed is not included.
+
+        :rtype: PIL.Image.Image
+        """
+        from PIL import Image
+
+        paper = Image.new("1", (MAX_IMAGE_WIDTH, self._height), 1)
+        top = 0
+        for strip in self._paper:
+            paper.paste(strip, (0, top))
+            top += strip.height
+        return paper
+
+    def save(self, file: str | os.PathLike[str]) -> None:
+        """Save the printed paper to an image file.
+
+        :param str | os.PathLike file: The file path, its extension is used to pick the image format.
+        """
+        self.image().save(file)
+
+    def write(self, data: ReadableBuffer) -> None:
+        """Process data received by the printer.
+
+        :param bytes data: The data, commands can be split across several writes.
+        """
+        view = memoryview(data).cast("B")
+        self.received += len(view)
+        self.duration += len(view) * self._byte_time
+
+        buffer = self._pending + view
+        self._pending.clear()
+        offset = 0
+        while offset < len(buffer):
+            size = self._process(buffer, offset)
+            if not size:
+                # Incomplete command, wait for more data
+                self._pending += buffer[offset:]
+                break
+            offset += size
+
+    #
+    # Parsing
+    #
+
+    def _process(self, buffer: bytearray, offset: int) -> int:
+        """Process the command, or text, at ``offset``, and return its size (0 when incomplete)."""
+        byte = buffer[offset]
+        if not self.online and not buffer.startswith(bytes([Command.ESC.value, 61]), offset):
+            return 1
+
+        if byte == _WAKE:
+            return 1
+        if byte == ord("\n"):
+            self._flush_text()
+            self._print_line(force=True)
+            return 1
+        if byte in {Command.DC2.value, Command.ESC.value, Command.FS.value, Command.GS.value}:
+            return self._process_command(buffer, offset)
+        if byte < ord(" ") and byte != ord("\t"):
+            log.debug("Ignored control character: %d", byte)
+            return 1
+
+        # Text: take everything up to the next command
+        end = offset + 1
+        while end < len(buffer) and buffer[end] >= ord(" ") and buffer[end] != _WAKE:
+            end += 1
+        if not self._text:
+            self._text_style = self._style
+        self._text += buffer[offset:end].replace(b"\t", b" ")
+        return end - offset
+
+    def _process_command(self, buffer: bytearray, offset: int) -> int:
+        if offset + 1 >= len(buffer):
+            return 0
+
+        prefix, code = buffer[offset], buffer[offset + 1]
+        if (prefix, code) == (Command.GS.value, 118):
+            return self._raster(buffer, offset)
+        if (prefix, code) == (Command.GS.value, 107):
+            return self._barcode(buffer, offset)
+
+        try:
+            count, handler = self._commands[(prefix, code)]
+        except KeyError:
+            log.warning("Unknown command: %d %d", prefix, code)
+            return 2
+
+        if offset + 2 + count > len(buffer):
+            return 0
+
+        self._flush_text()
+        handler(bytes(buffer[offset + 2 : offset + 2 + count]))
+        return 2 + count
+
+    #
+    # Text
+    #
+
+    def _encoding(self) -> str:
+        if self._chinese:
+            return {Chinese.GBK: "gbk", Chinese.UTF_8: "utf-8", Chinese.BIG5: "big5"}[self._chinese_format]
+        try:
+            return CodePageConverted[self._codepage.name].value
+        except KeyError:
+            return self._codepage.name
+
+    def _flush_text(self) -> None:
+        """Decode received text, and lay it out on the current line."""
+        if self._text:
+            try:
+                text = self._text.decode(self._encoding(), errors="replace")
+            except LookupError:
+                text = self._text.decode("latin-1")
+            for char in text:
+                self._add_char(char, self._text_style)
+            self._text.clear()
+
+    def _area(self) -> tuple[int, int]:
+        """The printable area: left position, and width, in dots."""
+        left = min(MAX_IMAGE_WIDTH, self._left_margin * FONT_A[0] + self._left_blank)
+        return left, MAX_IMAGE_WIDTH - left
+
+    def _add_char(self, char: str, style: Style) -> None:
+        width = _glyph(char, style, wide=self._is_wide(char)).width
+        if self._line and self._line_width + width > self._area()[1]:
+            self._print_line()
+        self._line.append((char, style))
+        self._line_width += width
+
+    def _is_wide(self, char: str) -> bool:
+        """Chinese characters take two cells."""
+        return self._chinese and ord(char) > 127
+
+    def _print_line(self, *, force: bool = False) -> None:
+        """Print the current line, or feed one line when empty, and ``force`` is set."""
+        if not self._line:
+            if force:
+                self._feed_dots(self._line_spacing)
+            return
+
+        from PIL import Image, ImageOps
+
+        height = max(style.cell[1] for _, style in self._line)
+        strip = Image.new("1", (MAX_IMAGE_WIDTH, max(height, self._line_spacing)), 1)
+        x = self._offset(self._line_width)
+        for char, style in self._line:
+            glyph = _glyph(char, style, wide=self._is_wide(char))
+            strip.paste(glyph, (x, height - glyph.height))
+            if style.underline:
+                strip.paste(0, (x, height - style.underline, x + glyph.width, height))
+            if style.inverse:
+                box = (x, 0, x + glyph.width, height)
+                strip.paste(ImageOps.invert(strip.crop(box).convert("L")).convert("1"), box)
+            x += glyph.width
+        if any(style.upside_down for _, style in self._line):
+            strip = strip.rotate(180)
+
+        self._line.clear()
+        self._line_width = 0
+        self._add_strip(strip, printed=height)
+
+    def _offset(self, width: int) -> int:
+        left, area = self._area()
+        if self._justify is Justify.CENTER:
+            return left + max(0, (area - width) // 2)
+        if self._justify is Justify.RIGHT:
+            return left + max(0, area - width)
+        return left
+
+    def _add_strip(self, strip: Any, *, printed: int) -> None:
+        """Append a strip to the paper, ``printed`` rows being printed, and others fed."""
+        self._paper.append(strip)
+        self._height += strip.height
+        self.duration += printed * self._dot_row_time + (strip.height - printed) * self._dot_feed_time
+
+    def _feed_dots(self, dots: int) -> None:
+        self._print_line()
+        if dots:
+            from PIL import Image
+
+            self._paper.append(Image.new("1", (MAX_IMAGE_WIDTH, dots), 1))
+            self._height += dots
+            self.duration += dots * self._dot_feed_time
+
+    #
+    # Commands
+    #
+
+    def _ignore(self, args: bytes) -> None:
+        """Commands without any effect on the paper."""
+
+    def _set_style(self, **changes: Any) -> None:
+        self._style = replace(self._style, **changes)
+
+    def _set_print_mode(self, args: bytes) -> None:
+        mode = args[0]
+        self._set_style(
+            font_b=bool(mode & 0b00000001),
+            bold=bool(mode & 0b00001000),
+            double_height=bool(mode & 0b00010000),
+            double_width=bool(mode & 0b00100000),
+            underline=1 if mode & 0b10000000 else 0,
+        )
+
+    def _set_size(self, args: bytes) -> None:
+        size = args[0]
+        self._set_style(width_factor=min(2, (size >> 4) + 1), height_factor=min(2, (size & 0x0F) + 1))
+
+    def _set_line_spacing(self, args: bytes) -> None:
+        self._line_spacing = args[0]
+
+    def _set_chinese(self, *, state: bool) -> None:
+        self._chinese = state
+
+    def _set_chinese_format(self, args: bytes) -> None:
+        try:
+            self._chinese_format = Chinese(args[0])
+        except ValueError:
+            log.warning("Unknown Chinese format: %d", args[0])
+
+    def _set_codepage(self, args: bytes) -> None:
+        try:
+            self._codepage = next(codepage for codepage in CodePage if codepage.value[0] == args[0])
+        except StopIteration:
+            log.warning("Unknown code page: %d", args[0])
+
+    def _set_online(self, args: bytes) -> None:
+        self.online = bool(args[0] & 1)
+
+    def _set_justify(self, args: bytes) -> None:
+        self._justify = Justify(min(2, args[0]))
+
+    def _set_left_margin(self, args: bytes) -> None:
+        self._left_margin = args[0]
+
+    def _set_left_blank(self, args: bytes) -> None:
+        self._left_blank = args[0] + args[1] * 256
+
+    def _feed_lines(self, args: bytes) -> None:
+        self._print_line()
+        self._feed_dots(args[0] * self._line_spacing)
+
+    def _status(self, args: bytes) -> None:  # noqa: ARG002
+        self.output.append(0 if self.has_paper else 0b00000100)
+
+    def _test_page(self, args: bytes) -> None:  # noqa: ARG002
+        for line in ("DP-EH600 thermal printer", "Test page", f"Code page: {self._codepage.name}"):
+            for char in line:
+                self._add_char(char, Style())
+            self._print_line()
+        self._feed_dots(self._line_spacing)
+
+    #
+    # Barcodes
+    #
+
+    def _set_barcode_height(self, args: bytes) -> None:
+        self._barcode_height = max(1, args[0])
+
+    def _set_barcode_left_margin(self, args: bytes) -> None:
+        self._barcode_left_margin = args[0]
+
+    def _set_barcode_position(self, args: bytes) -> None:
+        self._barcode_position = BarCodePosition(args[0] & 0b11)
+
+    def _set_barcode_width(self, args: bytes) -> None:
+        self._barcode_width = min(6, max(2, args[0]))
+
+    def _barcode(self, buffer: bytearray, offset: int) -> int:
+        """GS k m n data: bars are drawn from data bits, between start, and stop, patterns."""
+        if offset + 4 > len(buffer):
+            return 0
+        size = buffer[offset + 3]
+        if offset + 4 + size > len(buffer):
+            return 0
+
+        self._flush_text()
+        self._print_line()
+        data = bytes(buffer[offset + 4 : offset + 4 + size])
+
+        from PIL import Image
+
+        modules = [1, 0, 1] + [bit for byte in data for bit in (*map(int, f"{byte:08b}"), 0)] + [1, 0, 1]
+        module = self._barcode_width
+        while module > 1 and len(modules) * module > MAX_IMAGE_WIDTH - self._barcode_left_margin:
+            module -= 1
+        bars = Image.new("1", (len(modules) * module, self._barcode_height), 1)
+        for index, bit in enumerate(modules):
+            if bit:
+                bars.paste(0, (index * module, 0, (index + 1) * module, bars.height))
+
+        text = data.decode("latin-1")
+        if self._barcode_position in {BarCodePosition.ABOVE, BarCodePosition.BOTH}:
+            self._print_text_line(text)
+        strip = Image.new("1", (MAX_IMAGE_WIDTH, bars.height), 1)
+        strip.paste(bars, (self._offset(bars.width) + self._barcode_left_margin, 0))
+        self._add_strip(strip, printed=strip.height)
+        if self._barcode_position in {BarCodePosition.BELOW, BarCodePosition.BOTH}:
+            self._print_text_line(text)
+
+        return 4 + size
+
+    def _print_text_line(self, text: str) -> None:
+        for char in text:
+            self._add_char(char, Style())
+        self._print_line()
+
+    #
+    # Raster images
+    #
+
+    def _raster(self, buffer: bytearray, offset: int) -> int:
+        """GS v 0 m xL xH yL yH data."""
+        if offset + 8 > len(buffer):
+            return 0
+        mode = buffer[offset + 3]
+        row_bytes = buffer[offset + 4] + buffer[offset + 5] * 256
+        rows = buffer[offset + 6] + buffer[offset + 7] * 256
+        size = row_bytes * rows
+        if offset + 8 + size > len(buffer):
+            return 0
+
+        self._flush_text()
+        self._print_line()
+        if not size:
+            return 8
+
+        from PIL import Image
+
+        data = bytes(buffer[offset + 8 : offset + 8 + size]).translate(_INVERT)
+        bitmap = Image.frombytes("1", (row_bytes * 8, rows), data)
+        x_factor, y_factor = 1 + (mode & 1), 1 + (mode >> 1 & 1)
+        if x_factor > 1 or y_factor > 1:
+            bitmap = bitmap.resize((bitmap.width * x_factor, bitmap.height * y_factor), Image.Resampling.NEAREST)
+
+        strip = Image.new("1", (MAX_IMAGE_WIDTH, bitmap.height), 1)
+        strip.paste(bitmap, (self._offset(bitmap.width), 0))
+        self._add_strip(strip, printed=strip.height)
+        return 8 + size
+
+
+@lru_cache(maxsize=1024)
+def _glyph(char: str, style: Style, *, wide: bool = False) -> Any:
+    """Render one character into its cell."""
+    from PIL import Image, ImageDraw
+
+    width, height = FONT_B if style.font_b else FONT_A
+    if wide:
+        width *= 2
+
+    # A rotated character is drawn in a cell with swapped sides, then turned clockwise
+    size = (height, width) if style.rotate else (width, height)
+    cell = Image.new("1", size, 1)
+    draw = ImageDraw.Draw(cell)
+    font = _font(size[1] * 5 // 6)
+    left, top, right, bottom = draw.textbbox((0, 0), char, font=font)
+    position = ((size[0] - (right - left)) // 2 - left, (size[1] - (bottom - top)) // 2 - top)
+    draw.text(position, char, font=font, fill=0)
+    if style.bold:
+        draw.text((position[0] + 1, position[1]), char, font=font, fill=0)
+    if style.rotate:
+        cell = cell.transpose(Image.Transpose.ROTATE_270)
+    if style.spacing:
+        spaced = Image.new("1", (width + style.spacing, height), 1)
+        spaced.paste(cell, (0, 0))
+        cell = spaced
+
+    x_factor, y_factor = style.scale
+    if x_factor > 1 or y_factor > 1:
+        cell = cell.resize((cell.width * x_factor, cell.height * y_factor), Image.Resampling.NEAREST)
+    return cell
+
+
+@lru_cache(maxsize=4)
+def _font(size: int) -> Any:
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # pragma: nocover
+        # Pillow < 10.1
+        return ImageFont.load_default()
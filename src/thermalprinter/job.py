@@ -0,0 +1,291 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+import struct
+from atexit import unregister
+from dataclasses import dataclass, replace
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from thermalprinter.cache import LRUCache
+from thermalprinter.constants import MAX_BUFFER_SIZE, CodePage, Command
+from thermalprinter.exceptions import ThermalPrinterValueError
+from thermalprinter.thermalprinter import ThermalPrinter
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+    from typing import Any
+
+    from _typeshed import ReadableBuffer
+
+#: Header of job files: magic, lines, feeds, estimated duration, code page at start, and number of segments.
+JOB_HEADER = struct.Struct("<4sIIdBI")
+JOB_MAGIC = b"TPJ1"
+
+#: Segment entry of job files: kind, size, and pacing delay.
+SEGMENT = struct.Struct("<BId")
+
+
+class SegmentKind(Enum):
+    """Kind of data of a job segment."""
+
+    COMMAND = 0
+    TEXT = 1
+    RASTER = 2
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A part of a job data.
+
+    :param SegmentKind kind: The kind of data.
+    :param int size: The data size, in bytes.
+    :param float delay: The time the printer needs to process the data, in seconds.
+    """
+
+    kind: SegmentKind
+    size: int
+    delay: float = 0.0
+
+
+@dataclass(frozen=True)
+class Job:
+    """A compiled print job, see :class:`JobCompiler`.
+
+    :param bytes data: The bytes to send to the printer.
+    :param int lines: The number of printed lines.
+    :param int feeds: The number of paper feeds.
+    :param float duration: The estimated print duration, in seconds.
+    :param tuple[Segment, ...] segments: Boundaries of ``data`` parts, with their pacing delays.
+    :param CodePage codepage: The code page expected when the job starts.
+
+    Jobs can be saved to, and loaded from, files:
+
+    >>> job.save("receipt.tpj")
+    >>> job = Job.load("receipt.tpj")
+
+    .. versionadded:: 2.1.1
+    """
+
+    data: bytes
+    lines: int = 0
+    feeds: int = 0
+    duration: float = 0.0
+    segments: tuple[Segment, ...] = ()
+    codepage: CodePage = CodePage.CP437
+
+    def to_bytes(self) -> bytes:
+        """Serialize the job, see :func:`from_bytes()` for the format.
+
+        :rtype: bytes
+        """
+        header = JOB_HEADER.pack(
+            JOB_MAGIC, self.lines, self.feeds, self.duration, self.codepage.value[0], len(self.segments)
+        )
+        table = b"".join(SEGMENT.pack(segment.kind.value, segment.size, segment.delay) for segment in self.segments)
+        return header + table + self.data
+
+    @classmethod
+    def from_bytes(cls, data: ReadableBuffer) -> Job:
+        """Deserialize a job.
+
+        The format is made of a header (see :const:`JOB_HEADER`), followed by segment entries (see :const:`SEGMENT`),
+        and the raw bytes to send to the printer. Integers, and floats, are little-endian.
+
+        :param bytes data: The serialized job.
+        :rtype: Job
+        :exception ThermalPrinterValueError: On invalid data.
+        """
+        view = memoryview(data).cast("B")
+        try:
+            magic, lines, feeds, duration, codepage, count = JOB_HEADER.unpack_from(view)
+            offset = JOB_HEADER.size
+            segments = []
+            for _ in range(count):
+                kind, size, delay = SEGMENT.unpack_from(view, offset)
+                segments.append(Segment(SegmentKind(kind), size, delay))
+                offset += SEGMENT.size
+            codepage = next(item for item in CodePage if item.value[0] == codepage)
+        except (struct.error, ValueError, StopIteration):
+            magic = b""
+
+        if magic != JOB_MAGIC:
+            msg = "Not a print job."
+            raise ThermalPrinterValueError(msg)
+
+        payload = bytes(view[offset:])
+        if segments and sum(segment.size for segment in segments) != len(payload):
+            msg = "Truncated print job."
+            raise ThermalPrinterValueError(msg)
+
+        return cls(payload, lines=lines, feeds=feeds, duration=duration, segments=tuple(segments), codepage=codepage)
+
+    @classmethod
+    def load(cls, file: str | os.PathLike[str]) -> Job:
+        """Load a job from a file (usually with the ``.tpj`` extension).
+
+        :param str | os.PathLike file: The file path.
+        :rtype: Job
+        :exception ThermalPrinterValueError: On invalid file.
+        """
+        return cls.from_bytes(Path(file).read_bytes())
+
+    def save(self, file: str | os.PathLike[str]) -> None:
+        """Save the job to a file (usually with the ``.tpj`` extension).
+
+        :param str | os.PathLike file: The file path.
+        """
+        Path(file).write_bytes(self.to_bytes())
+
+
+class JobCompiler(ThermalPrinter):
+    """A printer without any serial port, recording the bytes that would be sent to the printer.
+
+    Nothing is waited for, the time the printer would take to process data is summed up instead.
+    Data is split into segments of commands, text, and raster data, each one with its own pacing delay.
+    The printer is expected to be in its default state (like after :func:`ThermalPrinter.reset()`)
+    when printing the job.
+
+    :param dict kwargs: :class:`ThermalPrinter` keyword-arguments, used for timings.
+
+    Example:
+
+    >>> with JobCompiler() as compiler:
+    ...     compiler.out("Hello!", bold=True)
+    ...     compiler.feed(2)
+    ...     job = compiler.job()
+
+    >>> with ThermalPrinter() as printer:
+    ...     printer.print_job(job)
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._duration = 0.0
+        self._kind = SegmentKind.TEXT
+        self._segments: list[Segment] = []
+        kwargs |= {"port": "record://", "use_stats": False}
+        super().__init__(**kwargs)
+
+        # Nothing to wait for at exit, and compilers must not be kept alive until then
+        unregister(self.close)
+
+        # Forget about the printer setup
+        self._conn.data.clear()
+        self._duration = 0.0
+        self._segments.clear()
+        self._start_codepage = self._codepage
+
+    def __enter__(self) -> JobCompiler:  # noqa: PYI034
+        return self
+
+    def write(self, data: ReadableBuffer, *, should_log: bool = True) -> int | None:
+        size = len(memoryview(data).cast("B"))
+        last = self._segments[-1] if self._segments else None
+        if last and last.kind is self._kind and last.size + size <= MAX_BUFFER_SIZE:
+            # Like buffered(): merge consecutive writes, and postpone their pacing delays
+            self._segments[-1] = replace(last, size=last.size + size)
+        else:
+            self._segments.append(Segment(self._kind, size))
+        return super().write(data, should_log=should_log)
+
+    def send_command(self, command: Command, *args: int) -> None:
+        kind, self._kind = self._kind, SegmentKind.COMMAND
+        try:
+            super().send_command(command, *args)
+        finally:
+            self._kind = kind
+
+    def close(self) -> None:
+        """Close the recording port, and forget about the data recorded."""
+        super().close()
+        self._conn.data.clear()
+        self._segments.clear()
+
+    def _write_raster(self, *args: Any, **kwargs: Any) -> float:
+        kind, self._kind = self._kind, SegmentKind.RASTER
+        try:
+            return super()._write_raster(*args, **kwargs)
+        finally:
+            self._kind = kind
+
+    def _pace(self, seconds: float) -> None:
+        # Delays are kept per segment, even when buffered
+        self._wait(seconds)
+
+    def _wait(self, seconds: float) -> None:
+        if not seconds:
+            return
+
+        self._duration += seconds
+        if self._segments:
+            last = self._segments[-1]
+            self._segments[-1] = replace(last, delay=last.delay + seconds)
+        else:
+            self._segments.append(Segment(SegmentKind.COMMAND, 0, seconds))
+
+    def _clock(self) -> float:
+        return self._duration
+
+    def job(self) -> Job:
+        """Return the job compiled so far.
+
+        :rtype: Job
+        """
+        self._tx_flush()
+        return Job(
+            bytes(self._conn.data),
+            lines=self.lines,
+            feeds=self.feeds,
+            duration=self._duration,
+            segments=tuple(self._segments),
+            codepage=self._start_codepage,
+        )
+
+
+class JobCache(LRUCache[Job]):
+    """Cache of compiled jobs, to print again the same content at the cost of the serial transmission only.
+
+    Think of a receipt header, or footer, with a logo, and barcodes: it is compiled once,
+    and its bytes are then sent as-is.
+
+    :param int max_size: Maximum total size of jobs data, in bytes.
+
+    Example:
+
+    >>> def header(printer):
+    ...     printer.image("logo.png")
+    ...     printer.out("My Shop", bold=True, justify=Justify.CENTER)
+
+    >>> cache = JobCache()
+    >>> job = cache.compile("header", header)
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(self, max_size: int = 1024 * 1024) -> None:
+        super().__init__(max_size)
+
+    def compile(self, key: str, build: Callable[[ThermalPrinter], Any], **kwargs: Any) -> Job:
+        """Return the job stored for ``key``, or compile it when missing.
+
+        :param str key: The job key, identifying the content produced by ``build``.
+        :param Callable build: The function calling printer methods, it receives a :class:`JobCompiler`.
+        :param dict kwargs: :class:`JobCompiler` keyword-arguments.
+        :rtype: Job
+        """
+        if (job := self.get(key)) is not None:
+            return job
+
+        with JobCompiler(**kwargs) as compiler:
+            build(compiler)
+            job = compiler.job()
+
+        self.set(key, job, len(job.data))
+        return job
@@ -0,0 +1,196 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from thermalprinter.constants import Command
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from typing import Any
+
+#: Upper bounds of job latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+#: Prefix of metric names exported to Prometheus.
+PROMETHEUS_PREFIX = "thermalprinter"
+
+
+def _label_value(value: str) -> str:
+    """Escape a Prometheus label value: backslashes, double quotes, and line feeds."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Distribution of observed values.
+
+    :param tuple[float, ...] buckets: Upper bounds of buckets, sorted.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a ``value`` to the distribution."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return the number of values lower than, or equal to, each bucket upper bound, the last one being infinity."""
+        result, total = [], 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:
+    """Counters of what was sent to the printer, and where the time went.
+
+    Every printer has its own metrics (see :attr:`ThermalPrinter.metrics`), that can be shared across printers
+    via the ``metrics`` keyword-argument.
+
+    >>> with ThermalPrinter() as printer:
+    ...     with printer.metrics.job("receipt"):
+    ...         printer.out("Hello!")
+    ...     metrics = printer.metrics.to_dict()
+
+    >>> metrics["sleep_seconds"], metrics["write_seconds"]
+    (0.39, 0.004)
+
+    Metrics can be exported to the Prometheus node exporter text file collector:
+
+    >>> printer.metrics.save("/var/lib/node_exporter/thermalprinter.prom")
+
+    .. note::
+        Jobs sent via :func:`ThermalPrinter.print_job()` are counted as bytes, not as commands, images, or barcodes.
+
+    .. versionadded:: 2.1.1
+    """
+
+    def __init__(self) -> None:
+        #: Bytes written to the serial port.
+        self.bytes_written = 0
+        #: Writes issued to the serial port.
+        self.writes = 0
+        #: Seconds spent in serial port writes.
+        self.write_seconds = 0.0
+        #: Seconds spent sleeping, waiting for the printer to process data.
+        self.sleep_seconds = 0.0
+        #: Commands sent, by opcode (the command, and its first byte).
+        self.commands: Counter[bytes] = Counter()
+        #: Images printed.
+        self.images = 0
+        #: Raster data bytes sent.
+        self.raster_bytes = 0
+        #: Barcodes printed.
+        self.barcodes = 0
+        #: Job latencies, by job name.
+        self.jobs: dict[str, Histogram] = {}
+
+    def clear(self) -> None:
+        """Reset all metrics."""
+        self.bytes_written = self.writes = self.images = self.raster_bytes = self.barcodes = 0
+        self.write_seconds = self.sleep_seconds = 0.0
+        self.commands.clear()
+        self.jobs.clear()
+
+    @contextmanager
+    def job(self, name: str) -> Generator[None]:
+        """Measure the latency of a job, from start to end, into the ``name`` histogram.
+
+        :param str name: The job name.
+        """
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.jobs.setdefault(name, Histogram()).observe(monotonic() - start)
+
+    @staticmethod
+    def opcode(key: bytes) -> str:
+        """Return a readable opcode, like ``"ESC 69"``, from its first bytes."""
+        if len(key) == 2:
+            return f"{Command(key[0]).name} {key[1]}"
+        return str(key[0]) if key else ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return metrics as a dict, ready to be serialized to JSON."""
+        return {
+            "bytes_written": self.bytes_written,
+            "writes": self.writes,
+            "write_seconds": self.write_seconds,
+            "sleep_seconds": self.sleep_seconds,
+            "commands": {self.opcode(key): count for key, count in sorted(self.commands.items())},
+            "images": self.images,
+            "raster_bytes": self.raster_bytes,
+            "barcodes": self.barcodes,
+            "jobs": {
+                name: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": {str(bound): count for bound, count in histogram.cumulative()},
+                }
+                for name, histogram in sorted(self.jobs.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Return metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def add(name: str, kind: str, doc: str, samples: list[tuple[str, float]]) -> None:
+            name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{suffix} {value}" for suffix, value in samples)
+
+        add("bytes_written_total", "counter", "Bytes written to the serial port.", [("", self.bytes_written)])
+        add("writes_total", "counter", "Writes issued to the serial port.", [("", self.writes)])
+        add("write_seconds_total", "counter", "Seconds spent in serial port writes.", [("", self.write_seconds)])
+        add("sleep_seconds_total", "counter", "Seconds spent in pacing sleeps.", [("", self.sleep_seconds)])
+        add(
+            "commands_total",
+            "counter",
+            "Commands sent, by opcode.",
+            [(f'{{opcode="{self.opcode(key)}"}}', count) for key, count in sorted(self.commands.items())],
+        )
+        add("images_total", "counter", "Images printed.", [("", self.images)])
+        add("raster_bytes_total", "counter", "Raster data bytes sent.", [("", self.raster_bytes)])
+        add("barcodes_total", "counter", "Barcodes printed.", [("", self.barcodes)])
+
+        samples: list[tuple[str, float]] = []
+        for name, histogram in sorted(self.jobs.items()):
+            job = _label_value(name)
+            samples.extend(
+                (f'_bucket{{job="{job}",le="{"+Inf" if bound == float("inf") else bound}"}}', count)
+                for bound, count in histogram.cumulative()
+            )
+            samples.append((f'_sum{{job="{job}"}}', histogram.sum))
+            samples.append((f'_count{{job="{job}"}}', histogram.count))
+        add("job_duration_seconds", "histogram", "Job latencies, by job name.", samples)
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, file: str | os.PathLike[str]) -> None:
+        """Save metrics to a Prometheus text file, atomically, so that collectors never read a partial file.
+
+        :param str | os.PathLike file: The file path.
+        """
+        path = Path(file)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.to_prometheus())
+        tmp.replace(path)
@@ -0,0 +1,324 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from thermalprinter.constants import MAX_IMAGE_WIDTH, Dithering, ImageScale
+from thermalprinter.exceptions import ThermalPrinterValueError
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from typing import Any
+
+    from _typeshed import ReadableBuffer
+
+#: Size of the raster bitmap command header (``GS v 0 m xL xH yL yH``).
+HEADER_SIZE = 8
+
+#: Size of the feed by dots command (``ESC J n``).
+FEED_SIZE = 3
+
+#: Translate table to invert bits: PIL uses 1 for white pixels, the printer uses 1 for black dots.
+INVERT_TABLE = bytes(0xFF - byte for byte in range(256))
+
+
+def row_bytes(width: int) -> int:
+    """Return the number of bytes needed to store one row of ``width`` pixels."""
+    return (width + 7) // 8
+
+
+def padding_mask(width: int) -> int:
+    """Return the mask to apply on the last byte of a row to clear bits that are out of the image."""
+    return (0xFF << (-width % 8)) & 0xFF
+
+
+def pack(image: Any) -> bytearray:
+    """Pack a 1-bit ``image`` into printer raster data.
+
+    Rows are MSB-first, padded to the next byte boundary, with bits set for black dots.
+    The work is done on the packed buffer returned by :py:meth:`PIL.Image.Image.tobytes()`,
+    using NumPy when available, else bytes translations.
+
+    :param PIL.Image image: The PIL Image object to pack, in the ``1`` mode.
+    :rtype: bytearray
+    :return: The raster data.
+    """
+    width, height = image.size
+    data = image.tobytes()
+
+    try:
+        import numpy as np
+    except ImportError:
+        return pack_bytes(data, width, height)
+
+    bitmap = np.frombuffer(data, dtype=np.uint8).reshape(height, row_bytes(width))
+    bitmap = np.invert(bitmap)
+    bitmap[:, -1] &= padding_mask(width)
+    return bytearray(bitmap.tobytes())
+
+
+def pack_bytes(data: bytes, width: int, height: int) -> bytearray:
+    """Pure Python implementation of :func:`pack()`, working on the raw ``data`` of the 1-bit image."""
+    bitmap = bytearray(data.translate(INVERT_TABLE))
+
+    mask = padding_mask(width)
+    if mask != 0xFF and height:
+        # Clear out-of-image bits from the last byte of every row
+        size = row_bytes(width)
+        table = bytes(byte & mask for byte in range(256))
+        bitmap[size - 1 :: size] = bitmap[size - 1 :: size].translate(table)
+
+    return bitmap
+
+
+def runs(bitmap: ReadableBuffer, size: int) -> list[tuple[int, int, bool]]:
+    """Split raster data into runs of rows, and tell whether a run is blank (nothing to print).
+
+    Blank runs are only reported when replacing them with feed commands saves bytes:
+    a run of blank rows in the middle of the image costs an additional raster bitmap header.
+
+    :param bytes bitmap: The raster data.
+    :param int size: The number of bytes per row.
+    :rtype: list[tuple[int, int, bool]]
+    :return: Runs as ``(start row, stop row, is blank)`` tuples.
+    """
+    view = memoryview(bitmap).cast("B")
+    height = len(view) // size
+
+    try:
+        import numpy as np
+    except ImportError:
+        blank_row = bytes(size)
+        blanks = [view[row * size : (row + 1) * size] == blank_row for row in range(height)]
+    else:
+        blanks = (~np.frombuffer(view, dtype=np.uint8).reshape(height, size).any(axis=1)).tolist()
+
+    min_blank_rows = (HEADER_SIZE + FEED_SIZE) // size + 1
+    result: list[tuple[int, int, bool]] = []
+    start = 0
+    for row in range(1, height + 1):
+        if row < height and blanks[row] is blanks[start]:
+            continue
+        blank = blanks[start] and row - start >= min_blank_rows
+        if not blank and result and not result[-1][2]:
+            # Merge with the previous run
+            result[-1] = (result[-1][0], row, False)
+        else:
+            result.append((start, row, blank))
+        start = row
+
+    return result
+
+
+def ink_columns(bitmap: ReadableBuffer, size: int) -> tuple[int, int]:
+    """Find the range of byte columns containing at least one black dot.
+
+    :param bytes bitmap: The raster data.
+    :param int size: The number of bytes per row.
+    :rtype: tuple[int, int]
+    :return: The ``(start, stop)`` byte columns. At least one column is kept for a blank ``bitmap``.
+    """
+    view = memoryview(bitmap).cast("B")
+    height = len(view) // size
+
+    try:
+        import numpy as np
+    except ImportError:
+        data = view.tobytes()
+        inked = [data[column::size].count(0) != height for column in range(size)]
+    else:
+        inked = np.frombuffer(view, dtype=np.uint8).reshape(height, size).any(axis=0).tolist()
+
+    if True not in inked:
+        return 0, 1
+
+    start = inked.index(True)
+    stop = size - inked[::-1].index(True)
+    return start, stop
+
+
+def trim(bitmap: ReadableBuffer, size: int, start: int, stop: int) -> bytes:
+    """Keep only byte columns from ``start`` to ``stop`` of every row.
+
+    :param bytes bitmap: The raster data.
+    :param int size: The number of bytes per row.
+    :param int start: The first column to keep.
+    :param int stop: The column after the last one to keep.
+    :rtype: bytes
+    :return: The trimmed raster data, with ``stop - start`` bytes per row.
+    """
+    view = memoryview(bitmap).cast("B")
+    height = len(view) // size
+
+    try:
+        import numpy as np
+    except ImportError:
+        return b"".join(view[row + start : row + stop] for row in range(0, height * size, size))
+
+    return np.frombuffer(view, dtype=np.uint8).reshape(height, size)[:, start:stop].tobytes()
+
+
+def threshold(array: Any, dithering: Dithering = Dithering.NONE) -> Any:
+    """Turn a 2-D array of pixels into an array of dots, ``True`` being a black dot.
+
+    Boolean arrays are already dots. Other arrays are grayscale intensities, pixels darker than 128 being black,
+    unless using a ``dithering`` mode.
+
+    :param numpy.ndarray array: The array of pixels.
+    :param Dithering dithering: The dithering mode, for grayscale intensities.
+    :rtype: numpy.ndarray
+    :return: The boolean array of dots.
+    :exception ThermalPrinterValueError: On array that has not 2 dimensions.
+    """
+    import numpy as np
+
+    pixels = np.asarray(array)
+    if pixels.ndim != 2:
+        msg = f"Only 2-D arrays can be printed (got: {pixels.ndim} dimensions)."
+        raise ThermalPrinterValueError(msg)
+
+    if pixels.dtype == np.bool_:
+        return pixels
+    if dithering is Dithering.NONE:
+        return pixels < 128
+
+    from thermalprinter.dithering import dots
+
+    return dots(np.clip(pixels, 0, 255).astype(np.uint8), dithering)
+
+
+def pack_array(dots: Any, scale: ImageScale | None = ImageScale.NORMAL) -> Raster | None:
+    """Pack an array of dots into raster data, using :func:`numpy.packbits()`.
+
+    :param numpy.ndarray dots: The boolean array of dots, see :func:`threshold()`.
+    :param ImageScale | None scale: The scaling mode, ``None`` to shrink the array when made of duplicated dots.
+    :rtype: Raster | None
+    :return: The raster, or ``None`` when the array is too wide to be printed as-is.
+    """
+    import numpy as np
+
+    if scale is None:
+        dots, scale = _downscale_array(dots)
+
+    _, x_factor, _ = scale.value
+    if dots.shape[1] > MAX_IMAGE_WIDTH // x_factor:
+        return None
+
+    packed = np.packbits(dots, axis=1)
+    return Raster(memoryview(packed).cast("B"), packed.shape[1], scale)
+
+
+def _downscale_array(dots: Any) -> tuple[Any, ImageScale]:
+    """NumPy implementation of :func:`downscale()`."""
+    height, width = dots.shape
+    double_width = width % 2 == 0 and (dots[:, ::2] == dots[:, 1::2]).all()
+    double_height = height % 2 == 0 and (dots[::2] == dots[1::2]).all()
+
+    if double_width and double_height:
+        return dots[::2, ::2], ImageScale.QUADRUPLE
+    if double_width:
+        return dots[:, ::2], ImageScale.DOUBLE_WIDTH
+    if double_height:
+        return dots[::2], ImageScale.DOUBLE_HEIGHT
+    return dots, ImageScale.NORMAL
+
+
+def pbm_header(data: ReadableBuffer) -> tuple[int, int, int]:
+    """Parse the header of a binary PBM image (netpbm ``P4`` format).
+
+    :param bytes data: The PBM file content.
+    :rtype: tuple[int, int, int]
+    :return: The ``(width, height, offset)`` of the image, ``offset`` being the position of the raster data.
+    :exception ThermalPrinterValueError: On invalid header.
+    """
+    view = memoryview(data).cast("B")
+    head = view[:1024].tobytes()
+    if not head.startswith(b"P4"):
+        msg = "Not a binary PBM (P4) image."
+        raise ThermalPrinterValueError(msg)
+
+    fields: list[int] = []
+    offset = 2
+    while len(fields) < 2:
+        while offset < len(head) and head[offset : offset + 1].isspace():
+            offset += 1
+        if head.startswith(b"#", offset):
+            offset = head.find(b"\n", offset) + 1 or len(head)
+            continue
+        start = offset
+        while offset < len(head) and head[offset : offset + 1].isdigit():
+            offset += 1
+        if start == offset:
+            msg = "Invalid binary PBM (P4) header."
+            raise ThermalPrinterValueError(msg)
+        fields.append(int(head[start:offset]))
+
+    # A single whitespace separates the header from the raster data
+    width, height = fields
+    return width, height, offset + 1
+
+
+def downscale(image: Any) -> tuple[Any, ImageScale]:
+    """Shrink an image made of duplicated pixels, and return the scaling mode to use to print it as-is.
+
+    :param PIL.Image image: The PIL Image object to check.
+    :rtype: tuple[PIL.Image, ImageScale]
+    :return: The shrunk image object, if shrunk, else the original ``image``, and the appropriate scaling mode.
+    """
+    width, height = image.size
+    double_width = width % 2 == 0 and _is_upscaled(image, (width // 2, height))
+    double_height = height % 2 == 0 and _is_upscaled(image, (width, height // 2))
+
+    if double_width and double_height:
+        return _shrink(image, (width // 2, height // 2)), ImageScale.QUADRUPLE
+    if double_width:
+        return _shrink(image, (width // 2, height)), ImageScale.DOUBLE_WIDTH
+    if double_height:
+        return _shrink(image, (width, height // 2)), ImageScale.DOUBLE_HEIGHT
+    return image, ImageScale.NORMAL
+
+
+def _shrink(image: Any, size: tuple[int, int]) -> Any:
+    from PIL.Image import Resampling
+
+    return image.resize(size, Resampling.NEAREST)
+
+
+def _is_upscaled(image: Any, size: tuple[int, int]) -> bool:
+    """Check whether upscaling back the shrunk ``image`` gives the original one."""
+    from PIL.Image import Resampling
+
+    return _shrink(image, size).resize(image.size, Resampling.NEAREST).tobytes() == image.tobytes()
+
+
+@dataclass(frozen=True)
+class Raster:
+    """Packed raster data, ready to be sent to the printer.
+
+    :param bytes | memoryview data: The raster data, see :func:`pack()`.
+    :param int row_bytes: The number of bytes per row.
+    :param ImageScale scale: The scaling mode to use when printing.
+    """
+
+    data: bytes | memoryview
+    row_bytes: int
+    scale: ImageScale = ImageScale.NORMAL
+
+    @property
+    def height(self) -> int:
+        """Number of rows."""
+        return len(self.data) // self.row_bytes
+
+    def bands(self, height: int) -> Generator[memoryview]:
+        """Yield the raster data by bands of ``height`` rows, without copying.
+
+        :param int height: The band height, in rows.
+        """
+        view = memoryview(self.data)
+        step = height * self.row_bytes
+        for offset in range(0, len(view), step):
+            yield view[offset : offset + step]
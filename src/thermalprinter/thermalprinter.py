@@ -4,30 +4,44 @@ Source: https://github.com/BoboTiG/thermalprinter.
 
 from __future__ import annotations
 
-import math
-import struct
+import errno
+import mmap
+import os
+import select
 from atexit import register
-from logging import getLogger
+from collections import deque
+from contextlib import contextmanager, suppress
+from logging import DEBUG, getLogger
 from pathlib import Path
-from time import sleep
+from time import monotonic, sleep
 from typing import TYPE_CHECKING
 
 import serial
 
+from thermalprinter import raster
 from thermalprinter.constants import *
 from thermalprinter.exceptions import ThermalPrinterCommunicationError, ThermalPrinterValueError
+from thermalprinter.metrics import Metrics
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable
     from types import TracebackType
     from typing import Any
 
     from _typeshed import ReadableBuffer
 
+    from thermalprinter.cache import ImageCache
+    from thermalprinter.job import Job, JobCache
+
 
 log = getLogger(__name__)
 
 GNU_FILE = Path(__file__).parent / "gnu.png"
 
+# Additional URL handlers, like "record://"
+if "thermalprinter.urlhandler" not in serial.protocol_handler_packages:
+    serial.protocol_handler_packages.append("thermalprinter.urlhandler")
+
 
 class ThermalPrinter:
     """
@@ -39,9 +53,14 @@ class ThermalPrinter:
     :param float command_timeout: Time to sleep after issuing a command to the printer, in seconds.
     :param float dot_feed_time: Printer feed time, in seconds (see :const:`constants.Defaults.DOT_FEED_TIME`).
     :param float dot_print_time: Printer dot time, in seconds (see :const:`constants.Defaults.DOT_PRINT_TIME`).
+    :param FlowControl flow_control: Hardware flow control, to wait for the printer BUSY line instead of pacing data using timings (see :const:`constants.FlowControl`). Writes then block while the printer is busy, the ``write_timeout`` may need to be raised.
     :param int heat_interval: Printer heat time interval (see :const:`constants.Defaults.HEAT_INTERVAL`).
     :param int heat_time: Printer heat time (see :const:`constants.Defaults.HEAT_TIME`).
+    :param ImageCache | None image_cache: Cache of converted images, to speed up printing the same images again (see :class:`cache.ImageCache`).
+    :param JobCache | None job_cache: Cache of compiled jobs, used by :func:`print_cached()` (see :class:`job.JobCache`).
+    :param Metrics | None metrics: Runtime metrics to update, to share them across printers (see :attr:`metrics`).
     :param int most_heated_point: Printer most heated point (see :const:`constants.Defaults.MOST_HEATED_POINT`).
+    :param Pacing pacing: How to estimate the time the printer needs to process data (see :const:`constants.Pacing`).
     :param float read_timeout: Serial read timeout, in seconds (see :const:`constants.Defaults.READ_TIMEOUT`).
     :param bool run_setup_cmd: Set to ``False`` to disable the automatic one-shot run of the printer settings command (that ay be problematic on some devices).
     :param bool use_stats: Set to ``False`` to disable statistics persistence. See :doc:`tools <tools>` for its usage.
@@ -54,6 +73,9 @@ class ThermalPrinter:
 
     .. versionadded:: 1.0.0
         ``byte_time``, ``dot_feed_time``, ``dot_print_time``, ``run_setup_cmd``, ``read_timeout``, ``use_stats``, and ``write_timeout``, keyword-arguments.
+
+    .. versionadded:: 2.1.1
+        ``flow_control``, ``image_cache``, ``job_cache``, ``metrics``, and ``pacing``, keyword-arguments.
     """  # noqa: E501
 
     # Counters
@@ -98,9 +120,14 @@ class ThermalPrinter:
         command_timeout: float = 0.05,
         dot_feed_time: float = Defaults.DOT_FEED_TIME.value,
         dot_print_time: float = Defaults.DOT_PRINT_TIME.value,
+        flow_control: FlowControl = FlowControl.NONE,
         heat_interval: int = Defaults.HEAT_INTERVAL.value,
         heat_time: int = Defaults.HEAT_TIME.value,
+        image_cache: ImageCache | None = None,
+        job_cache: JobCache | None = None,
+        metrics: Metrics | None = None,
         most_heated_point: int = Defaults.MOST_HEATED_POINT.value,
+        pacing: Pacing = Pacing.TIMINGS,
         read_timeout: float = Defaults.READ_TIMEOUT.value,
         run_setup_cmd: bool = True,
         use_stats: bool = True,
@@ -110,11 +137,35 @@ class ThermalPrinter:
         self._byte_time = byte_time
         self._dot_feed_time = dot_feed_time
         self._dot_print_time = dot_print_time
+        self._flow_control = flow_control
+        self._pacing = pacing
         self._command_timeout = command_timeout
         self._heat_time = heat_time
         self._heat_interval = heat_interval
         self._most_heated_point = most_heated_point
         self._use_stats = use_stats
+        self._image_cache = image_cache
+        self._job_cache = job_cache
+        self._metrics = metrics or Metrics()
+
+        # Transmit buffer, see buffered()
+        self._tx_buffer: bytearray | None = None
+        self._tx_delay = 0.0
+
+        # Pacing engine: the time the printer will be busy until, and data waiting in its receive buffer,
+        # as (time processed at, size) pairs, the last one being still processed when ``_rx_unpaced``.
+        self._busy_until = 0.0
+        self._rx_pending: deque[list[float]] = deque()
+        self._rx_level = 0
+        self._rx_unpaced = False
+
+        # Time to transmit one byte on the serial link: 11 bits, to accommodate idle, start, and stop, bits
+        self._link_byte_time = 11 / baudrate
+
+        # Largest write that fits in the printer receive buffer, and that can be transmitted before the write timeout
+        self._tx_chunk_size = MAX_BUFFER_SIZE
+        if write_timeout:
+            self._tx_chunk_size = max(1, min(MAX_BUFFER_SIZE, int(write_timeout * baudrate / 11)))
 
         # Several checks
         msg = ""
@@ -128,7 +179,14 @@ class ThermalPrinter:
             raise ThermalPrinterValueError(msg)
 
         # Init the serial
-        self._conn = serial.serial_for_url(port, baudrate=baudrate, timeout=read_timeout, write_timeout=write_timeout)
+        self._conn = serial.serial_for_url(
+            port,
+            baudrate=baudrate,
+            timeout=read_timeout,
+            write_timeout=write_timeout,
+            rtscts=flow_control is FlowControl.RTS_CTS,
+            dsrdtr=flow_control is FlowControl.DSR_DTR,
+        )
         register(self.close)
 
         # Printer settings
@@ -138,6 +196,10 @@ class ThermalPrinter:
         # Factory settings
         self.reset()
 
+        # Let the printer raise its BUSY line (RTS) when it cannot receive data
+        if flow_control is not FlowControl.NONE:
+            self.send_command(Command.GS, 97, 0b00100000)
+
     def __enter__(self) -> ThermalPrinter:  # noqa: PYI034
         """`with ThermalPrinter() as printer:`."""
         return self
@@ -151,7 +213,7 @@ class ThermalPrinter:
         self.close()
 
     def close(self) -> None:
-        """Persist statistics, *if desired*, and close the serial port."""
+        """Persist statistics, *if desired*, wait for the printer to be done, and close the serial port."""
         if self._use_stats and (self.lines or self.feeds):
             from thermalprinter.tools import stats_save
 
@@ -159,6 +221,9 @@ class ThermalPrinter:
             self.__feeds = 0
             self.__lines = 0
 
+        self._tx_flush()
+        if self._conn.is_open:
+            self._wait_idle()
         self._conn.close()
 
     def __repr__(self) -> str:
@@ -185,6 +250,7 @@ class ThermalPrinter:
         return f"{type(self).__name__}<{conn}[{', '.join(sorted(states))}]"
 
     def read(self, size: int = 1) -> bytes:
+        self._tx_flush()
         res = self._conn.read(size=size)
         log.debug(" <<< READ %r", res)
         return res
@@ -192,7 +258,133 @@ class ThermalPrinter:
     def write(self, data: ReadableBuffer, *, should_log: bool = True) -> int | None:
         if should_log:
             log.debug(" >>> WRITE %r", data)
-        return self._conn.write(data)
+
+        if self._tx_buffer is None:
+            return self._conn_write(data)
+
+        size = len(data)  # type: ignore[arg-type]
+        if len(self._tx_buffer) + size > self._tx_chunk_size:
+            self._tx_flush()
+        self._tx_buffer += data
+        return size
+
+    def _conn_write(self, data: ReadableBuffer) -> int | None:
+        """Write to the serial port, and account for the write in metrics."""
+        self._rx_reserve(len(data))  # type: ignore[arg-type]
+        metrics = self._metrics
+        start = monotonic()
+        written = self._conn.write(data)
+        metrics.write_seconds += monotonic() - start
+        metrics.writes += 1
+        metrics.bytes_written += len(data)  # type: ignore[arg-type]
+        return written
+
+    def _pace(self, seconds: float) -> None:
+        """Account for the time the printer needs to process data sent, without waiting for it.
+
+        The printer is busy until a deadline, pushed by ``seconds``. The host only waits when the printer receive
+        buffer would overflow (see :func:`_rx_reserve()`), or when it has to be idle (see :func:`_wait_idle()`),
+        so that preparing the next data overlaps with printing. The delay is postponed when the transmit buffer
+        is enabled, and ignored with hardware flow control: the printer tells when it is busy.
+        """
+        if self._flow_control is not FlowControl.NONE:
+            return
+        if self._tx_buffer is None:
+            self._busy(seconds)
+        else:
+            self._tx_delay += seconds
+
+    def _busy(self, seconds: float) -> None:
+        """Push the busy deadline by ``seconds``, from now when the printer is already idle."""
+        start = self._clock()
+        if self._pacing is Pacing.TRANSMIT_QUEUE:
+            # The printer processes data once transmitted
+            start += self._conn.out_waiting * self._link_byte_time
+        self._busy_until = max(start, self._busy_until) + seconds
+
+        # Data sent since the previous call is processed by then
+        if self._rx_unpaced:
+            self._rx_pending[-1][0] = self._busy_until
+            self._rx_unpaced = False
+
+    def _rx_reserve(self, size: int) -> None:
+        """Wait for room for ``size`` bytes in the printer receive buffer (see :const:`constants.MAX_BUFFER_SIZE`).
+
+        Processed data is only forgotten when room is needed, and data sent between two :func:`_busy()` calls
+        is accounted as a whole, so that the common case stays cheap.
+        """
+        pending = self._rx_pending
+        if self._rx_level + size > MAX_BUFFER_SIZE:
+            now = self._clock()
+            until = now
+            while pending and (pending[0][0] <= now or self._rx_level + size > MAX_BUFFER_SIZE):
+                until = max(until, pending[0][0])
+                self._rx_level -= int(pending.popleft()[1])
+            self._rx_unpaced = self._rx_unpaced and bool(pending)
+            if until > now:
+                log.debug("Printer receive buffer full, waiting %.3f sec", until - now)
+                self._wait(until - now)
+
+        if self._rx_unpaced:
+            pending[-1][1] += size
+        else:
+            pending.append([self._busy_until, size])
+            self._rx_unpaced = True
+        self._rx_level += size
+
+    def _wait_idle(self) -> None:
+        """Wait for the printer to process all data sent."""
+        if self._pacing is Pacing.TRANSMIT_QUEUE:
+            self._tx_drain()
+        if (delay := self._busy_until - self._clock()) > 0:
+            self._wait(delay)
+        self._rx_pending.clear()
+        self._rx_level = 0
+        self._rx_unpaced = False
+
+    def _wait(self, seconds: float) -> None:
+        """Wait for the printer to process data. This is the only place where time is actually spent sleeping."""
+        self._metrics.sleep_seconds += seconds
+        sleep(seconds)
+
+    def _tx_drain(self) -> None:
+        """Wait for the operating system transmit queue to be empty, like ``tcdrain()``."""
+        start = monotonic()
+        self._conn.flush()
+        self._metrics.write_seconds += monotonic() - start
+
+    def _clock(self) -> float:
+        """Return the current time, in seconds, used to measure the time already elapsed while pacing."""
+        return monotonic()
+
+    def _tx_flush(self) -> None:
+        """Send the transmit buffer content in one write, and apply the pacing delay of the whole batch."""
+        if not self._tx_buffer:
+            return
+
+        data, delay = bytes(self._tx_buffer), self._tx_delay
+        self._tx_buffer.clear()
+        self._tx_delay = 0.0
+
+        log.debug(" >>> WRITE %s bytes of buffered data", f"{len(data):,}")
+        self._conn_write(data)
+        self._busy(delay)
+
+    def _write_raster(self, data: memoryview, row_bytes: int, scale: ImageScale = ImageScale.NORMAL) -> float:
+        """Send raster data in as few writes as possible, made of whole rows, and pace on printed rows.
+
+        The pacing delay of the last chunk is not applied, but returned to the caller.
+        """
+        _, _, y_factor = scale.value
+        step = max(1, self._tx_chunk_size // row_bytes) * row_bytes
+        delay = 0.0
+        self._metrics.raster_bytes += len(data)
+        for offset in range(0, len(data), step):
+            self._pace(delay)
+            chunk = data[offset : offset + step]
+            self.write(chunk, should_log=False)
+            delay = len(chunk) // row_bytes * y_factor / self._line_spacing * self._dot_print_time
+        return delay
 
     # Protect some attributes to being modified outside this class.
 
@@ -221,6 +413,16 @@ class ThermalPrinter:
         """Number of printed line feeds."""
         return self.__feeds
 
+    @property
+    def metrics(self) -> Metrics:
+        """Runtime metrics: bytes, and commands, sent, time spent writing, and sleeping, and job latencies.
+
+        See :class:`metrics.Metrics`.
+
+        .. versionadded:: 2.1.1
+        """
+        return self._metrics
+
     @property
     def max_column(self) -> int:
         """Number of printable characters on one line."""
@@ -228,6 +430,34 @@ class ThermalPrinter:
 
     # Module's methods
 
+    @contextmanager
+    def buffered(self) -> Generator[ThermalPrinter]:
+        """Collect commands, and text, into one transmit buffer, and send it in as few writes as possible.
+
+        Pacing delays are summed, and applied once per batch instead of after every command.
+        The buffer is sent when leaving the context manager, before reading from the printer, or when it grows
+        bigger than the printer receive buffer (:const:`constants.MAX_BUFFER_SIZE`), or than what can be
+        transmitted before the serial write timeout.
+
+        >>> with printer.buffered():
+        ...     printer.out("Bold", bold=True)
+        ...     printer.out("Inverse", inverse=True)
+
+        Nested calls are allowed, only the outermost one sends the data.
+
+        .. versionadded:: 2.1.1
+        """
+        if self._tx_buffer is not None:
+            yield self
+            return
+
+        self._tx_buffer = bytearray()
+        try:
+            yield self
+        finally:
+            self._tx_flush()
+            self._tx_buffer = None
+
     def out(self, data: Any, line_feed: bool = True, **kwargs: Any) -> None:
         """Send one line to the printer.
 
@@ -306,7 +536,7 @@ class ThermalPrinter:
         self.__lines += written_lines_count
 
         if line_feed:
-            sleep(written_lines_count * self._dot_feed_time * self._char_height)
+            self._pace(written_lines_count * self._dot_feed_time * self._char_height)
 
         # Restore default styles
         for style in kwargs:
@@ -319,17 +549,19 @@ class ThermalPrinter:
         :param Command command: The command to send to the printer.
         :param list[int] args: Eventual command arguments.
         """
-        data = []
-        if command is not Command.NONE:
-            log.debug("Command: %s %s", command.name, ", ".join(str(arg) for arg in args))
-            data.append(bytes([command.value]))
-        else:
-            log.debug("Command: %s", ", ".join(str(arg) for arg in args))
-
-        data.extend(bytes([arg]) for arg in args)
-        self.write(b"".join(data))
+        prefixed = command is not Command.NONE
+        if log.isEnabledFor(DEBUG):
+            arguments = ", ".join(str(arg) for arg in args)
+            if prefixed:
+                log.debug("Command: %s %s", command.name, arguments)
+            else:
+                log.debug("Command: %s", arguments)
+        data = bytes([command.value, *args]) if prefixed else bytes(args)
 
-        sleep((1 + len(args)) * self._byte_time)
+        self._metrics.commands[data[:2] if prefixed else data[:1]] += 1
+        self.write(data)
+        if self._pacing is Pacing.TIMINGS:
+            self._pace((1 + len(args)) * self._byte_time)
 
     def to_bytes(self, data: Any) -> bytes:
         """Convert data before sending to the printer.
@@ -443,7 +675,8 @@ class ThermalPrinter:
 
         self.send_command(Command.GS, 107, barcode_type.value[0], len(data), *list(map(ord, data)))
 
-        sleep((self._barcode_height / self._line_spacing) * self._dot_print_time)
+        self._pace((self._barcode_height / self._line_spacing) * self._dot_print_time)
+        self._metrics.barcodes += 1
         self.__lines += int(self._barcode_height / self._line_spacing) + 1
 
     def barcode_height(self, height: int = Defaults.BARCODE_HEIGHT.value) -> None:
@@ -556,7 +789,7 @@ class ThermalPrinter:
             self._codepage = codepage
             value, _ = codepage.value
             self.send_command(Command.ESC, 116, value)
-            sleep(self._command_timeout)
+            self._pace(self._command_timeout)
 
     def demo(self) -> None:
         """Show time!
@@ -649,7 +882,7 @@ class ThermalPrinter:
             raise ThermalPrinterValueError(msg)
 
         self.send_command(Command.ESC, 100, number)
-        sleep(number * self._dot_feed_time * self._char_height)
+        self._pace(number * self._dot_feed_time * self._char_height)
         self.__feeds += number
 
     def flush(self, clear: bool = False) -> None:
@@ -657,9 +890,14 @@ class ThermalPrinter:
 
         :param bool clear: Set to ``True`` to also clear the input buffer.
         """
+        if self._tx_buffer is not None:
+            self._tx_buffer.clear()
+            self._tx_delay = 0.0
+
         self.send_command(Command.ESC, 64)
+        self._tx_flush()
         self._conn.reset_output_buffer()
-        sleep(self._command_timeout)
+        self._wait(self._command_timeout)
         if clear:
             self._conn.reset_input_buffer()
 
@@ -674,14 +912,32 @@ class ThermalPrinter:
             self._font_b = state
             self.send_command(Command.ESC, 33, int(state))
 
-    def image(self, image: Any) -> None:
+    def image(  # noqa: PLR0913
+        self,
+        image: Any,
+        *,
+        band_height: int = MAX_IMAGE_HEIGHT,
+        crop: bool = False,
+        dithering: Dithering = Dithering.NONE,
+        scale: ImageScale | None = ImageScale.NORMAL,
+        skip_blank_rows: bool = True,
+        width: int | None = None,
+    ) -> None:
         """Picture printing.
 
         Requires the Python Imaging Library (Pillow).
         The image will be resized to 384 pixels width (:const:`constants.MAX_IMAGE_WIDTH`)
         if necessary, and converted to 1-bit without diffusion dithering.
 
-        :param str | pathlib.Path | PIL.Image image: The file, or PIL Image object, to print.
+        :param str | pathlib.Path | PIL.Image | numpy.ndarray | bytes | raster.Raster image: The file, PIL Image object,
+            2-D NumPy array, packed rows, or prepared raster (see :func:`prepare_images()`), to print.
+        :param int band_height: Print the image by bands of that many rows (min=1, max=4095).
+        :param bool crop: Only send the part of each row containing black dots, and move the print position instead.
+        :param Dithering dithering: The dithering mode used to convert the image to 1-bit (see :func:`image_convert()`).
+        :param ImageScale | None scale: Let the printer upscale the image, ``None`` to pick the best mode automatically.
+        :param bool skip_blank_rows: Replace runs of blank rows with paper feeds instead of sending their pixels.
+        :param int | None width: The width of packed rows, in pixels, when ``image`` is a bytes-like object.
+        :exception ThermalPrinterValueError: On incorrect ``band_height``'s type, or value.
 
         Examples:
 
@@ -702,7 +958,92 @@ class ThermalPrinter:
 
         .. important::
             It works better with white background instead of transparence.
+
+        Tall images are streamed by bands, each one with its own raster bitmap command.
+        A band is packed while the printer is busy printing the previous one, so that only one band of packed
+        raster data is in memory at a time, and the first dots are printed sooner:
+
+        >>> printer.image("very-long-chart.png", band_height=256)
+
+        .. note::
+            The image itself is still decoded, converted, and resized, as a whole by PIL. To print very tall
+            images with a constant memory usage, save them as PBM files, and use :func:`image_pbm()` instead.
+
+        Runs of fully white rows are not sent as pixels, but replaced by a feed of the same number of dots.
+
+        Small logos on a large white canvas can be cropped to their black dots to reduce the amount of data to send,
+        the image will be printed at the same position:
+
+        >>> printer.image("logo.png", crop=True)
+
+        The printer can upscale images by itself, so that less data is sent. Images made of 2x1, 1x2,
+        or 2x2, blocks of pixels (like pixel-art icons) are shrunk, and then upscaled back by the printer,
+        when passing ``scale=None``. The printed image is the same, for up to 4 times less data:
+
+        >>> printer.image("icon.png", scale=None)
+
+        Or force a mode, the image being printed 2 times wider than its actual width, for instance:
+
+        >>> printer.image("icon.png", scale=ImageScale.DOUBLE_WIDTH)
+
+        When the printer was created with an ``image_cache``, converted images are reused, and the Python
+        Imaging Library is not even imported when printing again the same unchanged file.
+
+        NumPy arrays are packed directly, without going through PIL, unless they are too wide.
+        Boolean arrays are made of dots (``True`` for black), other arrays of grayscale intensities:
+
+        >>> printer.image(numpy.zeros((100, 384), dtype=bool))
+
+        Rows already packed (see :func:`image_pbm()`) are sent as-is:
+
+        >>> printer.image(rows, width=384)
+
+        .. versionadded:: 2.1.1
+            The ``band_height``, ``crop``, ``dithering``, ``scale``, ``skip_blank_rows``, and ``width``,
+            keyword-arguments.
+
+        .. versionchanged:: 2.1.1
+            ``image`` can also be a :obj:`numpy.ndarray`, a bytes-like object, or a :class:`raster.Raster`.
         """
+        if not isinstance(band_height, int) or not 1 <= band_height <= MAX_IMAGE_HEIGHT:
+            msg = f"band_height should be between 1 and {MAX_IMAGE_HEIGHT} (default: {MAX_IMAGE_HEIGHT})."
+            raise ThermalPrinterValueError(msg)
+
+        if isinstance(image, raster.Raster):
+            self._print_raster(image, band_height=band_height, crop=crop, skip_blank_rows=skip_blank_rows)
+            return
+
+        if width is not None or isinstance(image, (bytes, bytearray, memoryview)):
+            self.image_pbm(
+                image,
+                width=width,
+                band_height=band_height,
+                crop=crop,
+                scale=scale or ImageScale.NORMAL,
+                skip_blank_rows=skip_blank_rows,
+            )
+            return
+
+        if getattr(image, "ndim", None) is not None:
+            dots = raster.threshold(image, dithering=dithering)
+            if (bitmap := raster.pack_array(dots, scale)) is not None:
+                log.info("Array image, %dx%d pixels", dots.shape[1], dots.shape[0])
+                self._print_raster(bitmap, band_height=band_height, crop=crop, skip_blank_rows=skip_blank_rows)
+                return
+
+            # Too wide, PIL will resize it, and dither it again after that
+            from PIL import Image
+
+            pixels = image if dithering is not Dithering.NONE and image.dtype.kind == "u" else ~dots
+            image = Image.fromarray(pixels)
+
+        cache = self._image_cache
+        key = cache.key(image, dithering=dithering, scale=scale) if cache is not None else ""
+        if cache is not None and key and (bitmap := cache.get(key)) is not None:
+            log.info("Image %r, %d rows, from the cache", str(image), bitmap.height)
+            self._print_raster(bitmap, band_height=band_height, crop=crop, skip_blank_rows=skip_blank_rows)
+            return
+
         if isinstance(image, (str, Path)):
             try:
                 from PIL import Image
@@ -712,63 +1053,172 @@ class ThermalPrinter:
             else:
                 image = Image.open(image)
 
-        log.info("Image %r, %dx%d pixels, mode=%r", image.filename, *image.size, image.mode)
-        image = self.image_convert(image)
-        image = self.image_resize(image)
-        bitmap = self.image_chunks(image)
+        log.info("Image %r, %dx%d pixels, mode=%r", getattr(image, "filename", ""), *image.size, image.mode)
+        image, scale = self._image_fit(image, dithering, scale)
 
         width, height = image.size
-        row_bytes = int((width + 7) / 8)  # Round up to next byte boundary
-
-        self.send_command(
-            Command.GS,
-            118,
-            48,
-            0,
-            int(row_bytes % 256),
-            int(row_bytes / 256),
-            int(height % 256),
-            int(height / 256),
+        bands = self._image_bands(image, band_height)
+        if cache is not None and key:
+            bands = self._cache_bands(bands, cache, key, raster.row_bytes(width), scale)
+
+        self._print_bands(
+            bands,
+            raster.row_bytes(width),
+            crop=crop,
+            scale=scale,
+            skip_blank_rows=skip_blank_rows,
         )
+        self.__lines += height * scale.value[2] // self._line_spacing + 1
+
+    @classmethod
+    def _image_fit(cls, image: Any, dithering: Dithering, scale: ImageScale | None) -> tuple[Any, ImageScale]:
+        """Convert, and resize, the ``image`` to be printed using the ``scale`` mode, ``None`` to pick the best one."""
+        if dithering is not Dithering.NONE:
+            # Dither patterns would not survive the resizing
+            image = cls.image_resize(image, max_width=MAX_IMAGE_WIDTH // (scale or ImageScale.NORMAL).value[1])
+        image = cls.image_convert(image, dithering=dithering)
+        if scale is None:
+            return raster.downscale(cls.image_resize(image))
+
+        _, x_factor, _ = scale.value
+        return cls.image_resize(image, max_width=MAX_IMAGE_WIDTH // x_factor), scale
+
+    def _print_raster(
+        self,
+        bitmap: raster.Raster,
+        *,
+        band_height: int = MAX_IMAGE_HEIGHT,
+        crop: bool = False,
+        skip_blank_rows: bool = True,
+    ) -> None:
+        """Send already packed raster data."""
+        self._print_bands(
+            bitmap.bands(band_height),
+            bitmap.row_bytes,
+            crop=crop,
+            scale=bitmap.scale,
+            skip_blank_rows=skip_blank_rows,
+        )
+        self.__lines += bitmap.height * bitmap.scale.value[2] // self._line_spacing + 1
+
+    def _print_bands(
+        self,
+        bands: Iterable[ReadableBuffer],
+        row_bytes: int,
+        *,
+        crop: bool = False,
+        scale: ImageScale = ImageScale.NORMAL,
+        skip_blank_rows: bool = True,
+    ) -> None:
+        """Send packed raster bands. The next band is prepared while the printer is busy with the current one."""
+        self._metrics.images += 1
+        for bitmap in bands:
+            view = memoryview(bitmap).cast("B")
+            rows = len(view) // row_bytes
+            for start, stop, blank in raster.runs(view, row_bytes) if skip_blank_rows else [(0, rows, False)]:
+                if blank:
+                    delay = self._feed_dots((stop - start) * scale.value[2])
+                else:
+                    delay = self._write_image(view[start * row_bytes : stop * row_bytes], row_bytes, crop, scale)
+                self._pace(delay)
+
+    def _write_image(self, bitmap: memoryview, row_bytes: int, crop: bool, scale: ImageScale) -> float:
+        """Send one raster bitmap command, and return the pacing delay still to apply."""
+        rows = len(bitmap) // row_bytes
+
+        if crop:
+            start, stop = raster.ink_columns(bitmap, row_bytes)
+            if stop - start < row_bytes:
+                return self._write_image_cropped(bitmap, row_bytes, start, stop, scale)
+
+        mode = scale.value[0]
+        self.send_command(Command.GS, 118, 48, mode, row_bytes % 256, row_bytes // 256, rows % 256, rows // 256)
         log.debug(" >>> WRITE %s bytes of image data", f"{len(bitmap):,}")
-        for bit in bitmap:
-            self.write(struct.pack("B", bit), should_log=False)
+        return self._write_raster(bitmap, row_bytes, scale)
+
+    def _write_image_cropped(
+        self,
+        bitmap: memoryview,
+        row_bytes: int,
+        start: int,
+        stop: int,
+        scale: ImageScale,
+    ) -> float:
+        """Send byte columns from ``start`` to ``stop`` of the raster, left-justified at their original position."""
+        _, x_factor, _ = scale.value
+        width = row_bytes * 8 * x_factor
+        # The printer adds the ESC B margin, in 12 dots wide characters, to the GS L left blank
+        area = max(0, MAX_IMAGE_WIDTH - self._left_margin * 12 - self._left_blank)
+        offset = {Justify.LEFT: 0, Justify.CENTER: (area - width) // 2, Justify.RIGHT: area - width}[self._justify]
+        left_blank = self._left_blank + max(0, offset) + start * 8 * x_factor
+        log.debug("Image cropped to columns %d-%d, left blank: %d dots", start * 8, stop * 8, left_blank)
+
+        justify = self._justify
+        self.justify(Justify.LEFT)
+        self.send_command(Command.GS, 76, left_blank % 256, left_blank // 256)
+        trimmed = memoryview(raster.trim(bitmap, row_bytes, start, stop))
+        delay = self._write_image(trimmed, stop - start, False, scale)
+        self.send_command(Command.GS, 76, self._left_blank, 0)
+        self.justify(justify)
+        return delay
+
+    def _feed_dots(self, dots: int) -> float:
+        """Feed the paper by ``dots`` dots, and return the pacing delay still to apply."""
+        for offset in range(0, dots, 255):
+            self.send_command(Command.ESC, 74, min(255, dots - offset))
+        return dots * self._dot_feed_time
+
+    def _image_bands(self, image: Any, band_height: int) -> Generator[bytearray]:
+        """Lazily pack the ``image`` by bands of ``band_height`` rows."""
+        width, height = image.size
+        if height <= band_height:
+            yield self.image_chunks(image)
+            return
+
+        for top in range(0, height, band_height):
+            yield self.image_chunks(image.crop((0, top, width, min(top + band_height, height))))
 
-        sleep(height / self._line_spacing * self._dot_print_time)
-        self.__lines += height // self._line_spacing + 1
+    @staticmethod
+    def _cache_bands(
+        bands: Iterable[bytearray], cache: ImageCache, key: str, row_bytes: int, scale: ImageScale
+    ) -> Generator[bytearray]:
+        """Yield ``bands`` as they are packed, and store them into the ``cache`` once all sent, if small enough."""
+        data: bytearray | None = bytearray()
+        for band in bands:
+            if data is not None:
+                data += band
+                if len(data) > cache.max_size:
+                    # Too large to be cached, do not keep the whole image in memory
+                    data = None
+            yield band
+
+        if data is not None:
+            cache.set(key, raster.Raster(bytes(data), row_bytes, scale))
 
     def image_chunks(self, image: Any) -> bytearray:
-        """TODO Convert a given ``image`` to 1-bit without diffusion dithering, *if necessary*.
+        """Pack a given ``image`` into raster data, ready to be sent to the printer.
 
         :param PIL.Image image: The PIL Image object to handle.
         :rtype: bytearray
-        :return: The converted image object, if converted, else the original ``image``.
+        :return: The raster data: one bit per pixel, rows padded to the next byte boundary.
 
         .. hint::
             Usually you do not need to call this method manually. It is used automatically
             by the :func:`image()` method.
 
         .. versionadded:: 1.0.0
-        """
-        width, height = image.size
-        chunks = math.ceil(width / 8)
-        bitmap = bytearray()
-
-        for y in range(height):
-            for chunk in range(chunks):
-                start = chunk * 8
-                byte = 0
-                for shift, x in enumerate(range(start, start + 8)):
-                    pixel = image.getpixel((x, y)) if x < image.width else 1
-                    byte |= int(not pixel) << (7 - shift)
-                bitmap.append(byte)
 
-        return bitmap
+        .. versionchanged:: 2.1.1
+            The packing is done on the whole image buffer, using NumPy when available.
+        """
+        return raster.pack(self.image_convert(image))
 
-    def image_convert(self, image: Any) -> Any:
-        """Convert a given ``image`` to 1-bit without diffusion dithering, *if necessary*.
+    @staticmethod
+    def image_convert(image: Any, dithering: Dithering = Dithering.NONE) -> Any:
+        """Convert a given ``image`` to 1-bit, without diffusion dithering by default, *if necessary*.
 
         :param PIL.Image image: The PIL Image object to convert.
+        :param Dithering dithering: The dithering mode.
         :rtype: :py:obj:`PIL.Image`
         :return: The converted image object, if converted, else the original ``image``.
 
@@ -776,40 +1226,151 @@ class ThermalPrinter:
             Usually you do not need to call this method manually. It is used automatically
             by the :func:`image()` method.
 
+        Photos are better printed using error diffusion:
+
+        >>> printer.image("photo.jpg", dithering=Dithering.FLOYD_STEINBERG)
+
         .. versionadded:: 1.0.0
+
+        .. versionadded:: 2.1.1
+            The ``dithering`` keyword-argument.
+
+        .. versionchanged:: 2.1.1
+            It is now a static method.
         """
         if image.mode == "1":
             return image
 
-        from PIL.Image import Dither
+        from PIL import Image
 
         new_mode = "1"
         log.info("Image converted from %r to %r", image.mode, new_mode)
-        return image.convert(new_mode, dither=Dither.NONE)
+        if dithering in {Dithering.NONE, Dithering.FLOYD_STEINBERG}:
+            # Natively supported by PIL
+            native = Image.Dither.NONE if dithering is Dithering.NONE else Image.Dither.FLOYDSTEINBERG
+            return image.convert(new_mode, dither=native)
+
+        from thermalprinter.dithering import dither
+
+        gray = image.convert("L")
+        width, height = gray.size
+        pixels = dither(gray.tobytes(), width, height, dithering)
+        return Image.frombytes("L", gray.size, pixels).convert(new_mode, dither=Image.Dither.NONE)
+
+    def image_pbm(  # noqa: PLR0913
+        self,
+        source: str | Path | ReadableBuffer,
+        *,
+        width: int | None = None,
+        band_height: int = MAX_IMAGE_HEIGHT,
+        crop: bool = False,
+        scale: ImageScale = ImageScale.NORMAL,
+        skip_blank_rows: bool = True,
+    ) -> None:
+        """Print an image already packed into raster data, without the Python Imaging Library.
+
+        Binary PBM images (netpbm ``P4`` format) store rows of pixels exactly like the printer expects them:
+        one bit per pixel, MSB-first, rows padded to the next byte boundary, and 1 for black dots.
+        Files are memory-mapped, and rows are sent straight from the mapping, so that huge images
+        are printed with a constant memory usage.
+
+        :param str | pathlib.Path | bytes source: The PBM file, or a buffer containing either a PBM image,
+            or raw packed rows.
+        :param int | None width: The width of raw packed rows, in pixels. Required when ``source`` is not a PBM image.
+        :param int band_height: Print the image by bands of that many rows (min=1, max=4095).
+        :param bool crop: Only send the part of each row containing black dots, and move the print position instead.
+        :param ImageScale scale: Let the printer upscale the image.
+        :param bool skip_blank_rows: Replace runs of blank rows with paper feeds instead of sending their pixels.
+        :exception ThermalPrinterValueError: On incorrect argument's type, or value, or on invalid image.
+
+        Examples:
+
+        >>> printer.image_pbm("chart.pbm")
+
+        >>> printer.image_pbm(rows, width=384)
+
+        .. important::
+            The image is not resized, it must fit the paper width (:const:`constants.MAX_IMAGE_WIDTH`).
+            Padding bits at the end of rows must be 0.
+
+        .. versionadded:: 2.1.1
+        """
+        if not isinstance(band_height, int) or not 1 <= band_height <= MAX_IMAGE_HEIGHT:
+            msg = f"band_height should be between 1 and {MAX_IMAGE_HEIGHT} (default: {MAX_IMAGE_HEIGHT})."
+            raise ThermalPrinterValueError(msg)
+
+        if isinstance(source, (str, Path)):
+            with Path(source).open(mode="rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    self.image_pbm(
+                        memoryview(mapped),
+                        width=width,
+                        band_height=band_height,
+                        crop=crop,
+                        scale=scale,
+                        skip_blank_rows=skip_blank_rows,
+                    )
+                finally:
+                    # On error, the memory may still be referenced by the traceback, it will be unmapped once released
+                    with suppress(BufferError):
+                        mapped.close()
+            return
 
-    def image_resize(self, image: Any) -> Any:
+        view = memoryview(source).cast("B")
+        height, offset = 0, 0
+        if width is None:
+            width, height, offset = raster.pbm_header(view)
+
+        _, x_factor, _ = scale.value
+        if not 0 < width <= MAX_IMAGE_WIDTH // x_factor:
+            msg = f"width should be between 1 and {MAX_IMAGE_WIDTH // x_factor} (got: {width})."
+            raise ThermalPrinterValueError(msg)
+
+        row_bytes = raster.row_bytes(width)
+        if not offset:
+            # Raw packed rows
+            height = len(view) // row_bytes
+        if len(view) < offset + height * row_bytes:
+            msg = f"Truncated image: {height} rows of {row_bytes} bytes expected."
+            raise ThermalPrinterValueError(msg)
+
+        log.info("Packed image, %dx%d pixels", width, height)
+        bitmap = raster.Raster(view[offset : offset + height * row_bytes], row_bytes, scale)
+        self._print_raster(bitmap, band_height=band_height, crop=crop, skip_blank_rows=skip_blank_rows)
+
+    @staticmethod
+    def image_resize(image: Any, max_width: int = MAX_IMAGE_WIDTH) -> Any:
         """Resize a given ``image`` to fit into the maximum width of 384 pixels (:const:`constants.MAX_IMAGE_WIDTH`),
         *if necessary*.
         The size proportion will be respected.
 
         :param PIL.Image image: The PIL Image object to resize.
+        :param int max_width: The maximum width.
         :rtype: :py:obj:`PIL.Image`
-        :return: The resized image object, if resized, else the original ``image``.
+        :return: A resized copy of the ``image``, if resized, else the original ``image``.
 
         .. hint::
             Usually you do not need to call this method manually. It is used automatically
             by the :func:`image()` method.
 
         .. versionadded:: 1.0.0
+
+        .. versionadded:: 2.1.1
+            The ``max_width`` keyword-argument.
+
+        .. versionchanged:: 2.1.1
+            It is now a static method, and the original ``image`` is left untouched.
         """
         current_width, current_height = image.size
-        if current_width <= MAX_IMAGE_WIDTH:
+        if current_width <= max_width:
             return image
 
         from PIL.Image import Resampling
 
-        new_width = MAX_IMAGE_WIDTH
+        new_width = max_width
         new_height = int(new_width * current_height / current_width)
+        image = image.copy()
         image.thumbnail((new_width, new_height), Resampling.LANCZOS)
         log.info("Image resized from %dx%d to %dx%d", current_width, current_height, *image.size)
         return image
@@ -904,6 +1465,48 @@ class ThermalPrinter:
             self.__is_online = True
             self.send_command(Command.ESC, 61, 1)
 
+    def prepare_images(
+        self,
+        images: Iterable[Any],
+        *,
+        workers: int | None = None,
+        dithering: Dithering = Dithering.NONE,
+        scale: ImageScale | None = ImageScale.NORMAL,
+        ordered: bool = True,
+    ) -> Generator[raster.Raster]:
+        """Prepare many images at once, using all CPUs.
+
+        Images are converted, resized, and packed, in a pool of processes, while the printer is busy
+        printing already prepared ones. Raster data is handed back through shared memory, not pickled, and only
+        a few images are prepared ahead of the printer.
+
+        :param Iterable images: The files, or PIL Image objects, to prepare.
+        :param int | None workers: The number of processes, defaults to the number of CPUs.
+        :param Dithering dithering: The dithering mode used to convert images to 1-bit.
+        :param ImageScale | None scale: Let the printer upscale images, ``None`` to pick the best mode automatically.
+        :param bool ordered: Yield rasters in the order of ``images``, else as soon as they are ready.
+        :rtype: Generator[raster.Raster]
+        :return: The rasters, to be printed using :func:`image()`.
+
+        Example:
+
+        >>> for label in printer.prepare_images(Path("labels").glob("*.png"), workers=4):
+        ...     printer.image(label)
+        ...     printer.feed(2)
+
+        .. versionadded:: 2.1.1
+        """
+        from thermalprinter.batch import prepare_images
+
+        return prepare_images(
+            images,
+            workers=workers,
+            dithering=dithering,
+            scale=scale,
+            ordered=ordered,
+            printer_class=type(self),
+        )
+
     def print_char(self, char: str) -> None:
         """Test one character with all supported code pages.
 
@@ -919,6 +1522,176 @@ class ThermalPrinter:
         for codepage in list(CodePage):
             self.out(f"{codepage.name}: {char}")
 
+    def print_cached(self, key: str, build: Callable[[ThermalPrinter], Any], *, copies: int = 1) -> Job:
+        """Print the content produced by ``build``, compiled once, and then reused from the job cache.
+
+        The first time, ``build`` is called with a :class:`job.JobCompiler` to capture the bytes its calls produce.
+        Next times, the compiled bytes are sent right away: no more text encoding, styles toggling, nor image packing.
+
+        :param str key: The job key, identifying the content produced by ``build``.
+        :param Callable build: The function calling printer methods, like :func:`out()`, :func:`image()`, or :func:`barcode()`.
+        :param int copies: The number of copies to print.
+        :rtype: Job
+        :return: The compiled job.
+
+        >>> def receipt_footer(printer):
+        ...     printer.barcode("012345678901", BarCode.EAN13)
+        ...     printer.out("Thank you!", justify=Justify.CENTER)
+        ...     printer.feed(2)
+
+        >>> printer.print_cached("footer", receipt_footer)
+
+        .. note::
+            The printer is expected to be in its default state (see :func:`reset()`) when printing a compiled job,
+            as ``build`` is called on a fresh printer.
+
+        .. versionadded:: 2.1.1
+        """  # noqa: E501
+        if self._job_cache is None:
+            from thermalprinter.job import JobCache
+
+            self._job_cache = JobCache()
+
+        job = self._job_cache.compile(
+            key,
+            build,
+            byte_time=self._byte_time,
+            command_timeout=self._command_timeout,
+            dot_feed_time=self._dot_feed_time,
+            dot_print_time=self._dot_print_time,
+            image_cache=self._image_cache,
+        )
+        self.print_job(job, copies=copies)
+        return job
+
+    def print_raw_file(self, file: str | os.PathLike[str], *, duration: float | None = None) -> None:
+        """Send a file content as-is, like ESC/POS commands captured previously.
+
+        The file is sent by chunks fitting in the printer buffer, straight from the kernel to the serial port using
+        :func:`os.sendfile()` when supported, else using buffered reads. The pacing delay is applied between chunks.
+
+        :param str | os.PathLike file: The file path.
+        :param float | None duration: The estimated print duration, in seconds, spread across chunks.
+            Defaults to the time to issue the file content to the printer (see ``byte_time``), or to nothing using
+            the transmit queue pacing (see :const:`constants.Pacing`).
+
+        >>> printer.print_raw_file("receipt.bin")
+
+        .. note::
+            Printed lines, and feeds, are not counted.
+
+        .. versionadded:: 2.1.1
+        """
+        with self._metrics.job("print_raw_file"), Path(file).open(mode="rb") as stream:
+            size = os.fstat(stream.fileno()).st_size
+            if duration is None:
+                duration = size * self._byte_time if self._pacing is Pacing.TIMINGS else 0.0
+            log.info("Raw file of %s bytes, estimated duration: %.3f sec", f"{size:,}", duration)
+
+            fd = self._sendfile_fd()
+            buffer = memoryview(bytearray(self._tx_chunk_size))
+            offset = 0
+            while offset < size:
+                count = min(self._tx_chunk_size, size - offset)
+                sent = 0
+                if fd is not None:
+                    try:
+                        sent = self._sendfile(fd, stream.fileno(), offset, count)
+                    except OSError as exc:
+                        if offset or exc.errno not in {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP}:
+                            raise
+                        log.debug("sendfile() not supported (%s), using buffered reads", exc)
+                        fd = None
+                if fd is None:
+                    stream.seek(offset)
+                    sent = stream.readinto(buffer[:count])
+                    self.write(buffer[:sent], should_log=False)
+                if not sent:
+                    # The file was truncated in the meantime
+                    break
+
+                offset += sent
+                self._pace(duration * sent / size)
+
+    def _sendfile_fd(self) -> int | None:
+        """Return the serial port file descriptor, when :func:`os.sendfile()` can be used."""
+        if not hasattr(os, "sendfile"):
+            return None
+        try:
+            fd = self._conn.fileno()
+        except (AttributeError, OSError):
+            # URL handlers, like loop://, have no file descriptor
+            return None
+
+        # Data still in the transmit buffer goes first
+        self._tx_flush()
+        return fd
+
+    def _sendfile(self, fd: int, file: int, offset: int, count: int) -> int:
+        """Send ``count`` bytes of the ``file`` descriptor, from ``offset``, to the ``fd`` descriptor.
+
+        The serial port being non-blocking, wait for it to be writable, like :meth:`serial.Serial.write()` does.
+        """
+        self._rx_reserve(count)
+        sent, start = 0, monotonic()
+        while sent < count:
+            try:
+                written = os.sendfile(fd, file, offset + sent, count - sent)
+            except BlockingIOError:
+                _, ready, _ = select.select([], [fd], [], self._conn.write_timeout)
+                if not ready:
+                    msg = "Write timeout"
+                    raise serial.SerialTimeoutException(msg) from None
+                continue
+            if not written:
+                break
+            sent += written
+            self._metrics.writes += 1
+
+        self._metrics.bytes_written += sent
+        self._metrics.write_seconds += monotonic() - start
+        return sent
+
+    def print_job(self, job: Job, *, copies: int = 1) -> None:
+        """Send a compiled job (see :class:`job.JobCompiler`).
+
+        Data is sent segment by segment, each one followed by its pacing delay. Segments larger than the printer
+        buffer are sent by chunks, the segment delay being spread across chunks.
+
+        :param Job job: The job to print.
+        :param int copies: The number of copies to print, the same bytes being sent again for each copy.
+
+        .. versionadded:: 2.1.1
+        """
+        if copies < 1:
+            msg = "copies should be greater than 0."
+            raise ThermalPrinterValueError(msg)
+
+        from thermalprinter.job import Segment, SegmentKind
+
+        data = memoryview(job.data)
+        segments = job.segments or (Segment(SegmentKind.TEXT, len(data), job.duration),)
+        log.info("Job of %s bytes (x%d), estimated duration: %.3f sec", f"{len(data):,}", copies, job.duration)
+        with self._metrics.job("print_job"):
+            self.codepage(job.codepage)
+            for _ in range(copies):
+                offset = 0
+                for segment in segments:
+                    if not segment.size:
+                        self._pace(segment.delay)
+                        continue
+
+                    # Split segments larger than the printer buffer, and spread their delays
+                    end = offset + segment.size
+                    for start in range(offset, end, self._tx_chunk_size):
+                        chunk = data[start : min(end, start + self._tx_chunk_size)]
+                        self.write(chunk, should_log=False)
+                        self._pace(segment.delay * len(chunk) / segment.size)
+                    offset = end
+
+        self.__lines += job.lines * copies
+        self.__feeds += job.feeds * copies
+
     def reset(self) -> None:
         """Reset the printer to factory defaults."""
         self.flush(clear=True)
@@ -1031,7 +1804,9 @@ class ThermalPrinter:
            The ``movement`` key as it would always be ``False``.
         """
         self.send_command(Command.ESC, 118, 0)
-        sleep(self._command_timeout)
+        self._tx_flush()
+        self._wait_idle()
+        self._wait(self._command_timeout)
 
         stat = -1
         if self._conn.in_waiting:
@@ -1058,7 +1833,7 @@ class ThermalPrinter:
         self.__lines += lines
         self.__feeds += 1
 
-        sleep(self._dot_print_time * 24 * lines + self._dot_feed_time * (8 * lines + 32))
+        self._pace(self._dot_print_time * 24 * lines + self._dot_feed_time * (8 * lines + 32))
 
     def underline(self, weight: Underline = Underline.OFF) -> None:
         """Set the underline mode.
@@ -1087,5 +1862,6 @@ class ThermalPrinter:
         if self.is_sleeping:
             self.__is_sleeping = False
             self.send_command(Command.NONE, 255)
-            sleep(self._command_timeout)  # Sleep 50ms as in the documentation
+            self._tx_flush()
+            self._wait(self._command_timeout)  # Sleep 50ms as in the documentation
             self.sleep(0)  # Sleep off - important!
@@ -0,0 +1,5 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+
+pySerial URL handlers, registered when importing :mod:`thermalprinter`.
+"""
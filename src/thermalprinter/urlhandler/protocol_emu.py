@@ -0,0 +1,70 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+from serial import PortNotOpenError, SerialException
+
+from thermalprinter.emulator import Emulator
+from thermalprinter.urlhandler import protocol_record
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+
+class Serial(protocol_record.Serial):
+    """Serial port connected to a printer emulator (see :class:`emulator.Emulator`).
+
+    URL: ``emu://[?output=FILE]``, the printed paper being saved to the ``FILE`` image when the port is closed.
+    """
+
+    scheme = "emu"
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        self.emulator = self._emulator()
+        self.output: str | None = None
+        super().__init__(*args, **kwargs)
+
+    def close(self) -> None:
+        if self.is_open and self.output:
+            self.emulator.save(self.output)
+        super().close()
+
+    def from_url(self, url: str) -> None:
+        super().from_url(url)
+        for option, values in parse_qs(urlsplit(url).query).items():
+            self._option(option, values[0])
+
+    def _emulator(self) -> Emulator:
+        return Emulator()
+
+    def _option(self, name: str, value: str) -> None:
+        """Apply one URL option."""
+        if name != "output":
+            msg = f"Unknown option: {name!r}."
+            raise SerialException(msg)
+        self.output = value
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.emulator.output)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.is_open:
+            raise PortNotOpenError
+        data = bytes(self.emulator.output[:size])
+        del self.emulator.output[:size]
+        return data
+
+    def write(self, data: ReadableBuffer) -> int:
+        if not self.is_open:
+            raise PortNotOpenError
+        self.emulator.write(data)
+        return len(memoryview(data))
+
+    def reset_input_buffer(self) -> None:
+        self.emulator.output.clear()
@@ -0,0 +1,83 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from serial import PortNotOpenError, SerialBase, SerialException
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+
+class Serial(SerialBase):
+    """Serial port recording written data in memory, nothing is ever read back.
+
+    URL: ``record://``.
+    """
+
+    is_open: bool
+    scheme = "record"
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        self.data = bytearray()
+        super().__init__(*args, **kwargs)
+
+    def open(self) -> None:
+        if self.is_open:
+            msg = "Port is already open."
+            raise SerialException(msg)
+        if self._port is None:
+            msg = "Port must be configured before it can be used."
+            raise SerialException(msg)
+
+        self.from_url(self.port)
+        self.is_open = True
+
+    def close(self) -> None:
+        self.is_open = False
+
+    def from_url(self, url: str) -> None:
+        if urlsplit(url).scheme != self.scheme:
+            msg = f"Expected a string in the form '{self.scheme}://', not {url!r}."
+            raise SerialException(msg)
+
+    def _reconfigure_port(self) -> None:
+        """Settings are meaningless."""
+
+    def _update_break_state(self) -> None:
+        """Settings are meaningless."""
+
+    def _update_dtr_state(self) -> None:
+        """Settings are meaningless."""
+
+    def _update_rts_state(self) -> None:
+        """Settings are meaningless."""
+
+    @property
+    def in_waiting(self) -> int:
+        return 0
+
+    @property
+    def out_waiting(self) -> int:
+        return 0
+
+    def read(self, size: int = 1) -> bytes:  # noqa: ARG002
+        if not self.is_open:
+            raise PortNotOpenError
+        return b""
+
+    def write(self, data: ReadableBuffer) -> int:
+        if not self.is_open:
+            raise PortNotOpenError
+        self.data += data
+        return len(memoryview(data))
+
+    def reset_input_buffer(self) -> None:
+        """Nothing is ever received."""
+
+    def reset_output_buffer(self) -> None:
+        """Written data is recorded right away."""
@@ -0,0 +1,142 @@
+"""This is part of the Python's module to manage the DP-EH600 thermal printer.
+Source: https://github.com/BoboTiG/thermalprinter.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from time import monotonic, sleep
+from typing import TYPE_CHECKING
+
+from serial import PortNotOpenError, SerialException
+
+from thermalprinter.constants import MAX_BUFFER_SIZE
+from thermalprinter.emulator import Emulator
+from thermalprinter.urlhandler import protocol_emu
+
+if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
+
+#: Bits per byte: 11 (not 8) to accommodate idle, start, and stop, bits (like :const:`constants.Defaults.BYTE_TIME`).
+BITS_PER_BYTE = 11
+
+#: Size of the operating system transmit buffer, in bytes: writes block when it is full.
+OS_BUFFER_SIZE = 4096
+
+
+class Serial(protocol_emu.Serial):
+    """Serial port connected to a printer emulator, at the speed of a real link.
+
+    URL: ``throttle://[?buffer=BYTES][&busy=0|1][&output=FILE]``
+
+    - Bytes are transmitted at the port baud rate, each one taking :const:`BITS_PER_BYTE` bits.
+      Writes return once data fits in the operating system transmit buffer (:const:`OS_BUFFER_SIZE`),
+      and :meth:`flush()` waits for data to be transmitted, like ``tcdrain()``.
+    - The printer receive buffer holds ``buffer`` bytes (defaults to :const:`constants.MAX_BUFFER_SIZE`),
+      bytes received while it is full are counted in :attr:`overflow`, as the real printer would lose them.
+    - With ``busy=1`` (the default), the printer processes received data in the time modeled by the emulator
+      (printed, and fed, dot lines), data received meanwhile waiting in the receive buffer. With ``busy=0``,
+      the printer processes data instantly.
+    - With hardware flow control (``rtscts``, or ``dsrdtr``), transmission is held while the printer receive buffer
+      is full, like the printer BUSY line does.
+    """
+
+    scheme = "throttle"
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        self.buffer_size = MAX_BUFFER_SIZE
+        self.busy = True
+
+        #: Number of bytes transmitted.
+        self.transmitted = 0
+        #: Number of bytes received while the printer receive buffer was full.
+        self.overflow = 0
+        #: Maximum number of bytes waiting in the printer receive buffer.
+        self.peak = 0
+
+        self._line_free_at = 0.0
+        self._busy_until = 0.0
+        self._waiting: deque[tuple[float, int]] = deque()
+        super().__init__(*args, **kwargs)
+
+    def _emulator(self) -> Emulator:
+        # The transmission time is handled by the port
+        return Emulator(byte_time=0.0)
+
+    def _option(self, name: str, value: str) -> None:
+        try:
+            if name == "buffer":
+                self.buffer_size = int(value)
+            elif name == "busy":
+                self.busy = bool(int(value))
+            else:
+                super()._option(name, value)
+        except ValueError:
+            msg = f"Invalid value for the {name!r} option."
+            raise SerialException(msg) from None
+
+    @property
+    def byte_time(self) -> float:
+        """Time to transmit one byte, in seconds."""
+        return BITS_PER_BYTE / self.baudrate
+
+    @property
+    def out_waiting(self) -> int:
+        return round(max(0.0, self._line_free_at - monotonic()) / self.byte_time)
+
+    def flush(self) -> None:
+        if not self.is_open:
+            raise PortNotOpenError
+        if (delay := self._line_free_at - monotonic()) > 0:
+            sleep(delay)
+
+    def write(self, data: ReadableBuffer) -> int:
+        if not self.is_open:
+            raise PortNotOpenError
+
+        size = len(memoryview(data).cast("B"))
+        now = monotonic()
+        start = max(now, self._line_free_at)
+        if self.rtscts or self.dsrdtr:
+            start = self._room_at(size, start)
+        self._line_free_at = start + size * self.byte_time
+        self.transmitted += size
+
+        # Data is processed once received, after data received previously.
+        # It waits in the receive buffer only if the printer is still busy when it starts to arrive.
+        before = self.emulator.duration
+        super().write(data)
+        busy = self.emulator.duration - before if self.busy else 0.0
+        waiting = size if self._busy_until > start else 0
+        self._busy_until = max(self._line_free_at, self._busy_until) + busy
+        self._receive(waiting, self._line_free_at, self._busy_until)
+
+        # Block while the operating system buffer is full
+        if (delay := self._line_free_at - now - OS_BUFFER_SIZE * self.byte_time) > 0:
+            sleep(delay)
+        return size
+
+    def _room_at(self, size: int, at: float) -> float:
+        """Return when the printer receive buffer has room for ``size`` bytes, from ``at``."""
+        level = sum(count for processed_at, count in self._waiting if processed_at > at)
+        for processed_at, count in self._waiting:
+            if level + size <= self.buffer_size:
+                break
+            if processed_at > at:
+                level -= count
+                at = processed_at
+        return at
+
+    def _receive(self, size: int, received_at: float, processed_at: float) -> None:
+        """Account ``size`` bytes waiting in the printer receive buffer, until processed."""
+        while self._waiting and self._waiting[0][0] <= received_at:
+            self._waiting.popleft()
+        self._waiting.append((processed_at, size))
+
+        level = sum(count for _, count in self._waiting)
+        self.peak = max(self.peak, level)
+        if level > self.buffer_size:
+            self.overflow += min(size, level - self.buffer_size)
+
+    def reset_output_buffer(self) -> None:
+        self._line_free_at = min(self._line_free_at, monotonic())